@@ -1,13 +1,13 @@
 # SPDX-License-Identifier: Apache-2.0
 from fastapi import APIRouter, HTTPException
 from app.schemas.v2.ad_element_extractor_dto import AdElementDTOV2
-from app.services.v2.ad_element_extractor_service import AdElementExtractorServiceV2
+from app.services.v2.ad_element_extractor_service import get_ad_element_extractor_service
 
 router = APIRouter()
 
 @router.post("/extract", response_model=AdElementDTOV2.AdElementResponse)
 async def extract_ad_elements(req: AdElementDTOV2.AdElementRequest):
     try:
-        return AdElementExtractorServiceV2.extract_elements(req)
+        return get_ad_element_extractor_service().extract_elements(req)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
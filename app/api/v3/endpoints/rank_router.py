@@ -1,15 +1,56 @@
 # SPDX-License-Identifier: Apache-2.0
+from typing import AsyncIterator, Iterator
+
+import orjson
 from fastapi import APIRouter, HTTPException
-from app.schemas.v3.rank_dto import RankDTOV3
+from fastapi.responses import ORJSONResponse, StreamingResponse
+
+from app.schemas.v3.rank_dto import RankDTOV3, ResponseProjection
 from app.services.v3.rank_service import RankServiceV3
+from app.services.v3.result_cursor import CursorExpiredError
+from app.utils.profiler import run_in_threadpool
 
 router = APIRouter()
 
+
+def _to_response(resp: RankDTOV3.GetRankPtfoResponse, projection: ResponseProjection) -> ORJSONResponse:
+    """
+    서비스가 만든 응답 모델을 재검증 없이 orjson 으로 직렬화 (fields/compact 옵션 반영).
+    response_model 은 문서(OpenAPI) 용으로만 유지.
+    """
+    return ORJSONResponse(content=resp.model_dump(exclude=projection.search_result_exclude()))
+
+
+async def _ndjson_lines(
+    lines: Iterator[RankDTOV3.GetRankPtfoBatchLine], projection: ResponseProjection
+) -> AsyncIterator[bytes]:
+    """
+    배치 결과를 NDJSON 으로 스트리밍. 동기 iterator 의 다음 줄은 threadpool 에서 계산 (이벤트 루프 비차단)
+    """
+    exclude = projection.search_result_exclude()
+    try:
+        while True:
+            line = await run_in_threadpool(next, lines, None)
+            if line is None:
+                break
+            body = {"index": line.index}
+            if line.result is not None:
+                body["result"] = line.result.model_dump(exclude=exclude)
+            else:
+                body["error"] = line.error
+            yield orjson.dumps(body) + b"\n"
+    finally:
+        # 클라이언트가 끊은 경우에도 진행 중인 요소 추출 정리
+        lines.close()
+
+
 @router.post("/portfolios", response_model=RankDTOV3.GetRankPtfoResponse)
 async def get_ranked_portfolios(req: RankDTOV3.GetRankPtfoRequest):
     try:
         rank_service = RankServiceV3()
-        return rank_service.get_ranked_portfolios(req)
+        # 동기 서비스 → threadpool로 오프로딩 (동시 요청 병합/캐시가 이벤트 루프를 막지 않도록)
+        resp = await run_in_threadpool(rank_service.get_ranked_portfolios, req)
+        return _to_response(resp, req)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -17,6 +58,36 @@ async def get_ranked_portfolios(req: RankDTOV3.GetRankPtfoRequest):
 async def get_ranked_portfolios_by_ad_elements(req: RankDTOV3.GetRankPtfoByAdElementsRequest):
     try:
         rank_service = RankServiceV3()
-        return rank_service.get_ranked_portfolios_by_ad_elements(req)
+        resp = await run_in_threadpool(rank_service.get_ranked_portfolios_by_ad_elements, req)
+        return _to_response(resp, req)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post(
+    "/portfolios/batch",
+    response_class=StreamingResponse,
+    responses={200: {"model": RankDTOV3.GetRankPtfoBatchLine, "description": "항목별 결과 한 줄씩 (application/x-ndjson)"}},
+)
+async def get_ranked_portfolios_batch(req: RankDTOV3.GetRankPtfoBatchRequest):
+    try:
+        rank_service = RankServiceV3()
+        lines = rank_service.get_ranked_portfolios_batch(req)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(_ndjson_lines(lines, req), media_type="application/x-ndjson")
+
+@router.post("/portfolios/next", response_model=RankDTOV3.GetRankPtfoResponse)
+async def get_ranked_portfolios_next_page(req: RankDTOV3.GetRankPtfoNextPageRequest):
+    try:
+        rank_service = RankServiceV3()
+        resp = await run_in_threadpool(rank_service.get_next_page, req)
+        return _to_response(resp, req)
+    except CursorExpiredError as e:
+        # 만료된 커서 → 클라이언트는 첫 페이지 검색부터 다시 요청
+        raise HTTPException(status_code=410, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
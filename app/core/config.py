@@ -7,6 +7,15 @@ load_dotenv()
 class EnvVariables:
     API_PORT = os.getenv('API_PORT')
 
+    # prefork 서버(python -m app.server) 워커 수 / 워커 메모리(공유·전용) 보고 주기(초, 0 이면 기동 시 1회)
+    SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", 1))
+    SERVER_MEMORY_REPORT_INTERVAL_SEC = float(os.getenv("SERVER_MEMORY_REPORT_INTERVAL_SEC", 0))
+
+    # 기동 시 등록할 API 버전 (쉼표 구분, 미등록 버전의 서비스/모델은 import 하지 않음)
+    ENABLED_API_VERSIONS = [v.strip() for v in os.getenv("ENABLED_API_VERSIONS", "v1,v2,v3").split(",") if v.strip()]
+    # true 면 lifespan 에서 모델/인덱스를 미리 로드 (false 면 첫 요청 시 로드)
+    PRELOAD_SERVICES = os.getenv("PRELOAD_SERVICES", "true").lower() == "true"
+
     # DB
     DB_HOST = os.getenv("DB_HOST")
     DB_NAME = os.getenv("DB_NAME")
@@ -35,9 +44,29 @@ class EnvVariables:
 
 class ModelConfig:
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL")
+    # 버전별 artifacts 상위 경로 ({ARTIFACTS_ROOT}/{v1|v2|v3}/{EMBEDDING_MODEL})
+    ARTIFACTS_ROOT = os.getenv("ARTIFACTS_ROOT", "./artifacts")
     WORD_EMBEDDING_MODEL_PATH = os.getenv("WORD_EMBEDDING_MODEL_PATH")
+    # export_fasttext_table 로 만든 경량 벡터 테이블 경로 (있으면 검색 서비스가 전체 .bin 대신 사용)
+    WORD_EMBEDDING_TABLE_DIR = os.getenv("WORD_EMBEDDING_TABLE_DIR", "./artifacts/fasttext_table")
+
+    # SBERT 쿼리 인코더 추론 백엔드 (torch / onnx)
+    ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+    ENCODER_NUM_THREADS = int(os.getenv("ENCODER_NUM_THREADS", 0))  # 0 이면 라이브러리 기본값
+    ONNX_ENCODER_DIR = os.getenv("ONNX_ENCODER_DIR", f"./artifacts/onnx/{EMBEDDING_MODEL}")
+    ONNX_ENCODER_FILE = os.getenv("ONNX_ENCODER_FILE", "onnx/model.onnx")
+    # ENCODER_BACKEND=stub: 모델 없이 해시 기반 결정적 임베딩 (부하 테스트/오프라인용)
+    STUB_ENCODER_DIM = int(os.getenv("STUB_ENCODER_DIM", 384))
+    STUB_ENCODER_LATENCY_MS = float(os.getenv("STUB_ENCODER_LATENCY_MS", 0))
+    # 오프라인 임베딩 빌드 (generate_fused_embeddings_v3) 인코딩 설정
+    BUILD_ENCODER_BACKEND = os.getenv("BUILD_ENCODER_BACKEND", "torch")
+    BUILD_ENCODE_WORKERS = int(os.getenv("BUILD_ENCODE_WORKERS", 0))         # 인코딩 프로세스 수 (0 이면 CPU 코어 수)
+    BUILD_ENCODE_BATCH_SIZE = int(os.getenv("BUILD_ENCODE_BATCH_SIZE", 64))  # 길이순 정렬 후 배치 크기
 
     LLM_PROVIDER = os.getenv("LLM_PROVIDER")
+    # LLM_PROVIDER=stub: 네트워크 없이 결정적 응답을 주는 로컬 LLM 대역 (응답 지연 = latency ± jitter)
+    STUB_LLM_LATENCY_MS = float(os.getenv("STUB_LLM_LATENCY_MS", 300))
+    STUB_LLM_JITTER_MS = float(os.getenv("STUB_LLM_JITTER_MS", 0))
 
     HUGGING_FACE_TOKEN = os.getenv("HUGGING_FACE_TOKEN")
 
@@ -61,6 +90,76 @@ class SearchConfig:
     HOW_WEIGHT = float(os.getenv("HOW_WEIGHT", 1.0))
     STYLE_WEIGHT = float(os.getenv("STYLE_WEIGHT", 1.0))
 
+    # v3 샤드 모드: 샤드 서버 URL 목록(쉼표 구분). 비어 있으면 단일 프로세스 fused 인덱스 사용
+    V3_SHARD_URLS = [u.strip() for u in os.getenv("V3_SHARD_URLS", "").split(",") if u.strip()]
+    V3_SHARD_TIMEOUT_SEC = float(os.getenv("V3_SHARD_TIMEOUT_SEC", 2.0))
+
+    # v3 BM25 후보 소스: off(dense 만) / rrf(dense + BM25 후보를 reciprocal-rank fusion) / first_stage(BM25 후보만 dense 재채점)
+    V3_LEXICAL_MODE = os.getenv("V3_LEXICAL_MODE", "off").lower()
+    V3_RRF_K = int(os.getenv("V3_RRF_K", 60))   # RRF 순위 상수 (점수 = Σ 1 / (K + 순위))
+    BM25_K1 = float(os.getenv("BM25_K1", 1.2))  # 빌드 시 BM25 파라미터
+    BM25_B = float(os.getenv("BM25_B", 0.75))
+
 class RankConfig:
     MIN_CANDIDATE_TOP_STDO_K = int(os.getenv("MIN_CANDIDATE_TOP_STDO_K", 30))
     TOP_STDO_K = int(os.getenv("TOP_STDO_K", 5))
+    # true 면 스튜디오 순위를 후보 수 대신 후보 최종 점수 합으로 산정
+    STUDIO_STATS_SCORE_WEIGHTED = os.getenv("STUDIO_STATS_SCORE_WEIGHTED", "false").lower() == "true"
+    # 배치 랭킹(/api/v3/rank/portfolios/batch): 요청당 최대 항목 수, user_prompt 항목 요소 추출 동시 실행 수
+    RANK_BATCH_MAX_ITEMS = int(os.getenv("RANK_BATCH_MAX_ITEMS", 64))
+    RANK_BATCH_EXTRACT_WORKERS = int(os.getenv("RANK_BATCH_EXTRACT_WORKERS", 4))
+
+class CacheConfig:
+    # 의미 기반(semantic) 프롬프트 캐시: 유사한 user_prompt 는 LLM 호출 없이 이전 추출 결과 재사용.
+    # 적중 여부와 관계없이 추출마다 SBERT 인코딩 1회 + 캐시 전체 유사도 계산이 추가되므로 기본은 꺼짐 (opt-in)
+    PROMPT_CACHE_ENABLED = os.getenv("PROMPT_CACHE_ENABLED", "false").lower() == "true"
+    PROMPT_CACHE_SIM_THRESHOLD = float(os.getenv("PROMPT_CACHE_SIM_THRESHOLD", 0.97))
+    PROMPT_CACHE_MAX_SIZE = int(os.getenv("PROMPT_CACHE_MAX_SIZE", 1000))
+    PROMPT_CACHE_HIT_LOG_PATH = os.getenv("PROMPT_CACHE_HIT_LOG_PATH")
+
+    # 랭킹 응답 캐시: (정규화된 요청 + 로드된 artifact 버전) 단위로 전체 응답 재사용
+    RANK_CACHE_ENABLED = os.getenv("RANK_CACHE_ENABLED", "true").lower() == "true"
+    RANK_CACHE_MAX_SIZE = int(os.getenv("RANK_CACHE_MAX_SIZE", 512))
+    RANK_CACHE_TTL_SEC = float(os.getenv("RANK_CACHE_TTL_SEC", 600))
+    # v3 랭킹 커서 페이지네이션: paginate=true 요청만 후보 풀을 넉넉히 잡아 두고 다음 페이지는 풀을 잘라서 응답
+    # (커서가 담긴 응답은 랭킹 응답 캐시에 넣지 않으므로 두 캐시의 크기/TTL 은 서로 독립)
+    CURSOR_ENABLED = os.getenv("CURSOR_ENABLED", "true").lower() == "true"
+    CURSOR_POOL_SIZE = int(os.getenv("CURSOR_POOL_SIZE", 200))          # 커서로 볼 수 있는 최대 결과 수
+    CURSOR_CACHE_MAX_SIZE = int(os.getenv("CURSOR_CACHE_MAX_SIZE", 256))
+    CURSOR_TTL_SEC = float(os.getenv("CURSOR_TTL_SEC", 900))
+    # 커서를 워커/인스턴스 간에 공유할 디렉터리 (비우면 프로세스 메모리, prefork 워커 2개 이상이면 임시 디렉터리 자동 생성)
+    CURSOR_SHARED_DIR = os.getenv("CURSOR_SHARED_DIR") or None
+
+class MetricsConfig:
+    # 단계별 지연 히스토그램(/metrics) 수집 여부
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # 응답에 Server-Timing 헤더(단계별 ms, LLM 토큰/재시도 수) 추가 여부
+    SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "true").lower() == "true"
+    # true 면 단계마다 OpenTelemetry span 생성 (opentelemetry-api 설치 + SDK/exporter 설정 필요)
+    OTEL_TRACES_ENABLED = os.getenv("OTEL_TRACES_ENABLED", "false").lower() == "true"
+    # 히스토그램 버킷 상한(ms, 쉼표 구분)
+    LATENCY_BUCKETS_MS = [
+        float(b) for b in os.getenv(
+            "METRICS_LATENCY_BUCKETS_MS", "1,2.5,5,10,25,50,100,250,500,1000,2500,5000,10000,30000"
+        ).split(",") if b.strip()
+    ]
+
+class ProfilerConfig:
+    # 요청 단위 샘플링 프로파일러 (X-Profile-Token 헤더 또는 ?profile_token= 가 ADMIN_TOKEN 과 일치할 때만 동작)
+    ENABLED = os.getenv("PROFILER_ENABLED", "false").lower() == "true"
+    ADMIN_TOKEN = os.getenv("PROFILER_ADMIN_TOKEN", "")
+    OUTPUT_DIR = os.getenv("PROFILER_OUTPUT_DIR", "./profiles")
+    SAMPLE_INTERVAL_MS = float(os.getenv("PROFILER_SAMPLE_INTERVAL_MS", 5))
+    MAX_DURATION_SEC = float(os.getenv("PROFILER_MAX_DURATION_SEC", 30))  # 이후 샘플링 중단 (오버헤드 상한)
+    MAX_CONCURRENT = int(os.getenv("PROFILER_MAX_CONCURRENT", 1))         # 동시에 프로파일링하는 요청 수
+    MAX_FILES = int(os.getenv("PROFILER_MAX_FILES", 200))                 # 보관할 프로파일 수 (오래된 것부터 삭제)
+
+class LogConfig:
+    # text: "[서비스] [시각] [레벨] 메시지" / json: 한 줄 JSON (ts, level, logger, message, request_id ...)
+    LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+    # true 면 큐 + 백그라운드 writer 로 기록 (요청 스레드가 stdout 쓰기에 막히지 않음)
+    LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() == "true"
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))  # 가득 차면 새 로그는 버리고 개수만 보고
+    # LLM 원문 응답 등 payload 로그: 기록 확률(0~1) / 최대 길이(0 이면 자르지 않음)
+    LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", 0.1))
+    LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", 500))
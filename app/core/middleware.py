@@ -0,0 +1,147 @@
+# SPDX-License-Identifier: Apache-2.0
+import time
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import MetricsConfig, ProfilerConfig
+from app.utils import metrics, profiler
+from app.utils.request_context import (
+    REQUEST_ID_HEADER, get_request_id, new_request_id, reset_request_id, set_request_id,
+)
+
+
+def _header(scope, name: str):
+    key = name.encode("latin-1")
+    for k, v in scope.get("headers", []):
+        if k == key:
+            return v.decode("latin-1")
+    return None
+
+
+class RequestIdMiddleware:
+    """
+    요청 id 를 정해(X-Request-ID 가 유효하면 재사용) contextvar 에 두고 응답 헤더로 돌려주는 ASGI 미들웨어.
+    로그/프로파일 파일명이 같은 id 를 사용.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = new_request_id(_header(scope, REQUEST_ID_HEADER))
+        token = set_request_id(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER.encode("latin-1"), request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            reset_request_id(token)
+
+
+class MetricsMiddleware:
+    """
+    요청마다 단계별 소요 시간 수집기를 열고(contextvar), 응답 시작 시 Server-Timing 헤더를 붙이는 ASGI 미들웨어.
+    요청 전체 소요 시간은 라우트 템플릿(/api/v3/rank/portfolios 등) 단위 히스토그램으로 기록.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") == "/metrics":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = metrics.begin_request()
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if MetricsConfig.SERVER_TIMING_ENABLED:
+                    total_ms = (time.perf_counter() - start) * 1000.0
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", timings.server_timing(total_ms).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.end_request(token)
+            if MetricsConfig.METRICS_ENABLED:
+                route = scope.get("route")
+                route_path = getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+                metrics.registry.observe_request(scope["method"], route_path, status, time.perf_counter() - start)
+
+
+class ProfilerMiddleware:
+    """
+    관리자 토큰(X-Profile-Token 헤더 또는 ?profile_token=)이 붙은 요청만 샘플링 프로파일러로 실행하는 ASGI 미들웨어.
+    - 이벤트 루프 스레드 + profiler.run_in_threadpool 로 넘긴 작업 스레드의 스택을 수집
+    - 동시 프로파일 수는 PROFILER_MAX_CONCURRENT 로 제한 (초과 시 프로파일 없이 처리, X-Profile: busy)
+    - 결과는 PROFILER_OUTPUT_DIR/{시각}_{request_id}.json/.collapsed 로 저장 (응답 헤더 X-Profile-Id)
+    """
+
+    TOKEN_HEADER = "x-profile-token"
+    TOKEN_QUERY = "profile_token"
+
+    def __init__(self, app):
+        self.app = app
+
+    def _token(self, scope):
+        token = _header(scope, self.TOKEN_HEADER)
+        if token is None and scope.get("query_string"):
+            values = parse_qs(scope["query_string"].decode("latin-1")).get(self.TOKEN_QUERY)
+            token = values[0] if values else None
+        return token
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not ProfilerConfig.ENABLED:
+            await self.app(scope, receive, send)
+            return
+        if not profiler.is_authorized(self._token(scope)):
+            # 토큰이 없거나 틀리면 프로파일 없이 정상 처리 (프로파일러 존재 여부를 드러내지 않음)
+            await self.app(scope, receive, send)
+            return
+
+        request_id = get_request_id() or new_request_id()
+        started = profiler.try_begin(request_id, scope["method"], scope["path"])
+        if started is None:
+            await self.app(scope, receive, self._with_header(send, b"x-profile", b"busy"))
+            return
+
+        session, ctx_token = started
+        loop_ident = session.add_thread("event_loop")
+        try:
+            await self.app(scope, receive, self._with_header(send, b"x-profile-id", request_id.encode("latin-1"), session))
+        finally:
+            session.remove_thread(loop_ident)
+            profiler.finish(session, ctx_token)
+            try:
+                await run_in_threadpool(session.save, ProfilerConfig.OUTPUT_DIR)
+            except Exception as e:
+                profiler.logger.warning(f"[Profiler] 프로파일 저장 실패 ({request_id}): {e}")
+
+    @staticmethod
+    def _with_header(send, name: bytes, value: bytes, session=None):
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                if session is not None:
+                    session.status = message["status"]
+                message = {**message, "headers": list(message.get("headers", [])) + [(name, value)]}
+            await send(message)
+        return send_wrapper
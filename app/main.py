@@ -1,19 +1,102 @@
 # SPDX-License-Identifier: Apache-2.0
+import importlib
+import signal
+import threading
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 
 from dotenv import load_dotenv
 
-from app.api.v1.router import api_v1_router
-from app.api.v2.router import api_v2_router
-from app.api.v3.router import api_v3_router
-from app.core.config import EnvVariables
+from app.core.config import EnvVariables, MetricsConfig
+from app.core.middleware import MetricsMiddleware, ProfilerMiddleware, RequestIdMiddleware
+from app.utils.log_utils import get_logger
+from app.utils.metrics import render_prometheus
 
 # .env 로드
 load_dotenv()
 
+logger = get_logger("Main")
+
+# 버전별 라우터 ("모듈:속성") — ENABLED_API_VERSIONS 에 포함된 버전만 import
+API_ROUTERS = {
+    "v1": "app.api.v1.router:api_v1_router",
+    "v2": "app.api.v2.router:api_v2_router",
+    "v3": "app.api.v3.router:api_v3_router",
+}
+
+# 버전별 warm-up 대상 (PRELOAD_SERVICES=true 일 때 lifespan 에서 호출)
+SERVICE_PRELOADERS = {
+    "v1": ["app.utils.sbert_encoder:get_sentence_encoder"],
+    "v2": [
+        "app.services.v2.search_service:get_search_service_v2",
+        "app.services.v2.ad_element_extractor_service:get_ad_element_extractor_service",
+    ],
+    "v3": [
+        "app.services.v3.search_service:get_search_service",
+        "app.services.v2.ad_element_extractor_service:get_ad_element_extractor_service",
+    ],
+}
+
+
+def _resolve(target: str):
+    module_name, attr = target.split(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def preload_services(versions) -> None:
+    """
+    활성화된 버전의 모델/인덱스 싱글톤을 미리 생성 (중복 대상은 1회만)
+    """
+    targets = list(dict.fromkeys(t for v in versions for t in SERVICE_PRELOADERS.get(v, [])))
+    for target in targets:
+        start = time.perf_counter()
+        _resolve(target)()
+        logger.info(f"[Startup] preload {target} ({time.perf_counter() - start:.2f}s)")
+
+
+def reload_artifacts() -> None:
+    """
+    재색인된 v3 artifacts 다시 로드 (아직 로드 전이면 다음 요청에서 새 artifacts 로 로드되므로 생략)
+    """
+    from app.services.v3 import search_service as search_v3
+
+    if not search_v3._search_service.is_loaded():
+        return
+    try:
+        search_v3.reload_search_service()
+    except Exception as e:
+        logger.error(f"[Reload] v3 artifacts 다시 로드 실패 (기존 artifacts 로 계속 서비스): {e}")
+
+
+def install_reload_signal() -> None:
+    """
+    SIGHUP 을 받으면 별도 스레드에서 reload_artifacts (로드 중에도 요청은 기존 인스턴스로 처리)
+    """
+    if "v3" not in EnvVariables.ENABLED_API_VERSIONS or not hasattr(signal, "SIGHUP"):
+        return
+    if threading.current_thread() is not threading.main_thread():
+        return
+    signal.signal(
+        signal.SIGHUP,
+        lambda _signum, _frame: threading.Thread(target=reload_artifacts, name="artifact-reload", daemon=True).start(),
+    )
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    if EnvVariables.PRELOAD_SERVICES:
+        await run_in_threadpool(preload_services, EnvVariables.ENABLED_API_VERSIONS)
+    install_reload_signal()
+    yield
+
+
 # FastAPI 앱 생성
-app = FastAPI(title="RAGvertise API")
+app = FastAPI(title="RAGvertise API", lifespan=lifespan)
 
 
 app.add_middleware(
@@ -23,15 +106,28 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# 관리자 토큰이 붙은 요청만 샘플링 프로파일 (PROFILER_ENABLED)
+app.add_middleware(ProfilerMiddleware)
+# 단계별 지연(Server-Timing 헤더, /metrics 히스토그램) 수집
+app.add_middleware(MetricsMiddleware)
+# 요청 id (X-Request-ID) — 마지막에 추가한 미들웨어가 가장 바깥에서 실행
+app.add_middleware(RequestIdMiddleware)
 
-app.include_router(api_v1_router, prefix="/api/v1")
-app.include_router(api_v2_router, prefix="/api/v2")
-app.include_router(api_v3_router, prefix="/api/v3")
+for version in EnvVariables.ENABLED_API_VERSIONS:
+    if version not in API_ROUTERS:
+        logger.warning(f"Unknown API version '{version}' in ENABLED_API_VERSIONS, skipped")
+        continue
+    app.include_router(_resolve(API_ROUTERS[version]), prefix=f"/api/{version}")
 
 @app.get("/")
 def root():
     return {"message": "Welcome to RAGvertise API"}
 
+if MetricsConfig.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=int(EnvVariables.API_PORT))
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=int(EnvVariables.API_PORT))
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, String
+
+from app.core.database import Base
+
+
+class MvRefreshState(Base):
+    """
+    MV 증분 리프레시 상태 (행이 있으면 전체 리프레시로 기준이 만들어진 것)
+    """
+    __tablename__ = "tb_mv_refresh_state"
+
+    MV_NM   = Column(String(64), primary_key=True)
+    HWM_DTM = Column(String(14), nullable=True)     # 마지막으로 반영한 변경 로그의 기록 시각 (YYYYMMDDHHMMSS)
+    UPD_DTM = Column(String(14), nullable=True)     # 리프레시 수행 시각
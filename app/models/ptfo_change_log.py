@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, Integer, String
+
+from app.core.database import Base
+
+
+class PtfoChangeLog(Base):
+    """
+    tb_ptfo_tag_merged_mv 증분 리프레시용 변경 로그.
+    tb_ptfo_info / tb_ptfo_tag_mapp 트리거가 변경된 포트폴리오를 기록하고, 리프레시가 반영한 행을 삭제 (남은 행 = 미반영 변경)
+    """
+    __tablename__ = "tb_ptfo_change_log"
+
+    LOG_SEQNO  = Column(BigInteger, primary_key=True, autoincrement=True)
+    PTFO_SEQNO = Column(Integer, nullable=False)
+    SRC_TBL    = Column(String(32), nullable=False)    # 변경이 일어난 테이블
+    WR_DTM     = Column(String(14), nullable=False)    # 기록 시각 (YYYYMMDDHHMMSS)
@@ -0,0 +1,29 @@
+# SPDX-License-Identifier: Apache-2.0
+from typing import Callable, List, Sequence
+
+import numpy as np
+
+from app.utils.log_utils import get_logger
+
+logger = get_logger("embedding_dedup")
+
+
+def encode_deduplicated(
+    factor: str,
+    texts: Sequence[str],
+    encode: Callable[[List[str]], np.ndarray],
+) -> np.ndarray:
+    """
+    고유 텍스트만 encode 한 뒤 inverse index 로 행마다 펼쳐 반환 (결과는 행별 encode 와 동일).
+    what/how/style 처럼 값 종류가 적은 factor 는 인코딩 횟수가 고유값 수로 줄어듦.
+
+    :param factor: 로그용 factor 이름
+    :param texts: 행별 텍스트 (None 은 빈 문자열로 취급)
+    :param encode: 텍스트 목록 → (len, d) 임베딩
+    :return: (len(texts), d) 임베딩
+    """
+    unique, inverse = np.unique(np.asarray([t or "" for t in texts], dtype=object), return_inverse=True)
+    n, u = len(texts), len(unique)
+    logger.info(f"[Dedup] {factor}: 고유 텍스트 {u}/{n} → 인코딩 {100.0 * (1 - u / max(n, 1)):.1f}% 절감 (x{n / max(u, 1):.1f})")
+    embs = np.asarray(encode(unique.tolist()), dtype=np.float32)
+    return embs[inverse.reshape(-1)]
@@ -0,0 +1,132 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import os
+import pickle
+from typing import List, Set
+
+import numpy as np
+import fasttext
+
+from app.core.config import ModelConfig
+from app.preprocess.text_cleaner import TextCleaner
+from app.utils.fasttext_table import CompactFastText, compute_subword_buckets
+from app.utils.log_utils import get_logger
+
+logger = get_logger("export_fasttext_table")
+
+DEFAULT_TOP_WORDS = 50000
+
+
+def _collect_what_words(cleaner: TextCleaner) -> Set[str]:
+    """
+    v2/v3 artifacts 레코드의 `what` 텍스트에 등장한 단어 전체 수집
+    """
+    words: Set[str] = set()
+    for version in ("v2", "v3"):
+        path = os.path.join(f"{ModelConfig.ARTIFACTS_ROOT}/{version}/{ModelConfig.EMBEDDING_MODEL}", "what_embeddings.pkl")
+        if not os.path.exists(path):
+            continue
+        with open(path, "rb") as fp:
+            records = pickle.load(fp)["data"]
+        for rec in records:
+            words.update(cleaner.clean(rec.get("what") or "").split())
+        logger.info(f"[FT-TABLE] {version} what 단어 수집: 누적 {len(words)}개")
+    return words
+
+
+def _parity_check(ft, table: CompactFastText, words: List[str], oov_words: List[str]) -> None:
+    """
+    저장한 테이블과 원본 fastText 의 벡터/해시 일치 여부를 로그로 남김
+    """
+    nwords = len(ft.get_words())
+    hash_mismatch = 0
+    for w in oov_words:
+        _, ids = ft.get_subwords(w)
+        expected = sorted(int(i) - nwords for i in ids if int(i) >= nwords)
+        if expected != sorted(compute_subword_buckets(w, table.minn, table.maxn, table.bucket)):
+            hash_mismatch += 1
+
+    def cos(a, b):
+        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-8))
+
+    in_vocab = [cos(ft.get_word_vector(w), table.get_word_vector(w)) for w in words]
+    oov = [cos(ft.get_word_vector(w), table.get_word_vector(w)) for w in oov_words]
+    logger.info(
+        f"[FT-TABLE] parity: vocab cos min={min(in_vocab, default=1.0):.4f}, "
+        f"oov cos mean={np.mean(oov) if oov else 1.0:.4f}, subword hash mismatch={hash_mismatch}/{len(oov_words)}"
+    )
+
+
+def export_fasttext_table(
+    output_dir: str,
+    top_words: int = DEFAULT_TOP_WORDS,
+    extra_words: List[str] = None,
+    dtype: str = "float32",
+) -> None:
+    """
+    전체 fastText .bin 에서 `what` 임베딩에 필요한 부분만 추출해 경량 테이블로 저장.
+
+    - 단어 벡터: 빈도 상위 top_words + artifacts 의 what 단어 + extra_words
+    - subword 테이블: 위 단어들의 문자 n-gram 버킷 벡터 (OOV 대체용)
+    """
+    logger.info(f"[FT-TABLE] fastText 모델 로드: {ModelConfig.WORD_EMBEDDING_MODEL_PATH}")
+    ft = fasttext.load_model(ModelConfig.WORD_EMBEDDING_MODEL_PATH)
+    args = ft.f.getArgs()
+    minn, maxn, bucket = int(args.minn), int(args.maxn), int(args.bucket)
+    vocab = ft.get_words()
+    nwords = len(vocab)
+
+    cleaner = TextCleaner()
+    what_words = _collect_what_words(cleaner)
+    words = list(dict.fromkeys(list(vocab[:top_words]) + sorted(what_words) + list(extra_words or [])))
+    logger.info(f"[FT-TABLE] 단어 {len(words)}개 (상위 {top_words} + what {len(what_words)}), minn={minn}, maxn={maxn}")
+
+    out_dtype = np.dtype(dtype)
+    word_vectors = np.stack([ft.get_word_vector(w) for w in words], axis=0).astype(out_dtype)
+
+    ngram_buckets = sorted({b for w in words for b in compute_subword_buckets(w, minn, maxn, bucket)})
+    ngram_vectors = np.stack(
+        [ft.get_input_vector(nwords + b) for b in ngram_buckets], axis=0
+    ).astype(out_dtype) if ngram_buckets else np.zeros((0, ft.get_dimension()), dtype=out_dtype)
+    logger.info(f"[FT-TABLE] subword n-gram 버킷 {len(ngram_buckets)}개")
+
+    CompactFastText.save(
+        output_dir,
+        words=words,
+        word_vectors=word_vectors,
+        ngram_buckets=np.asarray(ngram_buckets, dtype=np.int64),
+        ngram_vectors=ngram_vectors,
+        meta={
+            "source": ModelConfig.WORD_EMBEDDING_MODEL_PATH,
+            "dim": int(ft.get_dimension()),
+            "minn": minn,
+            "maxn": maxn,
+            "bucket": bucket,
+            "n_words": len(words),
+            "n_ngrams": len(ngram_buckets),
+            "dtype": out_dtype.name,
+        },
+    )
+
+    table = CompactFastText.load(output_dir)
+    oov_samples = [w + w[-1:] for w in sorted(what_words)[:50] if w + w[-1:] not in table.word_to_id]
+    _parity_check(ft, table, sorted(what_words)[:200], oov_samples)
+
+    size_mb = sum(os.path.getsize(os.path.join(output_dir, f)) for f in os.listdir(output_dir)) / 1e6
+    logger.info(f"[FT-TABLE] 저장 완료: {output_dir} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="what factor 용 경량 fastText 벡터 테이블 생성")
+    parser.add_argument("--output-dir", default=ModelConfig.WORD_EMBEDDING_TABLE_DIR)
+    parser.add_argument("--top-words", type=int, default=DEFAULT_TOP_WORDS)
+    parser.add_argument("--extra-words-file", default=None, help="한 줄에 한 단어씩 추가로 포함할 단어 목록")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    cli = parser.parse_args()
+
+    extra = []
+    if cli.extra_words_file:
+        with open(cli.extra_words_file, "r", encoding="utf-8") as f:
+            extra = [line.strip() for line in f if line.strip()]
+
+    export_fasttext_table(cli.output_dir, top_words=cli.top_words, extra_words=extra, dtype=cli.dtype)
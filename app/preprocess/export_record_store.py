@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import json
+import os
+import pickle
+
+from app.core.config import ModelConfig
+from app.utils.log_utils import get_logger
+from app.utils.record_store import RECORD_STORE_DIR, save_factor_bundle
+
+logger = get_logger("export_record_store")
+
+FACTORS = ["full", "desc", "what", "how", "style"]
+
+
+def export_record_store(version: str) -> None:
+    """
+    기존 pickle artifacts({f}_embeddings.pkl) → {f}_embeddings.npy + record_store/ 변환.
+    v3 는 fused_meta.json(가중치/factor 순서)도 함께 생성. 재색인 없이 기존 artifacts 에 적용할 때 사용.
+    """
+    artifacts_dir = f"{ModelConfig.ARTIFACTS_ROOT}/{version}/{ModelConfig.EMBEDDING_MODEL}"
+    embeddings, records = {}, None
+    for f in FACTORS:
+        with open(os.path.join(artifacts_dir, f"{f}_embeddings.pkl"), "rb") as fp:
+            meta = pickle.load(fp)
+        embeddings[f] = meta["embeddings"]
+        if records is None:
+            records = meta["data"]
+
+    save_factor_bundle(artifacts_dir, embeddings, records)
+
+    if version == "v3":
+        with open(os.path.join(artifacts_dir, "fused_embeddings.pkl"), "rb") as fp:
+            fused_meta = pickle.load(fp)
+        with open(os.path.join(artifacts_dir, "fused_meta.json"), "w", encoding="utf-8") as fp:
+            json.dump({
+                "factor_dims": fused_meta.get("factor_dims"),
+                "factor_order": fused_meta.get("factor_order", FACTORS),
+                "weights": fused_meta["weights"],
+            }, fp, ensure_ascii=False, indent=2)
+
+    store_dir = os.path.join(artifacts_dir, RECORD_STORE_DIR)
+    size_mb = sum(os.path.getsize(os.path.join(store_dir, f)) for f in os.listdir(store_dir)) / 1e6
+    logger.info(f"[RECORD-STORE] {version}: {len(records)}개 레코드 → {store_dir} ({size_mb:.1f} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="pickle artifacts 를 npy 임베딩 + 컬럼형 RecordStore 로 변환")
+    parser.add_argument("--version", nargs="+", choices=["v2", "v3"], default=["v2", "v3"])
+    cli = parser.parse_args()
+
+    for v in cli.version:
+        export_record_store(v)
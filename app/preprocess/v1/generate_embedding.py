@@ -11,6 +11,7 @@ from app.models.tag_info import TagInfo
 from app.models.ptfo_info import PtfoInfo
 from app.core.database import SessionLocal
 from app.preprocess.text_cleaner import TextCleaner
+from app.utils.tag_mapping import fetch_tag_mapping_from_db, save_tag_mapping
 
 
 logger = logging.getLogger(__name__)
@@ -127,6 +128,9 @@ def build_faiss_indices():
     with open(os.path.join(artifacts_dir, "portfolio_embeddings.pkl"), "wb") as f:
         pickle.dump(portfolio_artifact, f)
 
+    # 검색 시 DB 조회 없이 쓰도록 포폴별 태그 매핑도 함께 저장
+    save_tag_mapping(artifacts_dir, fetch_tag_mapping_from_db())
+
     return tag_index, portfolio_index, tag_artifact, portfolio_artifact
 
 
@@ -8,11 +8,15 @@ import fasttext
 from app.core.database import get_db
 from app.core.config import ModelConfig
 from app.models.ptfo_tag_merged import PtfoTagMerged
+from app.preprocess.embedding_dedup import encode_deduplicated
 from app.preprocess.text_cleaner import TextCleaner
+from app.preprocess.v3.embedding_stage import average_word_vectors
 from app.schemas.v2.ad_element_extractor_dto import AdElementDTOV2
-from app.services.v2.ad_element_extractor_service import ad_element_extractor_service_single_ton
+from app.services.v2.ad_element_extractor_service import get_ad_element_extractor_service
 from app.services.v2.portfolio_service import PortFolioServiceV2
 from app.utils.log_utils import get_logger
+from app.utils.record_store import save_factor_bundle
+from app.utils.tag_mapping import fetch_tag_mapping_from_db, save_tag_mapping
 
 logger = get_logger("generate_embedding_v2")
 
@@ -38,7 +42,8 @@ def build_faiss_indices_v2():
     """
 
     db = next(get_db())
-    data_list = PortFolioServiceV2.load_portfolio_data(db)
+    # 전체를 한 번에 읽지 않고 PTFO_SEQNO 순으로 스트리밍 (첫 페이지부터 바로 추출 시작)
+    data_list = PortFolioServiceV2.iter_portfolio_data(db)
 
     embedding_model = SentenceTransformer(ModelConfig.EMBEDDING_MODEL)
 
@@ -52,8 +57,9 @@ def build_faiss_indices_v2():
 
     for data in data_list:
         input_text = f"제목: {data['PTFO_NM']}. 설명: {data['PTFO_DESC']}. 태그: {', '.join(data['tags'])}"
-        factors = ad_element_extractor_service_single_ton.extract_elements(
-            AdElementDTOV2.AdElementRequest(user_prompt=input_text)
+        factors = get_ad_element_extractor_service().extract_elements(
+            AdElementDTOV2.AdElementRequest(user_prompt=input_text),
+            use_cache=False,
         )
 
         # 각 factor 텍스트 전처리
@@ -80,24 +86,19 @@ def build_faiss_indices_v2():
         })
 
     # FAISS 인덱스 빌드
-    artifacts_dir = f"./artifacts/v2/{ModelConfig.EMBEDDING_MODEL}"
+    artifacts_dir = f"{ModelConfig.ARTIFACTS_ROOT}/v2/{ModelConfig.EMBEDDING_MODEL}"
     os.makedirs(artifacts_dir, exist_ok=True)
 
+    factor_embs = {}
     for factor, texts in factor_texts.items():
         logger.info(f"[V2] {factor} factor - 임베딩 시작 (text 개수: {len(texts)})")
+        # 같은 텍스트는 한 번만 임베딩 (what/how/style 은 값 종류가 적음)
         if factor == "what":
-            embeddings = []
-            for text in texts:
-                words = text.split()
-                word_vecs = [fasttext_model.get_word_vector(word) for word in words]
-                if word_vecs:
-                    avg_vec = np.mean(word_vecs, axis=0)
-                else:
-                    avg_vec = np.zeros(fasttext_model.get_dimension(), dtype=np.float32)
-                embeddings.append(avg_vec)
-            embeddings = np.array(embeddings, dtype=np.float32)
+            embeddings = encode_deduplicated(factor, texts, lambda unique: average_word_vectors(fasttext_model, unique))
         else:
-            embeddings = embedding_model.encode(texts, convert_to_numpy=True).astype(np.float32)
+            embeddings = encode_deduplicated(
+                factor, texts, lambda unique: embedding_model.encode(unique, convert_to_numpy=True)
+            )
 
         # 정규화 및 contiguous
         embeddings = np.ascontiguousarray(embeddings)
@@ -117,6 +118,12 @@ def build_faiss_indices_v2():
             pickle.dump(artifact, f)
         faiss.write_index(index, os.path.join(artifacts_dir, f"{factor}_index.faiss"))
         logger.info(f"[V2] {factor} factor - 벡터 개수: {index.ntotal}")
+        factor_embs[factor] = embeddings
+
+    # 서비스 로드용 npy 임베딩 + 컬럼형 레코드
+    save_factor_bundle(artifacts_dir, factor_embs, records)
+    # 서비스 기동 시 DB 조회 없이 쓰는 포폴별 태그 매핑
+    save_tag_mapping(artifacts_dir, fetch_tag_mapping_from_db())
 
     logger.info("[V2] 모든 factor 인덱스/임베딩 저장 완료.")
 
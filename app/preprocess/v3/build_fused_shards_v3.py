@@ -0,0 +1,91 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+from app.core.config import ModelConfig
+from app.services.v3.filter_index import FilterIndex
+from app.services.v3.fused_shard import FACTOR_ORDER, FusedShard
+from app.utils.log_utils import get_logger
+from app.utils.record_store import RECORD_STORE_DIR, RecordStore
+from app.utils.tag_mapping import load_tag_mapping, save_tag_mapping
+
+logger = get_logger("build_fused_shards_v3")
+
+
+def build_fused_shards_v3(n_shards: int, artifacts_dir: str = None) -> str:
+    """
+    generate_fused_embeddings_v3 로 만든 단일 artifacts 를 S개 샤드로 분할.
+
+    shards/
+      manifest.json         # 샤드 목록, 전체 개수, 가중치, 버전
+      record_store/         # API 프로세스용 메타 레코드 (임베딩 없이, RecordStore)
+      filter_columns.npz    # API 프로세스용 스튜디오 id 컬럼 등
+      tag_mapping.json      # API 프로세스용 포폴별 태그 매핑
+      shard_{i}/            # fused_index.faiss, {factor}_embeddings.npy, global_ids.npy, filter_columns.npz
+    """
+    artifacts_dir = artifacts_dir or f"{ModelConfig.ARTIFACTS_ROOT}/v3/{ModelConfig.EMBEDDING_MODEL}"
+    shards_dir = os.path.join(artifacts_dir, "shards")
+    os.makedirs(shards_dir, exist_ok=True)
+
+    with open(os.path.join(artifacts_dir, "fused_embeddings.pkl"), "rb") as fp:
+        fused_meta = pickle.load(fp)
+    fused = np.asarray(fused_meta["embeddings"], dtype=np.float32)
+    records = fused_meta["data"]
+
+    embeddings = {}
+    for f in FACTOR_ORDER:
+        with open(os.path.join(artifacts_dir, f"{f}_embeddings.pkl"), "rb") as fp:
+            embeddings[f] = np.asarray(pickle.load(fp)["embeddings"], dtype=np.float32)
+
+    filter_index = FilterIndex.load(artifacts_dir) or FilterIndex.from_records(records)
+
+    N = fused.shape[0]
+    n_shards = max(1, min(int(n_shards), N))
+    version = hashlib.sha1(fused.tobytes()).hexdigest()[:12]
+
+    shards = []
+    for i, ids in enumerate(np.array_split(np.arange(N, dtype=np.int64), n_shards)):
+        shard_name = f"shard_{i}"
+        FusedShard.save(
+            os.path.join(shards_dir, shard_name),
+            fused[ids],
+            {f: embeddings[f][ids] for f in FACTOR_ORDER},
+            ids,
+            filter_index.take(ids),
+        )
+        shards.append({"dir": shard_name, "size": int(ids.size)})
+        logger.info(f"[V3-SHARD] {shard_name}: {ids.size}개 (global id {ids[0]}~{ids[-1]})")
+
+    RecordStore.from_records(records).save(os.path.join(shards_dir, RECORD_STORE_DIR))
+    # API 프로세스의 스튜디오 통계용 (전체 컬럼)
+    filter_index.save(shards_dir)
+    save_tag_mapping(shards_dir, load_tag_mapping(artifacts_dir, records))
+
+    manifest = {
+        "version": version,
+        "ntotal": int(N),
+        "n_shards": n_shards,
+        "shards": shards,
+        "weights": fused_meta["weights"],
+        "factor_order": fused_meta.get("factor_order", FACTOR_ORDER),
+        "factor_dims": fused_meta.get("factor_dims"),
+    }
+    with open(os.path.join(shards_dir, "manifest.json"), "w", encoding="utf-8") as fp:
+        json.dump(manifest, fp, ensure_ascii=False, indent=2)
+
+    logger.info(f"[V3-SHARD] {n_shards}개 샤드 저장 완료: {shards_dir} (version={version})")
+    return shards_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="v3 fused 인덱스를 S개 샤드로 분할")
+    parser.add_argument("--shards", type=int, required=True)
+    parser.add_argument("--artifacts-dir", default=None)
+    cli = parser.parse_args()
+
+    build_fused_shards_v3(cli.shards, cli.artifacts_dir)
@@ -0,0 +1,196 @@
+# SPDX-License-Identifier: Apache-2.0
+import hashlib
+import json
+import multiprocessing as mp
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import ModelConfig
+from app.utils.log_utils import get_logger
+
+logger = get_logger("embedding_stage")
+
+CHECKPOINT_DIR = "build_checkpoint"
+RECORDS_FILE = "records.json"
+
+# 작업 프로세스별 인코더 (initializer 에서 1회 로드)
+_worker_encoder = None
+
+
+# ---------- fastText 평균 ----------
+def average_word_vectors(ft, texts: List[str]) -> np.ndarray:
+    """
+    텍스트별 공백 토큰 단어 벡터 평균 (단어 없는 텍스트는 0 벡터).
+    전체 텍스트의 고유 단어마다 get_word_vector 를 1회만 호출하고, 평균은 reduceat 으로 한 번에 계산.
+    """
+    dim = ft.get_dimension()
+    vocab: Dict[str, int] = {}
+    token_ids: List[int] = []
+    lengths = np.zeros(len(texts), dtype=np.int64)
+    for i, t in enumerate(texts):
+        words = (t or "").split()
+        lengths[i] = len(words)
+        token_ids.extend(vocab.setdefault(w, len(vocab)) for w in words)
+
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    if not token_ids:
+        return out
+
+    word_vecs = np.empty((len(vocab), dim), dtype=np.float32)
+    for w, wid in vocab.items():
+        word_vecs[wid] = ft.get_word_vector(w)
+
+    rows = np.flatnonzero(lengths)
+    offsets = np.concatenate(([0], np.cumsum(lengths[rows])[:-1]))
+    sums = np.add.reduceat(word_vecs[np.asarray(token_ids, dtype=np.int64)], offsets, axis=0)
+    out[rows] = sums / lengths[rows, None].astype(np.float32)
+    return out
+
+
+# ---------- SBERT 인코딩 (길이순 버킷 + 다중 프로세스) ----------
+def _init_worker(backend: str, threads: int) -> None:
+    global _worker_encoder
+    from app.utils.sbert_encoder import load_sentence_encoder
+
+    # 코어를 프로세스끼리 나눠 쓰도록 프로세스당 추론 스레드 수 고정 (과구독 방지)
+    ModelConfig.ENCODER_NUM_THREADS = threads
+    _worker_encoder = load_sentence_encoder(backend)
+
+
+def _encode_batch(texts: List[str], batch_size: int) -> np.ndarray:
+    return np.asarray(
+        _worker_encoder.encode(texts, batch_size=batch_size, convert_to_numpy=True, show_progress_bar=False),
+        dtype=np.float32,
+    )
+
+
+class BucketedEncoder:
+    """
+    오프라인 빌드용 SBERT 인코더.
+    - 텍스트를 길이순(긴 것부터)으로 정렬해 batch_size 단위로 나눔 → 배치 내 길이가 비슷해 padding 낭비가 적고, 긴 배치가 먼저 배분되어 마지막에 한 프로세스만 일하는 구간이 짧음
+    - workers > 1 이면 프로세스마다 인코더를 1개씩 두고 배치를 나눠 인코딩 (코어 수에 비례해 처리량 증가)
+    - 인코더/프로세스는 첫 encode 호출 시 시작 (모든 factor 가 체크포인트에서 복원되면 모델을 로드하지 않음)
+    - 결과는 원래 텍스트 순서로 되돌려 반환
+    """
+
+    def __init__(self, backend: Optional[str] = None, workers: int = 0, batch_size: int = 0):
+        self.backend = (backend or ModelConfig.BUILD_ENCODER_BACKEND or "torch").lower()
+        cpu = os.cpu_count() or 1
+        self.workers = max(1, workers or ModelConfig.BUILD_ENCODE_WORKERS or cpu)
+        self.batch_size = max(1, batch_size or ModelConfig.BUILD_ENCODE_BATCH_SIZE)
+        self.threads_per_worker = max(1, cpu // self.workers)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._started = False
+
+    def __enter__(self) -> "BucketedEncoder":
+        return self
+
+    def _start(self) -> None:
+        self._started = True
+        if self.workers > 1:
+            # torch/tokenizer 스레드 상태가 fork 로 복제되지 않도록 spawn 사용
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.backend, self.threads_per_worker),
+            )
+        else:
+            _init_worker(self.backend, ModelConfig.ENCODER_NUM_THREADS)
+        logger.info(f"[Encode] backend={self.backend} workers={self.workers} "
+                    f"threads/worker={self.threads_per_worker if self.workers > 1 else 'default'} batch={self.batch_size}")
+
+    def __exit__(self, *exc) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            raise ValueError("인코딩할 텍스트가 없습니다")
+        if not self._started:
+            self._start()
+        order = np.argsort([-len(t or "") for t in texts], kind="stable")
+        batches = [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+
+        start = time.perf_counter()
+        if self._pool is not None:
+            futures = [self._pool.submit(_encode_batch, [texts[j] for j in b], self.batch_size) for b in batches]
+            results = [f.result() for f in futures]
+        else:
+            results = [_encode_batch([texts[j] for j in b], self.batch_size) for b in batches]
+
+        out = np.empty((len(texts), results[0].shape[1]), dtype=np.float32)
+        for b, embs in zip(batches, results):
+            out[b] = embs
+        elapsed = time.perf_counter() - start
+        logger.info(f"[Encode] n={len(texts)} batches={len(batches)} {elapsed:.2f}s ({len(texts) / max(elapsed, 1e-9):.1f} texts/s)")
+        return out
+
+
+# ---------- 체크포인트 ----------
+class BuildCheckpoint:
+    """
+    {artifacts_dir}/build_checkpoint/ 에 중간 결과 저장 → 빌드가 중간에 죽어도 --resume 으로 이어서 실행.
+    - records.json: LLM 추출이 끝난 레코드 (DB 조회/LLM 호출 생략)
+    - {factor}.npy + {factor}.json: factor 임베딩과 지문(모델/백엔드/텍스트 해시). 지문이 같을 때만 재사용
+    빌드가 끝나면 삭제.
+    """
+
+    def __init__(self, artifacts_dir: str):
+        self.dir = os.path.join(artifacts_dir, CHECKPOINT_DIR)
+
+    def reset(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+        os.makedirs(self.dir, exist_ok=True)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    @staticmethod
+    def _atomic_write(path: str, write) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as fp:
+            write(fp)
+        os.replace(tmp, path)
+
+    def load_records(self) -> Optional[List[Dict]]:
+        path = os.path.join(self.dir, RECORDS_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as fp:
+            return json.load(fp)
+
+    def save_records(self, records: List[Dict]) -> None:
+        os.makedirs(self.dir, exist_ok=True)
+        data = json.dumps(records, ensure_ascii=False).encode("utf-8")
+        self._atomic_write(os.path.join(self.dir, RECORDS_FILE), lambda fp: fp.write(data))
+
+    @staticmethod
+    def fingerprint(factor: str, model: str, texts: List[str]) -> str:
+        h = hashlib.sha1(f"{factor}\0{model}\0".encode("utf-8"))
+        for t in texts:
+            h.update((t or "").encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def load_factor(self, factor: str, fingerprint: str) -> Optional[np.ndarray]:
+        meta_path = os.path.join(self.dir, f"{factor}.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, "r", encoding="utf-8") as fp:
+            if json.load(fp).get("fingerprint") != fingerprint:
+                return None
+        return np.load(os.path.join(self.dir, f"{factor}.npy"))
+
+    def save_factor(self, factor: str, fingerprint: str, embs: np.ndarray) -> None:
+        os.makedirs(self.dir, exist_ok=True)
+        # 행렬을 먼저 쓰고 지문을 마지막에 써서, 지문이 있으면 행렬이 완전함을 보장
+        self._atomic_write(os.path.join(self.dir, f"{factor}.npy"), lambda fp: np.save(fp, embs))
+        meta = json.dumps({"fingerprint": fingerprint, "shape": list(embs.shape)}).encode("utf-8")
+        self._atomic_write(os.path.join(self.dir, f"{factor}.json"), lambda fp: fp.write(meta))
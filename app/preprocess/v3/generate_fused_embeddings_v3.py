@@ -1,3 +1,5 @@
+import argparse
+import json
 import os
 import time
 from collections import deque
@@ -5,16 +7,21 @@ import pickle
 import numpy as np
 import faiss
 
-from sentence_transformers import SentenceTransformer
 import fasttext
 
 from app.core.database import get_db
 from app.core.config import ModelConfig, SearchConfig
+from app.preprocess.embedding_dedup import encode_deduplicated
 from app.preprocess.text_cleaner import TextCleaner
+from app.preprocess.v3.embedding_stage import BucketedEncoder, BuildCheckpoint, average_word_vectors
 from app.schemas.v2.ad_element_extractor_dto import AdElementDTOV2
-from app.services.v2.ad_element_extractor_service import ad_element_extractor_service_single_ton
+from app.services.v2.ad_element_extractor_service import get_ad_element_extractor_service
+from app.services.v3.filter_index import FilterIndex
+from app.services.v3.lexical_index import LexicalIndex
 from app.services.v3.portfolio_service import PortFolioServiceV3
-from app.utils.log_utils import get_logger
+from app.utils.log_utils import get_logger, log_payload
+from app.utils.record_store import save_factor_bundle
+from app.utils.tag_mapping import fetch_tag_mapping_from_db, save_tag_mapping
 
 logger = get_logger("generate_fused_embeddings_v3")
 
@@ -56,27 +63,14 @@ class RateLimiter:
         self.window.append(time.time())
 
 
-def build_fused_faiss_indices_v3():
+def _extract_records(cleaner: TextCleaner) -> list:
     """
-    factor별 임베딩을 만들고, √가중치로 스케일한 뒤 CONCAT하여 단일(fused) 인덱스를 생성.
-    또한 factor별 임베딩/메타를 함께 저장하여 온라인에서 component score 및 메타 노출에 사용.
+    DB 포트폴리오마다 LLM 으로 factor 를 추출하고, 정제한 factor 텍스트 + 메타를 레코드로 반환
     """
     db = next(get_db())
-    data_list = PortFolioServiceV3.load_portfolio_data(db)
-
-    embedding_model = SentenceTransformer(ModelConfig.EMBEDDING_MODEL)
-    ft = fasttext.load_model(ModelConfig.WORD_EMBEDDING_MODEL_PATH)
-    cleaner = TextCleaner()
-
-    # 가중치 및 √가중치
-    weights = {
-        "full":  float(SearchConfig.FULL_WEIGHT),
-        "desc":  float(SearchConfig.DESC_WEIGHT),
-        "what":  float(SearchConfig.WHAT_WEIGHT),
-        "how":   float(SearchConfig.HOW_WEIGHT),
-        "style": float(SearchConfig.STYLE_WEIGHT),
-    }
-    sqrt_w = {k: np.sqrt(v).astype(np.float32) for k, v in weights.items()}
+    # 전체를 한 번에 읽지 않고 PTFO_SEQNO 순으로 스트리밍 (첫 페이지부터 바로 추출 시작)
+    total = PortFolioServiceV3.count_portfolio_data(db)
+    data_list = PortFolioServiceV3.iter_portfolio_data(db)
 
     # --- 레이트 리미터 설정 (LLM 호출 전용) ---
     is_gemini = (getattr(ModelConfig, "LLM_PROVIDER", "").lower() == "gemini")
@@ -105,11 +99,14 @@ def build_fused_faiss_indices_v3():
             limiter.wait()
 
         input_text = f"제목: {data['PTFO_NM']}. 설명: {data['PTFO_DESC']}. 태그: {', '.join(data['tags'])}"
-        factors = ad_element_extractor_service_single_ton.extract_elements(
-            AdElementDTOV2.AdElementRequest(user_prompt=input_text)
+        factors = get_ad_element_extractor_service().extract_elements(
+            AdElementDTOV2.AdElementRequest(user_prompt=input_text),
+            use_cache=False,
         )
-        logger.info(f"[elements] {idx}/{len(data_list)} seq={data['PTFO_SEQNO']} -> "
+        log_payload(logger, f"[elements] {idx}/{total} seq={data['PTFO_SEQNO']} -> ",
                     f"desc='{factors.desc}', what='{factors.what}', how='{factors.how}', style='{factors.style}'")
+        if idx % 100 == 0 or idx == total:
+            logger.info(f"[elements] 진행 {idx}/{total}")
 
         # 개별 factor 텍스트
         for f in ["desc", "what", "how", "style"]:
@@ -136,30 +133,65 @@ def build_fused_faiss_indices_v3():
             "PRDN_PERD":    prod_period,
         })
 
-    artifacts_dir = f"./artifacts/v3/{ModelConfig.EMBEDDING_MODEL}"
+    return records
+
+
+def build_fused_faiss_indices_v3(resume: bool = False):
+    """
+    factor별 임베딩을 만들고, √가중치로 스케일한 뒤 CONCAT하여 단일(fused) 인덱스를 생성.
+    또한 factor별 임베딩/메타를 함께 저장하여 온라인에서 component score 및 메타 노출에 사용.
+
+    :param resume: True 면 이전 실행의 체크포인트(추출 레코드, 완료된 factor 임베딩)를 이어서 사용
+    """
+    artifacts_dir = f"{ModelConfig.ARTIFACTS_ROOT}/v3/{ModelConfig.EMBEDDING_MODEL}"
     os.makedirs(artifacts_dir, exist_ok=True)
+    checkpoint = BuildCheckpoint(artifacts_dir)
+    if not resume:
+        checkpoint.reset()
 
-    # factor별 임베딩 생성/정규화
+    # 가중치 및 √가중치
+    weights = {
+        "full":  float(SearchConfig.FULL_WEIGHT),
+        "desc":  float(SearchConfig.DESC_WEIGHT),
+        "what":  float(SearchConfig.WHAT_WEIGHT),
+        "how":   float(SearchConfig.HOW_WEIGHT),
+        "style": float(SearchConfig.STYLE_WEIGHT),
+    }
+    sqrt_w = {k: np.sqrt(v).astype(np.float32) for k, v in weights.items()}
+
+    records = checkpoint.load_records()
+    if records is None:
+        records = _extract_records(TextCleaner())
+        checkpoint.save_records(records)
+    else:
+        logger.info(f"[Checkpoint] 추출 레코드 재사용 (n={len(records)})")
+    factor_texts = {f: [r[f] for r in records] for f in FACTOR_ORDER}
+
+    # factor별 임베딩 생성/정규화 (완료된 factor 는 체크포인트에 저장 → 재실행 시 건너뜀)
     factor_embs = {}
-    for f in FACTOR_ORDER:
-        texts = factor_texts[f]
-        logger.info(f"[V3-FUSED] {f} 임베딩 생성 (n={len(texts)})")
-        if f == "what":
-            embs = []
-            for t in texts:
-                words = (t or "").split()
-                if words:
-                    mat = np.stack([ft.get_word_vector(w) for w in words], axis=0).astype(np.float32)
-                    embs.append(mat.mean(axis=0))
+    ft = None
+    with BucketedEncoder() as encoder:
+        for f in FACTOR_ORDER:
+            texts = factor_texts[f]
+            model_id = (f"fasttext:{ModelConfig.WORD_EMBEDDING_MODEL_PATH}" if f == "what"
+                        else f"{encoder.backend}:{ModelConfig.EMBEDDING_MODEL}")
+            fingerprint = BuildCheckpoint.fingerprint(f, model_id, texts)
+            embs = checkpoint.load_factor(f, fingerprint)
+            if embs is not None:
+                logger.info(f"[Checkpoint] {f} 임베딩 재사용 (n={len(texts)})")
+            else:
+                logger.info(f"[V3-FUSED] {f} 임베딩 생성 (n={len(texts)})")
+                if f == "what":
+                    ft = ft or fasttext.load_model(ModelConfig.WORD_EMBEDDING_MODEL_PATH)
+                    embs = encode_deduplicated(f, texts, lambda u: average_word_vectors(ft, u))
                 else:
-                    embs.append(np.zeros(ft.get_dimension(), dtype=np.float32))
-            embs = np.stack(embs, axis=0).astype(np.float32)
-        else:
-            embs = embedding_model.encode(texts, convert_to_numpy=True).astype(np.float32)
-
-        embs = _l2norm(np.ascontiguousarray(embs))
-        factor_embs[f] = embs
+                    embs = encode_deduplicated(f, texts, encoder.encode)
+                embs = _l2norm(np.ascontiguousarray(embs))
+                checkpoint.save_factor(f, fingerprint, embs)
+            factor_embs[f] = embs
 
+    for f in FACTOR_ORDER:
+        embs = factor_embs[f]
         with open(os.path.join(artifacts_dir, f"{f}_embeddings.pkl"), "wb") as pf:
             pickle.dump({"embeddings": embs, "data": records}, pf)
 
@@ -186,8 +218,29 @@ def build_fused_faiss_indices_v3():
             "weights": weights,
         }, fp)
 
+    # 서비스 로드용: npy 임베딩 + 컬럼형 레코드 + 가중치 메타 (pickle 없이 버퍼 읽기만으로 로드)
+    save_factor_bundle(artifacts_dir, factor_embs, records)
+    with open(os.path.join(artifacts_dir, "fused_meta.json"), "w", encoding="utf-8") as fp:
+        json.dump({
+            "factor_dims": {f: int(factor_embs[f].shape[1]) for f in FACTOR_ORDER},
+            "factor_order": FACTOR_ORDER,
+            "weights": weights,
+        }, fp, ensure_ascii=False, indent=2)
+
+    # 검색 필터용 컬럼 (제작비/기간 문자열은 여기서 1회만 파싱)
+    FilterIndex.from_records(records).save(artifacts_dir)
+    # BM25 후보 소스용 역색인 (V3_LEXICAL_MODE)
+    LexicalIndex.from_records(records, k1=SearchConfig.BM25_K1, b=SearchConfig.BM25_B).save(artifacts_dir)
+    # 서비스 기동 시 DB 조회 없이 쓰는 포폴별 태그 매핑
+    save_tag_mapping(artifacts_dir, fetch_tag_mapping_from_db())
+
+    checkpoint.clear()
     logger.info("[V3-FUSED] 모든 인덱스/임베딩 저장 완료.")
 
 
 if __name__ == "__main__":
-    build_fused_faiss_indices_v3()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="v3 fused 임베딩/인덱스 생성")
+    parser.add_argument("--resume", action="store_true",
+                        help="중단된 빌드의 체크포인트(추출 레코드, 완료된 factor 임베딩)를 이어서 사용")
+    cli = parser.parse_args()
+    build_fused_faiss_indices_v3(resume=cli.resume)
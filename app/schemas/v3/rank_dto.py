@@ -1,17 +1,54 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator, model_validator
 
 from app.schemas.v2.ad_element_extractor_dto import AdElementDTOV2
 from app.schemas.v3.search_dto import SearchDTOV3
 from app.schemas.v3.studio_stat import StudioStat
 
 
+# compact=true 일 때 search_results 에서 제외하는 긴 텍스트 필드
+COMPACT_EXCLUDED_FIELDS = {"ptfo_desc", "desc", "what", "how", "style"}
+
+
+class ResponseProjection(BaseModel):
+    """
+    응답 필드 선택 옵션 (클라이언트가 렌더링하지 않는 필드를 빼서 직렬화 비용/응답 크기 절감)
+    - fields: search_results 항목에 포함할 필드 목록 (없으면 전체)
+    - compact: ptfo_desc 및 factor 텍스트(desc/what/how/style) 제외
+    """
+    fields: Optional[List[str]] = None
+    compact: bool = False
+
+    @field_validator("fields")
+    @classmethod
+    def _check_fields(cls, v: Optional[List[str]]) -> Optional[List[str]]:
+        if v is None:
+            return v
+        unknown = set(v) - set(SearchDTOV3.SearchResponse.model_fields)
+        if unknown:
+            raise ValueError(f"알 수 없는 fields: {sorted(unknown)}")
+        return v
+
+    def search_result_exclude(self) -> Optional[Dict]:
+        """
+        model_dump(exclude=...) 에 넘길 제외 필드 (제외할 것이 없으면 None)
+        """
+        all_fields = set(SearchDTOV3.SearchResponse.model_fields)
+        keep = set(self.fields) if self.fields else set(all_fields)
+        if self.compact:
+            keep -= COMPACT_EXCLUDED_FIELDS
+        drop = all_fields - keep
+        return {"search_results": {"__all__": drop}} if drop else None
+
+
 class RankDTOV3:
-    class GetRankPtfoRequest(BaseModel):
+    class GetRankPtfoRequest(ResponseProjection):
         user_prompt: str
         diversity: Optional[bool] = False
         limit: int = 5  # 보여 줄 상위 포트폴리오 개수
+        filters: Optional[SearchDTOV3.SearchFilters] = None  # 제작비/기간/스튜디오/태그 조건
+        paginate: bool = False  # true 면 다음 페이지용 next_cursor 발급 (후보 풀을 추가로 검색하므로 필요할 때만)
 
         def to_ad_element_req_dto(self) -> AdElementDTOV2.AdElementRequest:
             return AdElementDTOV2.AdElementRequest(
@@ -23,14 +60,17 @@ class RankDTOV3:
         search_results: List[SearchDTOV3.SearchResponse]
         top_studios: List[StudioStat]
         candidate_size: int
+        next_cursor: Optional[str] = None  # 다음 페이지 조회용 (paginate=true 일 때만, 더 볼 결과가 없으면 None)
 
-    class GetRankPtfoByAdElementsRequest(BaseModel):
+    class GetRankPtfoByAdElementsRequest(ResponseProjection):
         desc: str
         what: str
         how: str
         style: str
         limit: int = 5  # 보여 줄 상위 포트폴리오 개수
         diversity: bool = False
+        filters: Optional[SearchDTOV3.SearchFilters] = None  # 제작비/기간/스튜디오/태그 조건
+        paginate: bool = False  # true 면 다음 페이지용 next_cursor 발급 (후보 풀을 추가로 검색하므로 필요할 때만)
 
         def to_ad_element_resp_dto(self) -> AdElementDTOV2.AdElementResponse:
             return AdElementDTOV2.AdElementResponse(
@@ -38,4 +78,47 @@ class RankDTOV3:
                 what=self.what,
                 how=self.how,
                 style=self.style,
-            )
\ No newline at end of file
+            )
+
+    class GetRankPtfoNextPageRequest(ResponseProjection):
+        cursor: str    # 이전 응답의 next_cursor
+        limit: int = 5  # 이번 페이지 개수
+
+    class RankBatchItem(BaseModel):
+        """
+        배치 항목 1개: user_prompt(요소 추출 후 랭킹) 또는 desc/what/how/style(추출된 요소로 랭킹) 중 하나
+        """
+        user_prompt: Optional[str] = None
+        desc: Optional[str] = None
+        what: Optional[str] = None
+        how: Optional[str] = None
+        style: Optional[str] = None
+        limit: int = 5
+        diversity: bool = False
+        filters: Optional[SearchDTOV3.SearchFilters] = None
+
+        @model_validator(mode="after")
+        def _check_source(self):
+            has_elements = any(v is not None for v in (self.desc, self.what, self.how, self.style))
+            if (self.user_prompt is None) == (not has_elements):
+                raise ValueError("user_prompt 또는 desc/what/how/style 중 하나만 지정하세요")
+            if has_elements and any(v is None for v in (self.desc, self.what, self.how, self.style)):
+                raise ValueError("desc/what/how/style 은 모두 지정해야 합니다")
+            return self
+
+        def to_ad_element_req_dto(self) -> AdElementDTOV2.AdElementRequest:
+            return AdElementDTOV2.AdElementRequest(user_prompt=self.user_prompt)
+
+        def to_ad_element_resp_dto(self) -> AdElementDTOV2.AdElementResponse:
+            return AdElementDTOV2.AdElementResponse(desc=self.desc, what=self.what, how=self.how, style=self.style)
+
+    class GetRankPtfoBatchRequest(ResponseProjection):
+        items: List["RankDTOV3.RankBatchItem"]  # fields/compact 는 모든 항목 응답에 공통 적용
+
+    class GetRankPtfoBatchLine(BaseModel):
+        """
+        배치 응답(NDJSON)의 한 줄. 완료된 순서대로 전송되므로 index 로 요청 항목과 매칭
+        """
+        index: int
+        result: Optional["RankDTOV3.GetRankPtfoResponse"] = None
+        error: Optional[str] = None
@@ -3,6 +3,22 @@ from pydantic import BaseModel
 
 
 class SearchDTOV3:
+    class SearchFilters(BaseModel):
+        min_cost: Optional[float] = None          # 제작비 하한(원)
+        max_cost: Optional[float] = None          # 제작비 상한(원)
+        min_period_days: Optional[float] = None   # 제작기간 하한(일)
+        max_period_days: Optional[float] = None   # 제작기간 상한(일)
+        studios: List[str] = []                   # 이 중 하나의 제작 스튜디오
+        required_tags: List[str] = []             # 모두 포함해야 하는 태그
+        include_unknown: bool = False             # 제작비/기간을 해석할 수 없는 포트폴리오도 포함할지
+
+        def is_empty(self) -> bool:
+            return (
+                self.min_cost is None and self.max_cost is None
+                and self.min_period_days is None and self.max_period_days is None
+                and not self.studios and not self.required_tags
+            )
+
     class SearchRequest(BaseModel):
         full: str
         desc: str
@@ -11,6 +27,7 @@ class SearchDTOV3:
         style: str
         limit: int
         diversity: bool = False
+        filters: Optional["SearchDTOV3.SearchFilters"] = None
 
     class SearchResponse(BaseModel):
         final_score: float
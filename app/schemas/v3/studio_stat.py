@@ -1,7 +1,10 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class StudioStat(BaseModel):
     name: str
     count: int
-    ratio: float
\ No newline at end of file
+    ratio: float
+    score: Optional[float] = None  # STUDIO_STATS_SCORE_WEIGHTED 일 때 후보 점수 합
@@ -4,10 +4,10 @@ import pickle
 import numpy as np
 import faiss
 from sentence_transformers import SentenceTransformer
-import fasttext
 
 # 프로젝트 설정 (경로 및 모델명 확인)
 from app.core.config import ModelConfig, SearchConfig
+from app.utils.fasttext_table import load_word_embedding_model
 
 # ==========================================
 # 1. 설정 및 리소스 로딩 (한 번만 실행)
@@ -18,7 +18,7 @@ class BenchmarkResources:
         
         # 1. 모델 로딩 (공통)
         self.sbert = SentenceTransformer(ModelConfig.EMBEDDING_MODEL)
-        self.ft = fasttext.load_model(ModelConfig.WORD_EMBEDDING_MODEL_PATH)
+        self.ft = load_word_embedding_model()
         
         # 2. V2 (Naive) 리소스 로딩
         self.v2_indices = {}
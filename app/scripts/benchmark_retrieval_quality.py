@@ -0,0 +1,326 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import copy
+import json
+import os
+import random
+import subprocess
+import time
+from typing import Dict, List, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from app.preprocess.text_cleaner import TextCleaner
+from app.schemas.v2.ad_element_extractor_dto import AdElementDTOV2
+from app.schemas.v3.search_dto import SearchDTOV3
+from app.services.v3.fused_shard import FACTOR_ORDER, FusedShard
+from app.services.v3.rank_service import RankServiceV3
+from app.services.v3.search_service import SearchServiceV3
+from app.utils.log_utils import get_logger
+
+logger = get_logger("benchmark_retrieval_quality")
+
+STAGES = ["embed", "candidates", "rescore", "select", "build"]
+
+# --variants 파일이 없을 때 비교하는 기본 변형 (artifacts 인덱스 기준 + 후보폭/압축 대표값)
+DEFAULT_VARIANTS = [
+    {"name": "baseline"},
+    {"name": "min-cands-10", "min_candidates": 10},
+    {"name": "min-cands-100", "min_candidates": 100},
+    {"name": "hnsw32", "index": "HNSW32", "search_params": {"efSearch": 64}},
+    {"name": "sq8", "index": "SQ8"},
+    {"name": "ivf-flat", "index": "IVF{nlist},Flat", "search_params": {"nprobe": 8}},
+    {"name": "hybrid-rrf", "lexical_mode": "rrf"},
+    {"name": "bm25-first-stage", "lexical_mode": "first_stage"},
+]
+
+
+# ---------- 쿼리 세트 ----------
+def _drop_words(text: str, rng: random.Random, rate: float) -> str:
+    words = (text or "").split()
+    kept = [w for w in words if rng.random() >= rate]
+    return " ".join(kept or words)
+
+
+def synthetic_queries(svc: SearchServiceV3, n: int, seed: int, drop_rate: float) -> List[Dict]:
+    """
+    카탈로그 레코드의 factor 텍스트를 표본 추출하고 단어 일부를 지워(drop_rate) 쿼리로 사용
+    """
+    rng = random.Random(seed)
+    ids = rng.sample(range(len(svc.records)), min(n, len(svc.records)))
+    queries = []
+    for i in ids:
+        rec = svc.records[i]
+        queries.append({f: _drop_words(rec[f], rng, drop_rate) for f in ("desc", "what", "how", "style")})
+    return queries
+
+
+def load_logged_queries(path: str, n: Optional[int] = None) -> List[Dict]:
+    """
+    JSONL(한 줄에 {"desc", "what", "how", "style"[, "full"]}) 로 기록된 factor 튜플 로드
+    """
+    queries = []
+    with open(path, "r", encoding="utf-8") as fp:
+        for line in fp:
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            query = {f: obj.get(f) or "" for f in ("desc", "what", "how", "style")}
+            if obj.get("full"):
+                query["full"] = obj["full"]
+            queries.append(query)
+            if n is not None and len(queries) >= n:
+                break
+    return queries
+
+
+def to_search_request(query: Dict, cleaner: TextCleaner, k: int, diversity: bool) -> SearchDTOV3.SearchRequest:
+    # full 이 없으면 RankServiceV3 와 같은 방식으로 조합 + 정제
+    full = query.get("full")
+    if not full:
+        elems = AdElementDTOV2.AdElementResponse.model_construct(**{f: query[f] for f in ("desc", "what", "how", "style")})
+        full = cleaner.clean(RankServiceV3._build_full_text(elems))
+    return SearchDTOV3.SearchRequest(
+        full=full, desc=query["desc"], what=query["what"], how=query["how"], style=query["style"],
+        limit=k, diversity=diversity,
+    )
+
+
+# ---------- 정답(전수 탐색) ----------
+def exact_topk(svc: SearchServiceV3, q_fac: Dict[str, np.ndarray], weights: Dict[str, float], k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    전체 카탈로그에 대해 factor 점수 가중합을 직접 계산한 정확한 top-k (동점은 id 오름차순)
+    """
+    scores = np.zeros(len(svc.records), dtype=np.float32)
+    for f in FACTOR_ORDER:
+        scores += np.float32(weights[f]) * (svc.embeddings[f] @ q_fac[f][0]).astype(np.float32)
+    k = min(k, scores.shape[0])
+    part = np.argpartition(-scores, k - 1)[:k]
+    order = part[np.lexsort((part, -scores[part]))]
+    return order.astype(np.int64), scores[order]
+
+
+def ndcg(returned: List[int], truth: np.ndarray) -> float:
+    """
+    정답 순위 기반 등급 관련도(1위 = k, k위 = 1, 정답 밖 = 0)로 계산한 NDCG@k
+    """
+    k = len(truth)
+    rel = {int(gid): k - r for r, gid in enumerate(truth)}
+    discounts = 1.0 / np.log2(np.arange(2, k + 2))
+    dcg = sum(rel.get(int(gid), 0) * discounts[i] for i, gid in enumerate(returned[:k]))
+    idcg = float(np.sum(np.arange(k, 0, -1) * discounts))
+    return float(dcg / idcg) if idcg > 0 else 0.0
+
+
+# ---------- 변형 구성 ----------
+def build_candidate_index(svc: SearchServiceV3, spec: str, weights: Dict[str, float], train_size: int) -> Tuple[faiss.Index, Dict]:
+    """
+    factor 행렬로 fused 벡터를 다시 만들어 faiss.index_factory(spec) 인덱스 생성 (내적)
+    """
+    fused = np.concatenate(
+        [svc.embeddings[f] * np.float32(np.sqrt(float(weights[f]))) for f in FACTOR_ORDER], axis=1
+    ).astype(np.float32)
+    n = fused.shape[0]
+    spec = spec.format(nlist=max(1, int(4 * np.sqrt(n))))
+
+    start = time.perf_counter()
+    index = faiss.index_factory(fused.shape[1], spec, faiss.METRIC_INNER_PRODUCT)
+    if not index.is_trained:
+        rng = np.random.default_rng(0)
+        sample = fused[rng.choice(n, min(n, train_size), replace=False)] if n > train_size else fused
+        index.train(sample)
+    index.add(fused)
+    build_sec = time.perf_counter() - start
+    return index, {"spec": spec, "build_sec": round(build_sec, 3)}
+
+
+def index_bytes(index: faiss.Index) -> int:
+    return int(faiss.serialize_index(index).nbytes)
+
+
+def make_variant(base: SearchServiceV3, cfg: Dict, train_size: int) -> Tuple[SearchServiceV3, Dict]:
+    """
+    기준 서비스를 얕은 복사해 후보폭/가중치/인덱스/BM25 후보 소스만 바꾼 변형 생성 (임베딩/레코드/모델은 공유)
+    """
+    svc = copy.copy(base)
+    if "alpha" in cfg:
+        svc.ALPHA = int(cfg["alpha"])
+    if "min_cands" in cfg:
+        svc.MIN_CANDS = int(cfg["min_cands"])
+    if "max_cands_cap" in cfg:
+        svc.MAX_CANDS_CAP = int(cfg["max_cands_cap"])
+    if "lexical_mode" in cfg:
+        svc.lexical_mode = cfg["lexical_mode"]
+        svc.lexical_index = None
+        if svc.lexical_mode != "off":
+            svc.lexical_index = base.lexical_index or svc._load_lexical_index(base.records)
+
+    rebuild = "index" in cfg or "weights" in cfg
+    if "weights" in cfg:
+        svc.weights = {**base.weights, **{k: float(v) for k, v in cfg["weights"].items()}}
+        svc.sqrt_w = {k: np.sqrt(float(v)).astype(np.float32) for k, v in svc.weights.items()}
+
+    if rebuild:
+        index, info = build_candidate_index(svc, cfg.get("index", "Flat"), svc.weights, train_size)
+    else:
+        index, info = base.fused_index, {"spec": "artifacts", "build_sec": 0.0}
+    for name, value in (cfg.get("search_params") or {}).items():
+        faiss.ParameterSpace().set_index_parameter(index, name, value)
+    info["bytes"] = index_bytes(index)
+
+    filter_index = getattr(base.candidate_index, "filter_index", None)
+    svc.candidate_index = FusedShard(index, base.embeddings, np.arange(index.ntotal, dtype=np.int64), filter_index)
+    return svc, info
+
+
+# ---------- 측정 ----------
+def _latency_summary(values: List[float]) -> Dict[str, float]:
+    arr = np.asarray(values, dtype=np.float64)
+    return {
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "p99": round(float(np.percentile(arr, 99)), 3),
+    }
+
+
+def run_variant(
+    svc: SearchServiceV3,
+    cfg: Dict,
+    requests: List[SearchDTOV3.SearchRequest],
+    k: int,
+    truth_cache: Dict,
+) -> Dict:
+    """
+    search() 와 같은 단계 순서로 실행하면서 단계별 지연과 정답 대비 품질 지표를 수집
+    """
+    min_candidates = int(cfg.get("min_candidates", 30))
+    N = svc.corpus_size()
+    weights_key = tuple(float(svc.weights[f]) for f in FACTOR_ORDER)
+
+    timings = {s: [] for s in STAGES + ["total"]}
+    recalls, ndcgs, cand_recalls, cand_sizes = [], [], [], []
+    for qi, req in enumerate(requests):
+        t0 = time.perf_counter()
+        q_fused, q_fac = svc._embed_query_fused(req)
+        t1 = time.perf_counter()
+        M = svc.candidate_width(k, N, bool(req.diversity), min_candidates)
+        cands = svc.retrieve_candidates(q_fused, q_fac, M, req)
+        t2 = time.perf_counter()
+        final_scores = svc.final_scores(cands)
+        t3 = time.perf_counter()
+        order_idx = svc.select(cands, final_scores, k, bool(req.diversity))
+        t4 = time.perf_counter()
+        svc.build_results(cands, final_scores, order_idx)
+        t5 = time.perf_counter()
+
+        for stage, (a, b) in zip(STAGES, ((t0, t1), (t1, t2), (t2, t3), (t3, t4), (t4, t5))):
+            timings[stage].append((b - a) * 1000.0)
+        timings["total"].append((t5 - t0) * 1000.0)
+
+        # 정답은 (쿼리, 가중치)별로 한 번만 계산 (쿼리 임베딩은 인덱스와 무관)
+        key = (qi, weights_key)
+        if key not in truth_cache:
+            truth_cache[key] = exact_topk(svc, q_fac, svc.weights, k)[0]
+        truth = truth_cache[key]
+        truth_set = set(truth.tolist())
+        returned = [int(cands.ids[j]) for j in order_idx]
+
+        denom = max(1, len(truth_set))
+        recalls.append(len(truth_set.intersection(returned)) / denom)
+        cand_recalls.append(len(truth_set.intersection(cands.ids.tolist())) / denom)
+        ndcgs.append(ndcg(returned, truth))
+        cand_sizes.append(len(cands))
+
+    return {
+        "quality": {
+            f"recall_at_{k}": round(float(np.mean(recalls)), 4),
+            f"ndcg_at_{k}": round(float(np.mean(ndcgs)), 4),
+            "candidate_recall": round(float(np.mean(cand_recalls)), 4),
+            "mean_candidate_size": round(float(np.mean(cand_sizes)), 1),
+        },
+        "latency_ms": {stage: _latency_summary(v) for stage, v in timings.items()},
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def print_report(report: Dict, k: int) -> None:
+    header = f"{'variant':<20}{'recall':>8}{'ndcg':>8}{'cand_rc':>9}{'M':>7}{'p50ms':>8}{'p99ms':>8}{'cand_p99':>10}{'MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for v in report["variants"]:
+        q, lat = v["quality"], v["latency_ms"]
+        print(f"{v['name']:<20}{q[f'recall_at_{k}']:>8.3f}{q[f'ndcg_at_{k}']:>8.3f}{q['candidate_recall']:>9.3f}"
+              f"{q['mean_candidate_size']:>7.0f}{lat['total']['p50']:>8.2f}{lat['total']['p99']:>8.2f}"
+              f"{lat['candidates']['p99']:>10.2f}{v['index']['bytes'] / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SearchServiceV3 변형별 검색 품질(정답 대비 recall/NDCG) vs 지연 벤치마크")
+    parser.add_argument("--queries", default=None, help="기록된 factor 튜플 JSONL. 비우면 카탈로그에서 합성 쿼리 생성")
+    parser.add_argument("--n-queries", type=int, default=200)
+    parser.add_argument("--drop-rate", type=float, default=0.3, help="합성 쿼리에서 지울 단어 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--diversity", action="store_true", help="MMR 재랭킹 경로로 측정")
+    parser.add_argument("--variants", default=None, help="변형 목록 JSON 파일 (기본: DEFAULT_VARIANTS)")
+    parser.add_argument("--train-size", type=int, default=50000, help="학습이 필요한 인덱스(IVF/PQ)의 학습 표본 수")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    cli = parser.parse_args()
+
+    base = SearchServiceV3()
+    if base.fused_index is None:
+        raise SystemExit("샤드 모드(V3_SHARD_URLS)에서는 전수 정답을 계산할 수 없습니다. 단일 프로세스 artifacts 로 실행하세요.")
+
+    if cli.variants:
+        with open(cli.variants, "r", encoding="utf-8") as fp:
+            variants = json.load(fp)
+    else:
+        variants = DEFAULT_VARIANTS
+
+    if cli.queries:
+        queries = load_logged_queries(cli.queries, cli.n_queries)
+        query_set = {"source": "logged", "path": cli.queries, "n": len(queries)}
+    else:
+        queries = synthetic_queries(base, cli.n_queries, cli.seed, cli.drop_rate)
+        query_set = {"source": "synthetic", "n": len(queries), "seed": cli.seed, "drop_rate": cli.drop_rate}
+    cleaner = TextCleaner()
+    requests = [to_search_request(q, cleaner, cli.k, cli.diversity) for q in queries]
+    logger.info(f"[BENCH] 쿼리 {len(requests)}개, 변형 {len(variants)}개, N={base.corpus_size()}, k={cli.k}")
+
+    truth_cache: Dict = {}
+    results = []
+    for cfg in variants:
+        svc, index_info = make_variant(base, cfg, cli.train_size)
+        for req in requests[:cli.warmup]:
+            svc.search(req)
+        measured = run_variant(svc, cfg, requests, cli.k, truth_cache)
+        results.append({"name": cfg["name"], "config": cfg, "index": index_info, **measured})
+        logger.info(f"[BENCH] {cfg['name']}: {measured['quality']} total_p99={measured['latency_ms']['total']['p99']}ms")
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": _git_commit(),
+        "artifact_version": base.artifact_version,
+        "corpus_size": base.corpus_size(),
+        "k": cli.k,
+        "diversity": cli.diversity,
+        "query_set": query_set,
+        "variants": results,
+    }
+    print_report(report, cli.k)
+    if cli.output:
+        os.makedirs(os.path.dirname(cli.output) or ".", exist_ok=True)
+        with open(cli.output, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+        logger.info(f"[BENCH] 결과 저장: {cli.output}")
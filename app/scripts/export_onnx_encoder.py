@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import glob
+import os
+import pickle
+import sys
+import time
+from typing import List, Optional
+
+import numpy as np
+import faiss
+from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+from app.core.config import ModelConfig
+from app.utils.log_utils import get_logger
+from app.utils.sbert_encoder import load_sentence_encoder
+
+logger = get_logger("export_onnx_encoder")
+
+QUANTIZATION_CONFIGS = ["arm64", "avx2", "avx512", "avx512_vnni"]
+
+# v3 artifacts 가 없을 때 사용하는 기본 문장
+FALLBACK_TEXTS = [
+    "여성 건강을 위한 유산균 제품의 따뜻하고 편안한 이미지를 담은 광고",
+    "방문객이 직접 체험할 수 있는 공간을 홍보하는 역동적인 영상",
+    "드론 촬영과 모션그래픽을 활용한 자동차 브랜드 필름",
+    "세련되고 감각적인 뷰티 광고",
+    "숏폼",
+    "친근함",
+]
+
+
+def export_onnx_encoder(output_dir: str, quantize: Optional[str] = None) -> str:
+    """
+    EMBEDDING_MODEL 을 ONNX 로 내보내고(선택적으로 동적 int8 양자화) output_dir 에 저장.
+    반환값: ONNX_ENCODER_FILE 에 지정할 파일 경로 (output_dir 기준 상대 경로)
+    """
+    logger.info(f"[ONNX] {ModelConfig.EMBEDDING_MODEL} → ONNX 변환")
+    model = SentenceTransformer(ModelConfig.EMBEDDING_MODEL, backend="onnx")
+    model.save_pretrained(output_dir)
+    file_name = "onnx/model.onnx"
+
+    if quantize:
+        logger.info(f"[ONNX] 동적 int8 양자화 ({quantize})")
+        export_dynamic_quantized_onnx_model(model, quantization_config=quantize, model_name_or_path=output_dir)
+        candidates = sorted(
+            glob.glob(os.path.join(output_dir, "onnx", f"model_*{quantize}*.onnx")),
+            key=os.path.getmtime,
+        )
+        if not candidates:
+            raise RuntimeError(f"양자화된 ONNX 파일을 찾지 못했습니다: {output_dir}/onnx")
+        file_name = os.path.relpath(candidates[-1], output_dir)
+
+    logger.info(f"[ONNX] 저장 완료: {output_dir}/{file_name}")
+    return file_name
+
+
+def _load_sample_texts(n_samples: int) -> List[str]:
+    path = os.path.join(f"{ModelConfig.ARTIFACTS_ROOT}/v3/{ModelConfig.EMBEDDING_MODEL}", "full_embeddings.pkl")
+    if not os.path.exists(path):
+        logger.warning("[ONNX] v3 artifacts 없음 → 기본 문장으로 parity 검사")
+        return FALLBACK_TEXTS
+    with open(path, "rb") as fp:
+        records = pickle.load(fp)["data"]
+    texts = []
+    for rec in records:
+        texts.extend(rec.get(f) or "" for f in ("full", "desc", "how", "style"))
+    texts = [t for t in dict.fromkeys(texts) if t]
+    return texts[:n_samples] or FALLBACK_TEXTS
+
+
+def _encode_normalized(model: SentenceTransformer, texts: List[str]) -> np.ndarray:
+    emb = model.encode(texts, convert_to_numpy=True).astype(np.float32)
+    return emb / (np.linalg.norm(emb, axis=1, keepdims=True) + 1e-8)
+
+
+def _per_query_ms(model: SentenceTransformer, texts: List[str]) -> float:
+    start = time.perf_counter()
+    for t in texts:
+        model.encode([t], convert_to_numpy=True)
+    return (time.perf_counter() - start) / max(1, len(texts)) * 1000
+
+
+def parity_check(
+    onnx_dir: str,
+    onnx_file: str,
+    n_samples: int = 256,
+    top_k: int = 10,
+    min_cosine: float = 0.99,
+    min_overlap: float = 0.9,
+) -> bool:
+    """
+    PyTorch 임베딩 대비 ONNX 임베딩 검증.
+    - 문장별 코사인 유사도 (min ≥ min_cosine)
+    - v3 full 인덱스 top-K 결과 겹침 비율 (평균 ≥ min_overlap, 인덱스가 있을 때만)
+    - 단건 인코딩 평균 지연(ms) 비교
+    """
+    texts = _load_sample_texts(n_samples)
+    torch_model = load_sentence_encoder("torch")
+    onnx_model = load_sentence_encoder("onnx", onnx_dir=onnx_dir, onnx_file=onnx_file)
+
+    e_torch = _encode_normalized(torch_model, texts)
+    e_onnx = _encode_normalized(onnx_model, texts)
+    cos = np.sum(e_torch * e_onnx, axis=1)
+    ok = float(cos.min()) >= min_cosine
+    logger.info(f"[PARITY] n={len(texts)} cosine min={cos.min():.5f} mean={cos.mean():.5f} (기준 ≥ {min_cosine})")
+
+    index_path = os.path.join(f"{ModelConfig.ARTIFACTS_ROOT}/v3/{ModelConfig.EMBEDDING_MODEL}", "full_index.faiss")
+    if os.path.exists(index_path):
+        index = faiss.read_index(index_path)
+        k = min(top_k, int(index.ntotal))
+        _, I_torch = index.search(e_torch, k)
+        _, I_onnx = index.search(e_onnx, k)
+        overlap = np.mean([len(set(a) & set(b)) / k for a, b in zip(I_torch.tolist(), I_onnx.tolist())])
+        ok = ok and overlap >= min_overlap
+        logger.info(f"[PARITY] v3 full 인덱스 top-{k} 겹침 평균={overlap:.4f} (기준 ≥ {min_overlap})")
+    else:
+        logger.warning(f"[PARITY] {index_path} 없음 → top-K 겹침 검사 생략")
+
+    latency_texts = texts[:32]
+    logger.info(
+        f"[PARITY] 단건 인코딩 평균: torch={_per_query_ms(torch_model, latency_texts):.2f}ms, "
+        f"onnx={_per_query_ms(onnx_model, latency_texts):.2f}ms"
+    )
+    logger.info(f"[PARITY] 결과: {'PASS' if ok else 'FAIL'}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SBERT 인코더 ONNX 변환 + parity 검사")
+    parser.add_argument("--output-dir", default=ModelConfig.ONNX_ENCODER_DIR)
+    parser.add_argument("--quantize", choices=QUANTIZATION_CONFIGS, default=None, help="동적 int8 양자화 대상 CPU 명령어셋")
+    parser.add_argument("--skip-export", action="store_true", help="변환 없이 기존 ONNX_ENCODER_FILE 로 parity 검사만 수행")
+    parser.add_argument("--samples", type=int, default=256)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    parser.add_argument("--min-overlap", type=float, default=0.9)
+    cli = parser.parse_args()
+
+    onnx_file = ModelConfig.ONNX_ENCODER_FILE if cli.skip_export else export_onnx_encoder(cli.output_dir, cli.quantize)
+    passed = parity_check(
+        cli.output_dir,
+        onnx_file,
+        n_samples=cli.samples,
+        top_k=cli.top_k,
+        min_cosine=cli.min_cosine,
+        min_overlap=cli.min_overlap,
+    )
+    logger.info(f"[ONNX] .env 설정: ENCODER_BACKEND=onnx, ONNX_ENCODER_DIR={cli.output_dir}, ONNX_ENCODER_FILE={onnx_file}")
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,153 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import time
+from typing import Dict, List
+
+import faiss
+import numpy as np
+
+from app.core.config import ModelConfig, SearchConfig
+from app.services.v3.filter_index import FilterIndex
+from app.services.v3.lexical_index import LexicalIndex
+from app.services.v3.fused_shard import FACTOR_ORDER
+from app.utils.fasttext_table import CompactFastText
+from app.utils.log_utils import get_logger
+from app.utils.record_store import save_factor_bundle
+from app.utils.sbert_encoder import load_sentence_encoder
+from app.utils.synthetic_catalog import WHAT_WORDS, generate_catalog
+from app.utils.tag_mapping import save_tag_mapping
+
+logger = get_logger("generate_synthetic_artifacts")
+
+
+def _l2norm(x: np.ndarray) -> np.ndarray:
+    return (x / (np.linalg.norm(x, axis=1, keepdims=True) + 1e-8)).astype(np.float32)
+
+
+def _write_flat_index(path: str, embs: np.ndarray) -> None:
+    index = faiss.IndexFlatIP(embs.shape[1])
+    index.add(np.ascontiguousarray(embs, dtype=np.float32))
+    faiss.write_index(index, path)
+
+
+def build_fasttext_table(table_dir: str, words: List[str], dim: int) -> CompactFastText:
+    """
+    합성 어휘용 경량 fastText 테이블 (단어별 결정적 랜덤 벡터, n-gram 없음 → OOV 는 0 벡터)
+    """
+    vectors = np.stack([
+        np.random.default_rng(int(hashlib.blake2b(w.encode("utf-8"), digest_size=4).hexdigest(), 16))
+        .standard_normal(dim).astype(np.float32)
+        for w in words
+    ])
+    CompactFastText.save(
+        table_dir, words, vectors, np.zeros(0, dtype=np.int64), np.zeros((0, dim), dtype=np.float32),
+        {"minn": 3, "maxn": 6, "bucket": 2000000, "dim": dim, "synthetic": True},
+    )
+    return CompactFastText.load(table_dir)
+
+
+def _what_embeddings(ft: CompactFastText, texts: List[str]) -> np.ndarray:
+    out = np.zeros((len(texts), ft.get_dimension()), dtype=np.float32)
+    for i, t in enumerate(texts):
+        words = (t or "").split()
+        if words:
+            out[i] = np.mean([ft.get_word_vector(w) for w in words], axis=0)
+    return _l2norm(out)
+
+
+def generate_synthetic_artifacts(
+    artifacts_root: str,
+    n_portfolios: int,
+    versions: List[str],
+    seed: int = 0,
+    fasttext_dim: int = 100,
+) -> Dict[str, str]:
+    """
+    합성 카탈로그로 v1/v2/v3 서비스가 그대로 로드하는 artifacts 를 생성 (DB/LLM/실제 모델 불필요).
+    SBERT factor 는 현재 ENCODER_BACKEND 인코더(부하 테스트에서는 stub)로, what 은 합성 fastText 테이블로 임베딩.
+    생성한 디렉토리 경로를 {버전: 경로} 로 반환.
+    """
+    start = time.perf_counter()
+    records = generate_catalog(n_portfolios, seed)
+    tag_mapping = {r["PTFO_SEQNO"]: r["tags"] for r in records}
+    encoder = load_sentence_encoder()
+
+    vocab = sorted(set(WHAT_WORDS) | {w for r in records for w in r["what"].split()})
+    ft = build_fasttext_table(os.path.join(artifacts_root, "fasttext_table"), vocab, fasttext_dim)
+
+    factor_embs = {
+        f: _l2norm(np.asarray(encoder.encode([r[f] for r in records], convert_to_numpy=True), dtype=np.float32))
+        for f in FACTOR_ORDER if f != "what"
+    }
+    factor_embs["what"] = _what_embeddings(ft, [r["what"] for r in records])
+
+    dirs = {}
+    for version in versions:
+        out_dir = f"{artifacts_root}/{version}/{ModelConfig.EMBEDDING_MODEL}"
+        os.makedirs(out_dir, exist_ok=True)
+        dirs[version] = out_dir
+
+        if version == "v1":
+            texts = [f"{r['PTFO_NM']} {r['PTFO_DESC']}" for r in records]
+            embs = _l2norm(np.asarray(encoder.encode(texts, convert_to_numpy=True), dtype=np.float32))
+            data = [{k: r[k] for k in ("PTFO_SEQNO", "PTFO_NM", "PTFO_DESC")} for r in records]
+            with open(os.path.join(out_dir, "portfolio_embeddings.pkl"), "wb") as fp:
+                pickle.dump({"embeddings": embs, "data": data}, fp)
+            _write_flat_index(os.path.join(out_dir, "portfolio_index.faiss"), embs)
+
+        elif version == "v2":
+            for f in FACTOR_ORDER:
+                _write_flat_index(os.path.join(out_dir, f"{f}_index.faiss"), factor_embs[f])
+            save_factor_bundle(out_dir, factor_embs, records)
+
+        elif version == "v3":
+            weights = {
+                "full": float(SearchConfig.FULL_WEIGHT), "desc": float(SearchConfig.DESC_WEIGHT),
+                "what": float(SearchConfig.WHAT_WEIGHT), "how": float(SearchConfig.HOW_WEIGHT),
+                "style": float(SearchConfig.STYLE_WEIGHT),
+            }
+            fused = np.concatenate(
+                [factor_embs[f] * np.float32(np.sqrt(weights[f])) for f in FACTOR_ORDER], axis=1
+            ).astype(np.float32)
+            _write_flat_index(os.path.join(out_dir, "fused_index.faiss"), fused)
+            meta = {
+                "factor_dims": {f: int(factor_embs[f].shape[1]) for f in FACTOR_ORDER},
+                "factor_order": FACTOR_ORDER,
+                "weights": weights,
+            }
+            # 샤드 빌드(build_fused_shards_v3)가 읽는 pickle 도 실제 빌드와 같은 형식으로 저장
+            for f in FACTOR_ORDER:
+                with open(os.path.join(out_dir, f"{f}_embeddings.pkl"), "wb") as fp:
+                    pickle.dump({"embeddings": factor_embs[f], "data": records}, fp)
+            with open(os.path.join(out_dir, "fused_embeddings.pkl"), "wb") as fp:
+                pickle.dump({"embeddings": fused, "data": records, **meta}, fp)
+            with open(os.path.join(out_dir, "fused_meta.json"), "w", encoding="utf-8") as fp:
+                json.dump(meta, fp, ensure_ascii=False, indent=2)
+            save_factor_bundle(out_dir, factor_embs, records)
+            FilterIndex.from_records(records).save(out_dir)
+            LexicalIndex.from_records(records).save(out_dir)
+
+        else:
+            raise ValueError(f"지원하지 않는 버전: {version}")
+
+        save_tag_mapping(out_dir, tag_mapping)
+
+    logger.info(f"[SYNTH] {n_portfolios}개 포트폴리오 artifacts 생성 완료 → {artifacts_root} "
+                f"({', '.join(versions)}, {time.perf_counter() - start:.1f}s)")
+    return dirs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="부하 테스트용 합성 카탈로그 artifacts 생성")
+    parser.add_argument("--artifacts-root", default=ModelConfig.ARTIFACTS_ROOT)
+    parser.add_argument("--n-portfolios", type=int, default=2000)
+    parser.add_argument("--versions", nargs="+", choices=["v1", "v2", "v3"], default=["v1", "v2", "v3"])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fasttext-dim", type=int, default=100)
+    cli = parser.parse_args()
+
+    generate_synthetic_artifacts(cli.artifacts_root, cli.n_portfolios, cli.versions, cli.seed, cli.fasttext_dim)
@@ -0,0 +1,240 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import copy
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+from app.utils.log_utils import get_logger
+
+logger = get_logger("load_test")
+
+BRUNO_DIR = "./.bruno"
+# 실제 LLM(ollama)을 직접 호출하는 테스트용 엔드포인트 → stub 으로 대체되지 않으므로 기본 제외
+EXCLUDED_REQUESTS = {"v1/generate test"}
+# 요청마다 값을 바꿔 캐시 적중을 피할 때 수정하는 필드 (요청 본문에 있는 것만)
+PROMPT_FIELDS = ["user_prompt", "summary", "desc"]
+
+
+# ---------- 요청 정의 (.bruno/{v}/*.bru 재사용) ----------
+def _parse_bru(path: str) -> Optional[Dict]:
+    """
+    .bru 파일에서 method / url 경로 / body:json 추출 (// 주석 줄 제외)
+    """
+    with open(path, "r", encoding="utf-8") as fp:
+        text = fp.read()
+    m = re.search(r"^(get|post|put|delete)\s*\{\s*url:\s*(\S+)", text, re.MULTILINE)
+    if not m:
+        return None
+    method, url = m.group(1).upper(), m.group(2)
+    path_only = re.sub(r"^.*\{\{PORT\}\}", "", url)
+
+    body = None
+    b = re.search(r"^body:json\s*\{\n(.*)\n\}\s*$", text, re.MULTILINE | re.DOTALL)
+    if b:
+        lines = [ln for ln in b.group(1).splitlines() if not ln.lstrip().startswith("//")]
+        body = json.loads("\n".join(lines))
+    return {"method": method, "path": path_only, "body": body}
+
+
+def load_request_specs(versions: List[str], bruno_dir: str = BRUNO_DIR, include: Optional[List[str]] = None) -> Dict[str, Dict]:
+    specs = {}
+    for version in versions:
+        for path in sorted(glob.glob(os.path.join(bruno_dir, version, "*.bru"))):
+            name = f"{version}/{os.path.splitext(os.path.basename(path))[0]}"
+            if name.endswith("/folder") or name in EXCLUDED_REQUESTS:
+                continue
+            if include and not any(s in name for s in include):
+                continue
+            spec = _parse_bru(path)
+            if spec is not None:
+                specs[name] = spec
+    return specs
+
+
+def _vary_body(body: Optional[Dict], i: int) -> Optional[Dict]:
+    if body is None:
+        return None
+    body = copy.deepcopy(body)
+    for field in PROMPT_FIELDS:
+        if isinstance(body.get(field), str):
+            body[field] = f"{body[field]} (요청 {i})"
+            break
+    return body
+
+
+# ---------- 부하 생성 ----------
+def _one_request(client: httpx.Client, spec: Dict, body: Optional[Dict]) -> Tuple[float, int]:
+    start = time.perf_counter()
+    try:
+        resp = client.request(spec["method"], spec["path"], json=body)
+        status = resp.status_code
+    except Exception:
+        status = 0  # 연결 실패/타임아웃
+    return (time.perf_counter() - start) * 1000.0, status
+
+
+def run_endpoint(
+    client: httpx.Client,
+    spec: Dict,
+    n_requests: int,
+    concurrency: int,
+    warmup: int,
+    unique_prompts: bool,
+) -> Dict:
+    for i in range(warmup):
+        _one_request(client, spec, _vary_body(spec["body"], -1 - i) if unique_prompts else spec["body"])
+
+    bodies = [_vary_body(spec["body"], i) if unique_prompts else spec["body"] for i in range(n_requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda b: _one_request(client, spec, b), bodies))
+    wall = time.perf_counter() - start
+
+    lat = np.array([r[0] for r in results], dtype=np.float64)
+    errors = sum(1 for _, status in results if status == 0 or status >= 400)
+    return {
+        "requests": n_requests,
+        "errors": errors,
+        "concurrency": concurrency,
+        "throughput_rps": round(n_requests / wall, 2) if wall > 0 else 0.0,
+        "mean_ms": round(float(lat.mean()), 2),
+        "p50_ms": round(float(np.percentile(lat, 50)), 2),
+        "p95_ms": round(float(np.percentile(lat, 95)), 2),
+        "p99_ms": round(float(np.percentile(lat, 99)), 2),
+        "max_ms": round(float(lat.max()), 2),
+    }
+
+
+# ---------- 서버 기동 (stub LLM / stub 인코더 / 합성 artifacts) ----------
+def stub_env(cli) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "LLM_PROVIDER": "stub",
+        "STUB_LLM_LATENCY_MS": str(cli.llm_latency_ms),
+        "STUB_LLM_JITTER_MS": str(cli.llm_jitter_ms),
+        "ENCODER_BACKEND": "stub",
+        "STUB_ENCODER_LATENCY_MS": str(cli.encoder_latency_ms),
+        "EMBEDDING_MODEL": cli.embedding_model,
+        "ARTIFACTS_ROOT": cli.artifacts_root,
+        "WORD_EMBEDDING_TABLE_DIR": os.path.join(cli.artifacts_root, "fasttext_table"),
+        "ENABLED_API_VERSIONS": ",".join(cli.versions),
+        "PRELOAD_SERVICES": "true",
+        "V3_SHARD_URLS": "",
+        "SERVER_WORKERS": str(cli.workers),
+    })
+    env.update({"PROMPT_CACHE_ENABLED": "false", "RANK_CACHE_ENABLED": "false"})
+    if cli.enable_caches:
+        env.update({"PROMPT_CACHE_ENABLED": "true", "RANK_CACHE_ENABLED": "true"})
+    # DB 엔진은 import 시 생성만 되고 검색 경로에서는 접속하지 않음 (URL 파싱용 기본값)
+    for key, default in (("DB_HOST", "127.0.0.1"), ("DB_PORT", "3306"), ("DB_NAME", "ragvertise"),
+                         ("DB_USERNAME", "loadtest"), ("DB_PASSWORD", "loadtest")):
+        env[key] = env.get(key) or default
+    return env
+
+
+def start_server(cli, env: Dict[str, str]) -> subprocess.Popen:
+    if cli.workers > 1:
+        cmd = [sys.executable, "-m", "app.server", "--host", "127.0.0.1", "--port", str(cli.port), "--workers", str(cli.workers)]
+    else:
+        cmd = [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(cli.port),
+               "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, env=env)
+
+    base_url = f"http://127.0.0.1:{cli.port}"
+    deadline = time.monotonic() + cli.startup_timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버가 기동 중 종료되었습니다 (exit={proc.returncode})")
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    proc.terminate()
+    raise RuntimeError(f"서버 기동 대기 시간 초과 ({cli.startup_timeout}s)")
+
+
+def print_report(results: Dict[str, Dict]) -> None:
+    header = f"{'endpoint':<42}{'req':>6}{'err':>5}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(f"{name:<42}{r['requests']:>6}{r['errors']:>5}{r['throughput_rps']:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="v1/v2/v3 HTTP 엔드포인트 부하 테스트 (stub LLM/인코더 + 합성 artifacts)")
+    parser.add_argument("--base-url", default=None, help="이미 떠 있는 서버 주소. 비우면 stub 환경으로 서버를 직접 기동")
+    parser.add_argument("--versions", nargs="+", choices=["v1", "v2", "v3"], default=["v1", "v2", "v3"])
+    parser.add_argument("--endpoints", nargs="*", default=None, help="요청 이름 필터 (부분 일치, 예: 'v3/rank')")
+    parser.add_argument("--bruno-dir", default=BRUNO_DIR)
+    parser.add_argument("--requests", type=int, default=200, help="엔드포인트별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--repeat-prompts", action="store_true", help="요청 본문을 그대로 반복 (기본: 요청마다 프롬프트를 바꿔 캐시 미적중)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    # 서버 직접 기동 옵션
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--workers", type=int, default=1, help="2 이상이면 prefork 서버(app.server)로 기동")
+    parser.add_argument("--artifacts-root", default="./artifacts_loadtest")
+    parser.add_argument("--embedding-model", default="stub-hashing")
+    parser.add_argument("--n-portfolios", type=int, default=2000)
+    parser.add_argument("--skip-generate", action="store_true", help="기존 합성 artifacts 재사용")
+    parser.add_argument("--llm-latency-ms", type=float, default=300.0)
+    parser.add_argument("--llm-jitter-ms", type=float, default=50.0)
+    parser.add_argument("--encoder-latency-ms", type=float, default=0.0)
+    parser.add_argument("--enable-caches", action="store_true", help="프롬프트/랭킹 캐시를 켠 채로 측정")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    cli = parser.parse_args()
+
+    specs = load_request_specs(cli.versions, cli.bruno_dir, cli.endpoints)
+    if not specs:
+        sys.exit("실행할 요청이 없습니다 (--versions / --endpoints 확인)")
+
+    server = None
+    base_url = cli.base_url
+    if base_url is None:
+        env = stub_env(cli)
+        if not cli.skip_generate:
+            subprocess.run(
+                [sys.executable, "-m", "app.scripts.generate_synthetic_artifacts",
+                 "--artifacts-root", cli.artifacts_root, "--n-portfolios", str(cli.n_portfolios),
+                 "--versions", *cli.versions],
+                env=env, check=True,
+            )
+        server = start_server(cli, env)
+        base_url = f"http://127.0.0.1:{cli.port}"
+
+    results: Dict[str, Dict] = {}
+    try:
+        limits = httpx.Limits(max_connections=cli.concurrency, max_keepalive_connections=cli.concurrency)
+        with httpx.Client(base_url=base_url, timeout=cli.timeout, limits=limits) as client:
+            for name, spec in specs.items():
+                logger.info(f"[LOAD] {name} ({spec['method']} {spec['path']}) x{cli.requests}, concurrency={cli.concurrency}")
+                results[name] = run_endpoint(
+                    client, spec, cli.requests, cli.concurrency, cli.warmup, not cli.repeat_prompts
+                )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print_report(results)
+    if cli.output:
+        os.makedirs(os.path.dirname(cli.output) or ".", exist_ok=True)
+        with open(cli.output, "w", encoding="utf-8") as fp:
+            json.dump({"base_url": base_url, "config": vars(cli), "results": results}, fp, ensure_ascii=False, indent=2)
+        logger.info(f"[LOAD] 결과 저장: {cli.output}")
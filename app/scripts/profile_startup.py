@@ -0,0 +1,88 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from app.utils.log_utils import get_logger
+
+logger = get_logger("profile_startup")
+
+# python -X importtime 출력: "import time:  self [us] | cumulative | imported package"
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def run_importtime(versions: str, preload: bool) -> Tuple[str, float]:
+    """
+    새 인터프리터에서 `import app.main` 을 -X importtime 으로 실행.
+    preload=True 면 import 후 preload_services() 까지 수행해 소요 시간(s)을 함께 반환.
+    """
+    code = "import app.main"
+    if preload:
+        code += (
+            "\nimport time; from app.main import preload_services"
+            "\nfrom app.core.config import EnvVariables"
+            "\n_t = time.perf_counter(); preload_services(EnvVariables.ENABLED_API_VERSIONS)"
+            "\nprint(f'PRELOAD_SEC={time.perf_counter() - _t:.3f}')"
+        )
+    env = dict(os.environ, ENABLED_API_VERSIONS=versions, PRELOAD_SERVICES="false")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import app.main 실패:\n{proc.stderr[-2000:]}")
+
+    preload_sec = 0.0
+    for line in proc.stdout.splitlines():
+        if line.startswith("PRELOAD_SEC="):
+            preload_sec = float(line.split("=", 1)[1])
+    return proc.stderr, preload_sec
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    rows = []
+    for line in stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if m:
+            rows.append({
+                "module": m.group(4),
+                "self_us": int(m.group(1)),
+                "cumulative_us": int(m.group(2)),
+                "depth": len(m.group(3)) // 2,
+            })
+    return rows
+
+
+def report(rows: List[Dict], top: int) -> None:
+    total_us = sum(r["self_us"] for r in rows)
+    logger.info(f"[IMPORT] 모듈 {len(rows)}개, 총 import 시간 {total_us / 1e6:.3f}s")
+
+    # 최상위 패키지별 self 시간 합계 (torch, sentence_transformers, faiss 등 무거운 의존성 파악용)
+    by_package: Dict[str, int] = defaultdict(int)
+    for r in rows:
+        by_package[r["module"].split(".")[0]] += r["self_us"]
+    logger.info(f"[IMPORT] 패키지별 self 시간 상위 {top}")
+    for pkg, us in sorted(by_package.items(), key=lambda kv: -kv[1])[:top]:
+        logger.info(f"  {us / 1e3:10.1f} ms  {us / max(1, total_us) * 100:5.1f}%  {pkg}")
+
+    logger.info(f"[IMPORT] 누적(cumulative) 시간 상위 {top}")
+    for r in sorted(rows, key=lambda r: -r["cumulative_us"])[:top]:
+        logger.info(f"  {r['cumulative_us'] / 1e3:10.1f} ms  {r['module']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="서버 기동(import app.main) 시간 프로파일링")
+    parser.add_argument("--versions", default=os.getenv("ENABLED_API_VERSIONS", "v1,v2,v3"),
+                        help="ENABLED_API_VERSIONS 값 (예: v3)")
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--preload", action="store_true", help="모델/인덱스 preload 시간도 측정")
+    cli = parser.parse_args()
+
+    stderr, preload_sec = run_importtime(cli.versions, cli.preload)
+    report(parse_importtime(stderr), cli.top)
+    if cli.preload:
+        logger.info(f"[PRELOAD] versions={cli.versions} preload {preload_sec:.3f}s")
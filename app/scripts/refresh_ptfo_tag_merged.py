@@ -1,13 +1,14 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import inspect
+import argparse
+
+from sqlalchemy import inspect, select
 
 from app.models.ptfo_info import PtfoInfo
 from app.models.tag_info import TagInfo
 from app.models.ptfo_tag_mapp import PtfoTagMapp
 from app.models.ptfo_tag_merged import PtfoTagMerged
 
-from app.core.database import SessionLocal
 from app.core.database import engine, Base
+from app.utils.table_swap import refresh_by_shadow_swap
 
 
 inspector = inspect(engine)
@@ -16,43 +17,37 @@ if "tb_ptfo_tag_merged" not in inspector.get_table_names():
     Base.metadata.create_all(bind=engine)
 
 
-def populate_merged_table():
-    db: Session = SessionLocal()
-
-    try:
-        db.query(PtfoTagMerged).delete()
-        db.commit()
-
-        joins = (
-            db.query(
-                PtfoInfo.PTFO_SEQNO,
-                PtfoInfo.PTFO_NM,
-                PtfoInfo.PTFO_DESC,
-                TagInfo.TAG_SEQNO,
-                TagInfo.TAG_NM
-            )
-            .join(PtfoTagMapp, PtfoInfo.PTFO_SEQNO == PtfoTagMapp.PTFO_SEQNO)
-            .join(TagInfo, PtfoTagMapp.TAG_SEQNO == TagInfo.TAG_SEQNO)
-            .filter(PtfoTagMapp.TAG_DSP_YN == 'Y')
-            .all()
+def merged_select():
+    # 컬럼 순서 = tb_ptfo_tag_merged 컬럼 순서
+    return (
+        select(
+            PtfoInfo.PTFO_SEQNO,
+            TagInfo.TAG_SEQNO,
+            PtfoInfo.PTFO_NM,
+            PtfoInfo.PTFO_DESC,
+            TagInfo.TAG_NM,
         )
+        .join(PtfoTagMapp, PtfoInfo.PTFO_SEQNO == PtfoTagMapp.PTFO_SEQNO)
+        .join(TagInfo, PtfoTagMapp.TAG_SEQNO == TagInfo.TAG_SEQNO)
+        .where(PtfoTagMapp.TAG_DSP_YN == 'Y')
+    )
 
-        for ptfo_seq, ptfo_nm, ptfo_desc, tag_seq, tag_nm in joins:
-            merged = PtfoTagMerged(
-                PTFO_SEQNO=ptfo_seq,
-                PTFO_NM=ptfo_nm,
-                PTFO_DESC=ptfo_desc,
-                TAG_SEQNO=tag_seq,
-                TAG_NM=tag_nm
-            )
-            db.add(merged)
-
-        db.commit()
-        print(f"merged 테이블 생성 완료: 총 {len(joins)}건")
 
-    finally:
-        db.close()
+def populate_merged_table(mode: str = "insert-select", chunk_size: int = 5000):
+    """
+    shadow 테이블에 적재 후 RENAME TABLE 로 교체 → 리프레시 중에도 기존 데이터가 그대로 조회됨
+    """
+    rows, elapsed = refresh_by_shadow_swap(
+        engine, PtfoTagMerged.__table__, merged_select(), mode=mode, chunk_size=chunk_size
+    )
+    print(f"merged 테이블 생성 완료: 총 {rows}건 ({elapsed:.2f}s)")
 
 
 if __name__ == "__main__":
-    populate_merged_table()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="tb_ptfo_tag_merged 전체 재생성 (shadow 테이블 + RENAME 교체)")
+    parser.add_argument("--mode", choices=["insert-select", "stream"], default="insert-select",
+                        help="insert-select: DB 안에서 한 문장으로 적재 / stream: 서버 사이드 커서로 chunk 적재")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    cli = parser.parse_args()
+
+    populate_merged_table(cli.mode, cli.chunk_size)
@@ -1,72 +1,284 @@
-from sqlalchemy import inspect
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+from sqlalchemy import delete, func, inspect, select, text, tuple_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import Session
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple
 
 from app.core.database import engine, Base, SessionLocal
+from app.models.mv_refresh_state import MvRefreshState
+from app.models.ptfo_change_log import PtfoChangeLog
 from app.models.ptfo_info import PtfoInfo
 from app.models.ptfo_tag_merged_mv import PtfoTagMergedMV
 from app.models.tag_info import TagInfo
 from app.models.ptfo_tag_mapp import PtfoTagMapp
+from app.utils.table_swap import refresh_by_shadow_swap
 
 
 def ensure_table_exists():
     inspector = inspect(engine)
-    if "tb_ptfo_tag_merged_mv" not in inspector.get_table_names():
-        print("tb_ptfo_tag_merged_mv 테이블이 존재하지 않아 생성합니다.")
-        Base.metadata.create_all(bind=engine)
+    existing = set(inspector.get_table_names())
+    required = [PtfoTagMergedMV, PtfoChangeLog, MvRefreshState]
+    missing = [m.__tablename__ for m in required if m.__tablename__ not in existing]
+    if missing:
+        print(f"{', '.join(missing)} 테이블이 존재하지 않아 생성합니다.")
+        Base.metadata.create_all(bind=engine, tables=[m.__table__ for m in required])
 
 # ---------------------------------------------------------------------
-# 리프레시 (전체 재적재 방식: TRUNCATE → INSERT SELECT)
+# 변경 로그 트리거 (tb_ptfo_info / tb_ptfo_tag_mapp / tb_tag_info → tb_ptfo_change_log)
 # ---------------------------------------------------------------------
+LOG_TABLE = PtfoChangeLog.__tablename__
+_NOW_DTM = "DATE_FORMAT(NOW(), '%Y%m%d%H%i%s')"
 
-def refresh_merged_mv_truncate_insert():
-    db: Session = SessionLocal()
-    try:
-        # 테이블 비우기
-        from sqlalchemy import text
-        db.execute(text(f"TRUNCATE TABLE {PtfoTagMergedMV.__tablename__}"))
 
-        rows = (
-            db.query(
-                PtfoInfo.PTFO_SEQNO,
-                TagInfo.TAG_SEQNO,
-                PtfoInfo.PTFO_NM,
-                PtfoInfo.PTFO_DESC,
-                TagInfo.TAG_NM,
-                PtfoInfo.VIEW_LNK_URL,
-                PtfoInfo.PRDN_STDO_NM,
-                PtfoInfo.PRDN_COST,
-                PtfoInfo.PRDN_PERD,
-            )
-            .join(PtfoTagMapp, PtfoInfo.PTFO_SEQNO == PtfoTagMapp.PTFO_SEQNO)
-            .join(TagInfo, PtfoTagMapp.TAG_SEQNO == TagInfo.TAG_SEQNO)
-            .filter(PtfoTagMapp.TAG_DSP_YN == 'Y')
-            .all()
+def _log_row(seqno: str, src: str) -> str:
+    return f"INSERT INTO {LOG_TABLE} (PTFO_SEQNO, SRC_TBL, WR_DTM) VALUES ({seqno}, '{src}', {_NOW_DTM})"
+
+
+def _update_trigger_body(src: str, columns: List[str]) -> str:
+    # MV 에 영향을 주는 컬럼이 바뀐 경우만 기록 (<=> : NULL 안전 비교), 키가 바뀌면 이전 포트폴리오도 기록
+    same = " AND ".join(f"OLD.{c} <=> NEW.{c}" for c in columns)
+    return (
+        f"BEGIN IF NOT ({same}) THEN {_log_row('NEW.PTFO_SEQNO', src)}; END IF; "
+        f"IF NOT (OLD.PTFO_SEQNO <=> NEW.PTFO_SEQNO) THEN {_log_row('OLD.PTFO_SEQNO', src)}; END IF; END"
+    )
+
+
+def _tag_trigger_body(tag_seqno: str) -> str:
+    # 태그명 변경/태그 삭제는 그 태그가 매핑된 포트폴리오 전체에 영향
+    mapp = PtfoTagMapp.__tablename__
+    return (
+        f"INSERT INTO {LOG_TABLE} (PTFO_SEQNO, SRC_TBL, WR_DTM) "
+        f"SELECT DISTINCT PTFO_SEQNO, '{TagInfo.__tablename__}', {_NOW_DTM} FROM {mapp} WHERE TAG_SEQNO = {tag_seqno}"
+    )
+
+
+def _change_triggers() -> Dict[str, str]:
+    info, mapp, tag = PtfoInfo.__tablename__, PtfoTagMapp.__tablename__, TagInfo.__tablename__
+    info_cols = ["PTFO_SEQNO"] + [c.name for c in INFO_COLUMNS]
+    mapp_cols = ["PTFO_SEQNO", "TAG_SEQNO", "TAG_DSP_YN"]
+    return {
+        "trg_ptfo_info_ai": f"AFTER INSERT ON {info} FOR EACH ROW {_log_row('NEW.PTFO_SEQNO', info)}",
+        "trg_ptfo_info_au": f"AFTER UPDATE ON {info} FOR EACH ROW {_update_trigger_body(info, info_cols)}",
+        "trg_ptfo_info_ad": f"AFTER DELETE ON {info} FOR EACH ROW {_log_row('OLD.PTFO_SEQNO', info)}",
+        "trg_ptfo_tag_mapp_ai": f"AFTER INSERT ON {mapp} FOR EACH ROW {_log_row('NEW.PTFO_SEQNO', mapp)}",
+        "trg_ptfo_tag_mapp_au": f"AFTER UPDATE ON {mapp} FOR EACH ROW {_update_trigger_body(mapp, mapp_cols)}",
+        "trg_ptfo_tag_mapp_ad": f"AFTER DELETE ON {mapp} FOR EACH ROW {_log_row('OLD.PTFO_SEQNO', mapp)}",
+        "trg_tag_info_au": (
+            f"AFTER UPDATE ON {tag} FOR EACH ROW "
+            f"BEGIN IF NOT (OLD.TAG_NM <=> NEW.TAG_NM) THEN {_tag_trigger_body('NEW.TAG_SEQNO')}; END IF; END"
+        ),
+        "trg_tag_info_ad": f"AFTER DELETE ON {tag} FOR EACH ROW {_tag_trigger_body('OLD.TAG_SEQNO')}",
+    }
+
+
+def ensure_change_triggers() -> List[str]:
+    """
+    원본 테이블 변경을 tb_ptfo_change_log 에 기록하는 트리거를 없는 것만 생성하고, 생성한 트리거 이름을 반환.
+    원본 테이블 DML 마다 로그 쓰기가 추가되고 TRIGGER 권한(binlog 사용 시 SUPER 또는
+    log_bin_trust_function_creators)이 필요하므로 --install-triggers 또는 incremental 모드에서만 호출.
+    트리거를 새로 만들었다면 그 전의 변경은 로그에 없으므로 증분 상태를 지워 다음 증분 실행이 전체 리프레시부터 하도록 함.
+    """
+    triggers = _change_triggers()
+    with engine.begin() as conn:
+        existing = set(conn.execute(
+            text("SELECT TRIGGER_NAME FROM information_schema.TRIGGERS WHERE TRIGGER_SCHEMA = DATABASE()")
+        ).scalars())
+        missing = [name for name in triggers if name not in existing]
+        for name in missing:
+            conn.execute(text(f"CREATE TRIGGER {name} {triggers[name]}"))
+        if missing:
+            print(f"변경 로그 트리거 생성: {', '.join(missing)}")
+            conn.execute(delete(MvRefreshState).where(MvRefreshState.MV_NM == MV_NAME))
+    return missing
+
+# ---------------------------------------------------------------------
+# 리프레시 (전체 재적재 방식: shadow 테이블 적재 → RENAME TABLE 교체)
+# ---------------------------------------------------------------------
+
+def merged_mv_select():
+    # 컬럼 순서 = tb_ptfo_tag_merged_mv 컬럼 순서
+    return (
+        select(
+            PtfoInfo.PTFO_SEQNO,
+            TagInfo.TAG_SEQNO,
+            PtfoInfo.PTFO_NM,
+            PtfoInfo.PTFO_DESC,
+            TagInfo.TAG_NM,
+            PtfoInfo.VIEW_LNK_URL,
+            PtfoInfo.PRDN_STDO_NM,
+            PtfoInfo.PRDN_COST,
+            PtfoInfo.PRDN_PERD,
         )
+        .join(PtfoTagMapp, PtfoInfo.PTFO_SEQNO == PtfoTagMapp.PTFO_SEQNO)
+        .join(TagInfo, PtfoTagMapp.TAG_SEQNO == TagInfo.TAG_SEQNO)
+        .where(PtfoTagMapp.TAG_DSP_YN == 'Y')
+    )
 
-        payload = [
-            dict(
-                PTFO_SEQNO=r[0],
-                TAG_SEQNO=r[1],
-                PTFO_NM=r[2],
-                PTFO_DESC=r[3],
-                TAG_NM=r[4],
-                VIEW_LNK_URL=r[5],
-                PRDN_STDO_NM=r[6],
-                PRDN_COST=r[7],
-                PRDN_PERD=r[8],
-            ) for r in rows
-        ]
-        if payload:
-            db.bulk_insert_mappings(PtfoTagMergedMV, payload)
 
-        db.commit()
-        print(f"tb_ptfo_tag_merged_mv 리프레시 완료 (재적재): {len(payload)}건")
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+def refresh_merged_mv_swap(mode: str = "insert-select", chunk_size: int = 5000):
+    """
+    TRUNCATE 후 재적재하면 리프레시 동안 테이블이 비어 보이므로,
+    shadow 테이블에 적재한 뒤 RENAME TABLE 로 원자적 교체 (읽기 쪽은 기존/신규 중 하나만 봄)
+    """
+    # 적재 시작 전에 미반영 변경을 스냅샷 → 적재 결과에 확실히 포함된 변경만 교체 후 소비.
+    # 적재 도중 기록된 변경은 로그에 남아 다음 증분 리프레시가 다시 반영 (반영은 멱등)
+    with engine.connect() as conn:
+        pending = _pending_log(conn)
+
+    rows, elapsed = refresh_by_shadow_swap(
+        engine, PtfoTagMergedMV.__table__, merged_mv_select(), mode=mode, chunk_size=chunk_size
+    )
+    print(f"tb_ptfo_tag_merged_mv 리프레시 완료 (shadow 교체): {rows}건 ({elapsed:.2f}s)")
+
+    with engine.begin() as conn:
+        _consume_log(conn, [r.LOG_SEQNO for r in pending])
+        _save_hwm(conn, max((r.WR_DTM for r in pending), default=None))
+
+# ---------------------------------------------------------------------
+# 리프레시 (변경 로그 기반 증분 방식)
+# ---------------------------------------------------------------------
+MV_NAME = PtfoTagMergedMV.__tablename__
+IN_CHUNK = 1000  # IN (...) 목록 최대 길이
+
+# MV 에 복사되는 tb_ptfo_info 컬럼 (이 컬럼이 바뀔 때만 변경 로그 기록)
+INFO_COLUMNS = [
+    PtfoInfo.PTFO_NM, PtfoInfo.PTFO_DESC, PtfoInfo.VIEW_LNK_URL,
+    PtfoInfo.PRDN_STDO_NM, PtfoInfo.PRDN_COST, PtfoInfo.PRDN_PERD,
+]
+
+
+def _has_state(conn) -> bool:
+    return conn.execute(select(MvRefreshState.MV_NM).where(MvRefreshState.MV_NM == MV_NAME)).first() is not None
+
+
+def _load_hwm(conn) -> Optional[str]:
+    return conn.execute(select(MvRefreshState.HWM_DTM).where(MvRefreshState.MV_NM == MV_NAME)).scalar()
+
+
+def _save_hwm(conn, hwm: Optional[str]) -> None:
+    # 값이 없으면(반영한 변경 없음) 이전 값을 유지
+    now = datetime.now().strftime("%Y%m%d%H%M%S")
+    stmt = mysql_insert(MvRefreshState).values(MV_NM=MV_NAME, HWM_DTM=hwm, UPD_DTM=now)
+    conn.execute(stmt.on_duplicate_key_update(
+        HWM_DTM=func.coalesce(stmt.inserted.HWM_DTM, MvRefreshState.HWM_DTM), UPD_DTM=stmt.inserted.UPD_DTM
+    ))
+
+
+def _chunks(ids: List[int]):
+    for i in range(0, len(ids), IN_CHUNK):
+        yield ids[i:i + IN_CHUNK]
+
+
+def _pending_log(conn):
+    """
+    미반영 변경 로그 (반영된 행은 삭제되므로 비용이 테이블 크기가 아니라 변경량에 비례).
+    HWM(최대 LOG_SEQNO) 대신 읽은 LOG_SEQNO 를 그대로 소비 — 먼저 채번되고 늦게 커밋된 행을 건너뛰지 않음
+    """
+    return conn.execute(
+        select(PtfoChangeLog.LOG_SEQNO, PtfoChangeLog.PTFO_SEQNO, PtfoChangeLog.WR_DTM).order_by(PtfoChangeLog.LOG_SEQNO)
+    ).all()
+
+
+def _consume_log(conn, log_seqnos: List[int]) -> None:
+    for ids in _chunks(log_seqnos):
+        conn.execute(delete(PtfoChangeLog).where(PtfoChangeLog.LOG_SEQNO.in_(ids)))
+
+
+def _detect_changes(conn, pending) -> Tuple[Set[int], Set[int]]:
+    """
+    (변경된 포트폴리오, 삭제된 포트폴리오) PTFO_SEQNO 집합.
+    변경 로그의 포트폴리오 중 tb_ptfo_info 에 없는 것(PK 조회)이 삭제된 포트폴리오.
+    """
+    changed = {r.PTFO_SEQNO for r in pending}
+    alive: Set[int] = set()
+    for ids in _chunks(sorted(changed)):
+        alive.update(conn.execute(select(PtfoInfo.PTFO_SEQNO).where(PtfoInfo.PTFO_SEQNO.in_(ids))).scalars())
+    return changed, changed - alive
+
+
+def _apply_changes(conn, changed: List[int]) -> Tuple[int, int]:
+    """
+    변경 포트폴리오만 UPSERT 하고, 그 포트폴리오의 쌍 중 더 이상 조인 결과에 없는 것
+    (매핑 삭제·비노출, 포트폴리오/태그 삭제)은 삭제. (upsert 행 수, 삭제 행 수)를 반환
+    """
+    upserted = removed = 0
+    columns = [c.name for c in PtfoTagMergedMV.__table__.columns]
+    for ids in _chunks(changed):
+        ins = mysql_insert(PtfoTagMergedMV).from_select(columns, merged_mv_select().where(PtfoInfo.PTFO_SEQNO.in_(ids)))
+        ins = ins.on_duplicate_key_update({c: ins.inserted[c] for c in columns if c not in ("PTFO_SEQNO", "TAG_SEQNO")})
+        upserted += conn.execute(ins).rowcount or 0
+
+        visible_pairs = (
+            select(PtfoTagMapp.PTFO_SEQNO, PtfoTagMapp.TAG_SEQNO)
+            .join(PtfoInfo, PtfoInfo.PTFO_SEQNO == PtfoTagMapp.PTFO_SEQNO)
+            .join(TagInfo, TagInfo.TAG_SEQNO == PtfoTagMapp.TAG_SEQNO)
+            .where(PtfoTagMapp.TAG_DSP_YN == 'Y', PtfoTagMapp.PTFO_SEQNO.in_(ids))
+        )
+        removed += conn.execute(
+            delete(PtfoTagMergedMV).where(
+                PtfoTagMergedMV.PTFO_SEQNO.in_(ids),
+                tuple_(PtfoTagMergedMV.PTFO_SEQNO, PtfoTagMergedMV.TAG_SEQNO).not_in(visible_pairs),
+            )
+        ).rowcount or 0
+    return upserted, removed
+
+
+def _apply_pending_log(conn, save_state: bool = True) -> Tuple[int, List[int], Set[int], int, int, Optional[str]]:
+    """
+    미반영 변경 로그를 MV 에 반영하고 읽은 로그 행만 소비 — 반영 도중 기록된 변경은 로그에 남아 다음 리프레시에서 처리.
+    (로그 건수, 변경 PTFO_SEQNO, 삭제 PTFO_SEQNO, upsert 행 수, 삭제 행 수, 마지막 로그 기록 시각)을 반환
+    """
+    pending = _pending_log(conn)
+    changed, deleted = _detect_changes(conn, pending)
+    changed_ids = sorted(changed)
+    upserted, removed = _apply_changes(conn, changed_ids)
+    _consume_log(conn, [r.LOG_SEQNO for r in pending])
+    last_dtm = max((r.WR_DTM for r in pending), default=None)
+    if save_state:
+        _save_hwm(conn, last_dtm)
+    return len(pending), changed_ids, deleted, upserted, removed, last_dtm
+
+
+def refresh_merged_mv_incremental(output_path: Optional[str] = None) -> Dict:
+    """
+    변경 로그(tb_ptfo_change_log)에 쌓인 포트폴리오만 MV 에 반영 (비용이 테이블 크기가 아니라 변경량에 비례).
+    변경 로그 트리거가 없으면 먼저 생성하고, 최초 실행(증분 상태 없음)이면 전체 교체 리프레시로 기준을 만든다.
+    변경/삭제된 PTFO_SEQNO 목록을 반환하고, output_path 가 있으면 JSON 으로 저장 (재임베딩 대상).
+    """
+    start = time.perf_counter()
+    ensure_change_triggers()
+    with engine.connect() as conn:
+        has_state = _has_state(conn)
+        hwm = _load_hwm(conn)
+
+    if not has_state:
+        print("증분 리프레시 기준이 없어 전체 리프레시를 수행합니다.")
+        refresh_merged_mv_swap()
+        with engine.connect() as conn:
+            seqnos = sorted(conn.execute(select(PtfoTagMergedMV.PTFO_SEQNO).distinct()).scalars())
+        result = {"since": None, "until": None, "full": True, "changed": seqnos, "deleted": []}
+    else:
+        with engine.begin() as conn:
+            logs, changed_ids, deleted, upserted, removed, new_hwm = _apply_pending_log(conn)
+        result = {
+            "since": hwm, "until": new_hwm or hwm, "full": False,
+            "changed": changed_ids, "deleted": sorted(deleted),
+        }
+        print(f"tb_ptfo_tag_merged_mv 증분 리프레시 완료: 포트폴리오 {len(changed_ids)}개 "
+              f"(삭제 {len(deleted)}), 로그 {logs}건, upsert {upserted}행, 삭제 {removed}행 "
+              f"({time.perf_counter() - start:.2f}s)")
+
+    if output_path:
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        with open(output_path, "w", encoding="utf-8") as fp:
+            json.dump(result, fp, ensure_ascii=False, indent=2)
+        print(f"변경 PTFO_SEQNO 목록 저장: {output_path}")
+    return result
 
 # ---------------------------------------------------------------------
 # 리프레시 (증분 UPSERT 방식)
@@ -74,6 +286,8 @@ def refresh_merged_mv_truncate_insert():
 def refresh_merged_mv_upsert():
     """
     갱신량이 적고 락을 최소화하고 싶을 때. ON DUPLICATE KEY UPDATE 사용.
+    UPSERT 는 사라진 쌍을 지우지 않으므로, 끝난 뒤 변경 로그를 반영·소비해 삭제/비노출된 쌍을 정리하고 로그가 쌓이지 않게 함.
+    (증분 기준은 만들지 않음 — 기준은 전체 교체 리프레시로만 생성)
     """
     db: Session = SessionLocal()
     try:
@@ -138,10 +352,32 @@ def refresh_merged_mv_upsert():
     finally:
         db.close()
 
+    with engine.begin() as conn:
+        logs, _, _, _, removed, _ = _apply_pending_log(conn, save_state=False)
+    if logs:
+        print(f"변경 로그 {logs}건 반영: 삭제 {removed}행")
+
 # ---------------------------------------------------------------------
 # Entrypoint
 # ---------------------------------------------------------------------
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="tb_ptfo_tag_merged_mv 리프레시")
+    parser.add_argument("--mode", choices=["insert-select", "stream", "upsert", "incremental"], default="insert-select",
+                        help="insert-select/stream: shadow 테이블 교체 (stream 은 서버 사이드 커서 chunk 적재), "
+                             "upsert: ON DUPLICATE KEY UPDATE, incremental: 마지막 리프레시 이후 변경분만 반영")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--changed-output", default=None,
+                        help="incremental 모드에서 변경 PTFO_SEQNO 목록(JSON) 저장 경로")
+    parser.add_argument("--install-triggers", action="store_true",
+                        help="원본 테이블에 변경 로그 트리거 생성 (TRIGGER 권한 필요, incremental 모드는 없으면 자동 생성)")
+    cli = parser.parse_args()
+
     ensure_table_exists()
-    refresh_merged_mv_truncate_insert()
-    # refresh_merged_mv_upsert()
\ No newline at end of file
+    if cli.install_triggers:
+        ensure_change_triggers()
+    if cli.mode == "upsert":
+        refresh_merged_mv_upsert()
+    elif cli.mode == "incremental":
+        refresh_merged_mv_incremental(cli.changed_output)
+    else:
+        refresh_merged_mv_swap(cli.mode, cli.chunk_size)
\ No newline at end of file
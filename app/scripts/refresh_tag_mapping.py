@@ -0,0 +1,36 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import os
+
+from app.core.config import ModelConfig
+from app.utils.log_utils import get_logger
+from app.utils.tag_mapping import refresh_tag_mapping
+
+logger = get_logger("refresh_tag_mapping")
+
+
+def tag_mapping_dirs(versions) -> list:
+    """
+    버전별 artifacts 디렉토리 (v3 샤드 디렉토리가 있으면 함께 포함)
+    """
+    dirs = []
+    for v in versions:
+        artifacts_dir = f"{ModelConfig.ARTIFACTS_ROOT}/{v}/{ModelConfig.EMBEDDING_MODEL}"
+        if not os.path.isdir(artifacts_dir):
+            logger.warning(f"[TagMapping] {artifacts_dir} 없음 → 건너뜀")
+            continue
+        dirs.append(artifacts_dir)
+        shards_dir = os.path.join(artifacts_dir, "shards")
+        if v == "v3" and os.path.exists(os.path.join(shards_dir, "manifest.json")):
+            dirs.append(shards_dir)
+    return dirs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="tb_ptfo_tag_merged 를 다시 읽어 artifacts 의 tag_mapping.json 갱신 (재색인 없이 태그만 반영)"
+    )
+    parser.add_argument("--version", nargs="+", choices=["v1", "v2", "v3"], default=["v1", "v2", "v3"])
+    cli = parser.parse_args()
+
+    refresh_tag_mapping(tag_mapping_dirs(cli.version))
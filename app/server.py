@@ -0,0 +1,251 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import gc
+import os
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from app.core.config import EnvVariables, ModelConfig
+from app.utils.log_utils import get_logger
+
+logger = get_logger("PreforkServer")
+
+SMAPS_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+
+# ---------- 메모리 보고 ----------
+def read_smaps_rollup(pid: int) -> Optional[Dict[str, int]]:
+    """
+    /proc/<pid>/smaps_rollup 에서 메모리 항목(kB) 읽기 (Linux 전용, 없으면 None)
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as fp:
+            lines = fp.readlines()
+    except OSError:
+        return None
+    stats: Dict[str, int] = {}
+    for line in lines:
+        key, _, rest = line.partition(":")
+        if key in SMAPS_FIELDS:
+            stats[key] = int(rest.split()[0])
+    return stats
+
+
+def log_memory_report(master_pid: int, workers: Dict[int, int]) -> None:
+    """
+    워커별 RSS / PSS / 공유(shared) / 전용(private) 메모리 로그.
+    공유 메모리가 크고 전용 메모리가 작을수록 모델/인덱스가 copy-on-write 로 잘 공유되고 있다는 의미.
+    """
+    rows = [("master", master_pid)] + [(f"worker-{wid}", pid) for pid, wid in sorted(workers.items(), key=lambda kv: kv[1])]
+    total_private = 0
+    for name, pid in rows:
+        st = read_smaps_rollup(pid)
+        if st is None:
+            logger.info(f"[MEM] {name} pid={pid}: smaps_rollup 을 읽을 수 없음")
+            continue
+        shared = st.get("Shared_Clean", 0) + st.get("Shared_Dirty", 0)
+        private = st.get("Private_Clean", 0) + st.get("Private_Dirty", 0)
+        if name != "master":
+            total_private += private
+        logger.info(
+            f"[MEM] {name:>9} pid={pid}: rss={st.get('Rss', 0) / 1024:.1f}MB "
+            f"pss={st.get('Pss', 0) / 1024:.1f}MB shared={shared / 1024:.1f}MB private={private / 1024:.1f}MB"
+        )
+    logger.info(f"[MEM] 워커 전용 메모리 합계={total_private / 1024:.1f}MB (workers={len(workers)})")
+
+
+# ---------- fork 전 준비 ----------
+def preload_and_freeze(versions: List[str]) -> None:
+    """
+    부모 프로세스에서 모델/인덱스를 1회 로드한 뒤 fork 후에도 공유되도록 고정.
+    - numpy 행렬 읽기 전용 처리 (워커가 쓰면 예외 → 페이지 복사 방지)
+    - gc.freeze(): 로드된 객체를 GC 추적 대상에서 제외 → 워커의 GC 가 공유 페이지를 건드리지 않음
+    """
+    from app.main import preload_services
+
+    start = time.perf_counter()
+    preload_services(versions)
+
+    from app.services.v3 import search_service as search_v3
+    if search_v3._search_service.is_loaded():
+        frozen = search_v3.get_search_service().freeze_arrays()
+        logger.info(f"[Prefork] v3 factor 행렬 읽기 전용 고정: {frozen / 1e6:.1f}MB")
+
+    # 부모가 열어둔 DB 커넥션은 워커에서 공유하면 안 되므로 fork 전에 정리
+    from app.core.database import engine
+    engine.dispose()
+
+    gc.collect()
+    gc.freeze()
+    logger.info(f"[Prefork] preload 완료 ({time.perf_counter() - start:.2f}s), gc frozen={gc.get_freeze_count()}")
+
+
+def share_cursor_store(workers: int) -> Optional[str]:
+    """
+    연결은 아무 워커나 받으므로 워커가 2개 이상이면 v3 커서를 파일로 공유해야 다음 페이지 요청이 410 이 되지 않음.
+    CURSOR_SHARED_DIR 이 없으면 임시 디렉터리(/dev/shm 우선)를 만들어 fork 전에 지정하고, 정리할 경로를 반환.
+    """
+    from app.services.v3.rank_service import rank_cursor_store
+
+    if workers < 2 or rank_cursor_store.shared_dir:
+        return None
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    directory = tempfile.mkdtemp(prefix="ragvertise-cursors-", dir=base)
+    rank_cursor_store.enable_shared(directory)
+    logger.info(f"[Prefork] 워커 간 커서 공유 디렉터리: {directory}")
+    return directory
+
+
+def _reload_onnx_encoder_in_worker() -> None:
+    """
+    ONNX Runtime 세션의 스레드 풀은 fork 후 자식에 남지 않으므로 워커에서 인코더만 새로 만든다.
+    (SBERT 인코더는 fastText/인덱스 대비 작아서 워커별로 가져도 부담이 적음)
+    """
+    from app.services.v2 import search_service as search_v2
+    from app.services.v3 import search_service as search_v3
+    from app.utils import sbert_encoder
+
+    sbert_encoder._encoder.reset()
+    encoder = sbert_encoder.get_sentence_encoder()
+    for holder in (search_v2._search_service_v2, search_v3._search_service):
+        if holder.is_loaded():
+            holder.get().embedding_model = encoder
+
+
+def _set_worker_threads(threads: int) -> None:
+    """
+    워커 수만큼 코어를 나눠 쓰도록 torch / faiss(OpenMP) 스레드 수를 제한
+    """
+    import faiss
+    faiss.omp_set_num_threads(threads)
+    if (ModelConfig.ENCODER_BACKEND or "torch").lower() == "torch":
+        import torch
+        torch.set_num_threads(threads)
+
+
+# ---------- 워커 ----------
+def _run_worker(sock: socket.socket, worker_id: int, threads: int) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)  # 부모의 reload 핸들러 대신 lifespan 에서 워커용 핸들러 설치
+
+    import uvicorn
+    from app.main import app
+
+    if (ModelConfig.ENCODER_BACKEND or "torch").lower() == "onnx":
+        _reload_onnx_encoder_in_worker()
+    _set_worker_threads(threads)
+
+    logger.info(f"[Prefork] worker-{worker_id} 시작 pid={os.getpid()} threads={threads}")
+    # lifespan 의 preload 는 이미 로드된 싱글톤을 그대로 반환하므로 추가 로드 없음
+    config = uvicorn.Config(app, lifespan="on", log_level="info", access_log=False)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(host: str, port: int, workers: int, report_interval: float) -> None:
+    versions = EnvVariables.ENABLED_API_VERSIONS
+    preload_and_freeze(versions)
+    cursor_dir = share_cursor_store(workers) if "v3" in versions else None
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+
+    threads = ModelConfig.ENCODER_NUM_THREADS or max(1, (os.cpu_count() or 1) // workers)
+    children: Dict[int, int] = {}  # pid -> worker_id
+    stopping = False
+
+    def spawn(worker_id: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(sock, worker_id, threads)
+            except Exception as e:
+                logger.error(f"[Prefork] worker-{worker_id} 비정상 종료: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = worker_id
+
+    def shutdown(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        logger.info(f"[Prefork] 종료 신호({signum}) 수신 → 워커 종료")
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def reload(_signum, _frame):
+        # 부모도 다시 로드해 두어야 이후 재시작되는 워커가 새 artifacts 로 fork 됨 → 워커에는 SIGHUP 전달
+        from app.main import reload_artifacts
+        from app.services.v3 import search_service as search_v3
+
+        logger.info("[Prefork] SIGHUP 수신 → artifacts 다시 로드")
+        reload_artifacts()
+        if search_v3._search_service.is_loaded():
+            search_v3.get_search_service().freeze_arrays()
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGHUP)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    if hasattr(signal, "SIGHUP"):
+        signal.signal(signal.SIGHUP, reload)
+
+    for wid in range(workers):
+        spawn(wid)
+    logger.info(f"[Prefork] http://{host}:{port} workers={workers} versions={versions}")
+
+    master_pid = os.getpid()
+    next_report = time.monotonic() + 5.0  # 워커 기동 직후 1회 보고
+    while children:
+        try:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid:
+            wid = children.pop(pid, None)
+            if not stopping and wid is not None:
+                logger.warning(f"[Prefork] worker-{wid} 종료(status={status}) → 재시작")
+                time.sleep(1.0)  # 기동 직후 반복 실패 시 과도한 fork 방지
+                spawn(wid)
+            continue
+
+        if next_report is not None and time.monotonic() >= next_report:
+            log_memory_report(master_pid, children)
+            next_report = time.monotonic() + report_interval if report_interval > 0 else None
+        time.sleep(0.5)
+
+    sock.close()
+    if cursor_dir:
+        shutil.rmtree(cursor_dir, ignore_errors=True)
+    logger.info("[Prefork] 종료")
+
+
+if __name__ == "__main__":
+    if not hasattr(os, "fork"):
+        sys.exit("prefork 서버는 fork 를 지원하는 OS(Linux/macOS)에서만 실행할 수 있습니다.")
+
+    parser = argparse.ArgumentParser(description="모델/인덱스를 1회 로드 후 fork 하는 멀티 워커 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(EnvVariables.API_PORT or 9000))
+    parser.add_argument("--workers", type=int, default=EnvVariables.SERVER_WORKERS)
+    parser.add_argument("--report-interval", type=float, default=EnvVariables.SERVER_MEMORY_REPORT_INTERVAL_SEC,
+                        help="워커 메모리 보고 주기(초), 0 이면 기동 직후 1회")
+    cli = parser.parse_args()
+
+    serve(cli.host, cli.port, max(1, cli.workers), cli.report_interval)
@@ -1,6 +1,5 @@
 # SPDX-License-Identifier: Apache-2.0
-import ollama
-
+from app.core.config import ModelConfig
 from app.schemas.v1.generate_dto import GenerateDTO
 from app.utils.json_extractor import extract_json_from_response
 
@@ -19,6 +18,7 @@ class GenerateService:
             2. 메시지 구성 및 LLM 호출:
                 - 시스템 프롬프트와 사용자 입력(request.user_prompt)을 포함하는 메시지 리스트를 구성합니다.
                 - ollama.chat()을 호출하여 LLM(mistral 모델)에 요청을 보냅니다.
+                - LLM_PROVIDER=stub 이면 ollama 대신 로컬 대역(StubLLMClient)을 사용합니다. (부하 테스트용)
 
             3. LLM 응답 처리 및 JSON 파싱:
                 - LLM 응답에서 "message" 필드의 "content" 값을 추출합니다.
@@ -52,13 +52,19 @@ class GenerateService:
         ["홍보영상", "행사 스케치", "TV CF", "관공서", "앱/서비스", "식음료", "공간/인테리어", "교육/기관" ,"자동차", "뷰티", "의료/제약", "음악/리드미컬", "기록/정보전달", "코믹/흥미유발", "공감형성", "신뢰형성", "브랜딩", "모션/인포그래픽", "드론", "배우/모델", "숏폼", "3D", "제품/기술"]
         """
 
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": request.user_prompt}
-        ]
-        llm_resp  = ollama.chat(model="llama3:8b", messages=messages)
-        llm_response_str = llm_resp["message"]["content"]
-        print(llm_response_str)
+        if (ModelConfig.LLM_PROVIDER or "").lower() == "stub":
+            from app.utils.stub_llm import StubLLMClient
+            llm_response_str = StubLLMClient().chat_completion(system_prompt, request.user_prompt)
+        else:
+            import ollama
+
+            messages = [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": request.user_prompt}
+            ]
+            llm_resp  = ollama.chat(model="llama3:8b", messages=messages)
+            llm_response_str = llm_resp["message"]["content"]
+            print(llm_response_str)
 
         llm_data = extract_json_from_response(llm_response_str)
 
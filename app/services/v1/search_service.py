@@ -5,13 +5,12 @@ import pickle
 import numpy as np
 
 import faiss
-from sentence_transformers import SentenceTransformer
 
-from app.core.database import get_db
 from app.core.config import SearchConfig, ModelConfig
-from app.models.ptfo_tag_merged import PtfoTagMerged
 from app.schemas.v1.search_dto import SearchDTO
 from app.utils.mmr_reranker import mmr_rerank
+from app.utils.sbert_encoder import get_sentence_encoder
+from app.utils.tag_mapping import load_tag_mapping
 
 
 class SearchService:
@@ -28,8 +27,8 @@ class SearchService:
            - portfolio_embedding_vectors: 각 포폴의 임베딩 벡터 (numpy array, shape: (N, d)).
            - portfolio_records: 각 포폴의 상세 정보 (예: PTFO_SEQNO, PTFO_NM, PTFO_DESC 등).
 
-        2. 데이터베이스에서 tb_ptfo_tag_merged 테이블을 조회하여,
-           각 포폴의 태그 목록을 매핑(딕셔너리) 형태로 생성합니다.
+        2. artifacts 디렉토리의 "tag_mapping.json" 에서 각 포폴의 태그 목록 매핑(딕셔너리)을 읽습니다.
+           (빌드 시 tb_ptfo_tag_merged 로부터 생성, 파일이 바뀔 때만 다시 읽음 — 요청마다 DB 조회 없음)
 
         3. 임베딩 모델(SentenceTransformer 'all-MiniLM-L6-v2')을 초기화하여,
            사용자 입력 요약과 태그를 임베딩합니다.
@@ -60,7 +59,7 @@ class SearchService:
            - 각 객체는 최종 점수, 텍스트 유사도, 태그 유사도, 포폴 일련번호(PTFO_SEQNO), 포폴명(PTFO_NM),
              포폴 설명(PTFO_DESC), 그리고 해당 포폴에 매핑된 태그 리스트(tag_names)를 포함합니다.
         """
-        artifacts_dir = f"./artifacts/v1/{ModelConfig.EMBEDDING_MODEL}"
+        artifacts_dir = f"{ModelConfig.ARTIFACTS_ROOT}/v1/{ModelConfig.EMBEDDING_MODEL}"
 
         # 1. artifacts에서 포폴 임베딩 & 정보 로딩
         with open(os.path.join(artifacts_dir, "portfolio_embeddings.pkl"), "rb") as f:
@@ -68,15 +67,11 @@ class SearchService:
         portfolio_embedding_vectors = portfolio_artifact["embeddings"]  # numpy array, shape (N, d)
         portfolio_records = portfolio_artifact["data"]  # 각 원소: dict {PTFO_SEQNO, PTFO_NM, PTFO_DESC}
 
-        # 2. DB에서 tb_ptfo_tag_merged 테이블 조회하여 각 포폴의 태그 리스트 매핑 생성
-        db = next(get_db())
-        tag_rows = db.query(PtfoTagMerged).all()
-        portfolio_tag_mapping = {}
-        for row in tag_rows:
-            portfolio_tag_mapping.setdefault(row.PTFO_SEQNO, []).append(row.TAG_NM)
+        # 2. artifacts 의 tag_mapping.json 에서 각 포폴의 태그 리스트 매핑 로드
+        portfolio_tag_mapping = load_tag_mapping(artifacts_dir, portfolio_records)
 
         # 3. 임베딩 모델 초기화 (텍스트 및 태그 모두 동일 모델 사용)
-        embedding_model = SentenceTransformer(ModelConfig.EMBEDDING_MODEL)
+        embedding_model = get_sentence_encoder()
 
         #############################
         # 3-1. 텍스트 유사도 계산 (FAISS)
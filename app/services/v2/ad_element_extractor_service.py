@@ -4,23 +4,31 @@ import time
 import json
 import re
 import logging
-from typing import Optional, Tuple
+import threading
+from typing import TYPE_CHECKING, Optional, Tuple
 
-from app.core.config import ModelConfig
+from app.core.config import ModelConfig, CacheConfig
 from app.schemas.v2.ad_element_extractor_dto import AdElementDTOV2
-from app.utils.gemini_api import GeminiClient           # 내부에 rate limit 포함
-from app.utils.ollama_api import OllamaClient           # 별도 모듈로 분리
-from app.utils.log_utils import get_logger
+from app.utils.lazy_singleton import LazySingleton
+from app.utils.log_utils import get_logger, log_payload
+from app.utils.metrics import record_llm_call, record_llm_retry, span
+from app.utils.semantic_prompt_cache import SemanticPromptCache
+
+if TYPE_CHECKING:
+    from app.utils.gemini_api import GeminiClient       # 내부에 rate limit 포함
+    from app.utils.ollama_api import OllamaClient       # 별도 모듈로 분리
 
 logger = get_logger("AdElementExtractorServiceV2")
 
 
 class AdElementExtractorServiceV2:
     """
-    LLM(provider=gemini/ollama)으로 desc/what/how/style 추출.
+    LLM(provider=gemini/ollama/stub)으로 desc/what/how/style 추출.
     - Gemini의 RPM 제한은 GeminiClient 내부에서 처리 → 여기서는 재시도만 관리.
     - Ollama는 리미트 없음.
+    - stub 은 네트워크 없는 결정적 로컬 대역 (부하 테스트용, StubLLMClient).
     - 동일 인터페이스(chat_completion(system_prompt, user_prompt)) 사용.
+    - 의미 기반 프롬프트 캐시(SemanticPromptCache)로 유사한 프롬프트는 LLM 호출 생략.
     """
 
     MAX_RETRIES: int = int(getattr(ModelConfig, "LLM_MAX_RETRIES", 3))
@@ -38,40 +46,72 @@ class AdElementExtractorServiceV2:
 
     def __init__(
         self,
-        gemini_client: Optional[GeminiClient] = None,
-        ollama_client: Optional[OllamaClient] = None,
+        gemini_client: Optional["GeminiClient"] = None,
+        ollama_client: Optional["OllamaClient"] = None,
+        prompt_cache: Optional[SemanticPromptCache] = None,
     ):
         # 같은 인스턴스 재사용 (gemini의 경우 RPM 관리해야 하므로)
-        self._gemini = gemini_client or GeminiClient()
-        self._ollama = ollama_client or OllamaClient(model=getattr(ModelConfig, "OLLAMA_MODEL", None))
+        # 클라이언트는 실제 사용하는 provider 것만 첫 호출 시 생성 (google.genai / ollama import 지연)
+        self._gemini = gemini_client
+        self._ollama = ollama_client
+        self._stub = None
+        self._client_lock = threading.Lock()
+        self._prompt_cache = prompt_cache or (SemanticPromptCache() if CacheConfig.PROMPT_CACHE_ENABLED else None)
 
 
-    def extract_elements(self, req: AdElementDTOV2.AdElementRequest) -> AdElementDTOV2.AdElementResponse:
+    def extract_elements(
+        self,
+        req: AdElementDTOV2.AdElementRequest,
+        use_cache: bool = True,
+    ) -> AdElementDTOV2.AdElementResponse:
+        """
+        use_cache=False 면 프롬프트 캐시를 건너뜀 (임베딩 빌드처럼 포트폴리오마다 개별 추출이 필요한 경우).
+        """
         provider, _model = self._get_provider_and_model()
 
+        cache = self._prompt_cache if use_cache else None
+        query_emb = None
+        if cache is not None:
+            try:
+                with span("prompt_cache"):
+                    query_emb = cache.embed(req.user_prompt)
+                    cached = cache.lookup(req.user_prompt, query_emb)
+                if cached is not None:
+                    return cached
+            except Exception as e:
+                logger.warning(f"[PromptCache] 조회 실패, LLM 호출로 진행합니다: {e}")
+                cache = None
+
         for attempt in range(1, self.MAX_RETRIES + 1):
+            if attempt > 1:
+                record_llm_retry(provider)
             try:
+                client = self._get_llm_client(provider)
                 start_time = time.time()
-                if provider == "gemini":
-                    response_text = self._gemini.chat_completion(self.SYSTEM_PROMPT, req.user_prompt)
-                elif provider == "ollama":
-                    response_text = self._ollama.chat_completion(self.SYSTEM_PROMPT, req.user_prompt)
-                else:
-                    raise RuntimeError(f"Unsupported provider: {provider}")
+                try:
+                    with span("llm"):
+                        response_text = client.chat_completion(self.SYSTEM_PROMPT, req.user_prompt)
+                except Exception:
+                    record_llm_call(provider, "error")
+                    raise
 
                 elapsed = (time.time() - start_time) * 1000
                 logger.info(f"[LLM {provider}] time={elapsed:.2f}ms")
 
-                logger.info(f"[LLM {provider}] attempt={attempt}, response={response_text}")
+                log_payload(logger, f"[LLM {provider}] attempt={attempt}, response=", response_text)
 
                 parsed = self._extract_json_from_response(response_text or "")
+                record_llm_call(provider, "ok" if parsed else "parse_error")
                 if parsed:
-                    return AdElementDTOV2.AdElementResponse(
+                    resp = AdElementDTOV2.AdElementResponse(
                         desc=parsed.get("desc", ""),
                         what=parsed.get("what", ""),
                         how=parsed.get("how", ""),
                         style=parsed.get("style", "")
                     )
+                    if cache is not None:
+                        cache.put(req.user_prompt, resp, query_emb)
+                    return resp
 
                 raise ValueError("LLM 응답 파싱 실패: JSON 객체를 추출하지 못했습니다.")
 
@@ -82,6 +122,28 @@ class AdElementExtractorServiceV2:
                     return AdElementDTOV2.AdElementResponse(desc="", what="", how="", style="")
 
 
+    def _get_llm_client(self, provider: str):
+        """
+        provider 에 해당하는 LLM 클라이언트 반환 (최초 호출 시 생성)
+        """
+        with self._client_lock:
+            if provider == "gemini":
+                if self._gemini is None:
+                    from app.utils.gemini_api import GeminiClient
+                    self._gemini = GeminiClient()
+                return self._gemini
+            if provider == "ollama":
+                if self._ollama is None:
+                    from app.utils.ollama_api import OllamaClient
+                    self._ollama = OllamaClient(model=getattr(ModelConfig, "OLLAMA_MODEL", None))
+                return self._ollama
+            if provider == "stub":
+                if self._stub is None:
+                    from app.utils.stub_llm import StubLLMClient
+                    self._stub = StubLLMClient()
+                return self._stub
+        raise RuntimeError(f"Unsupported provider: {provider}")
+
     @staticmethod
     def _get_provider_and_model() -> Tuple[str, Optional[str]]:
         provider = (getattr(ModelConfig, "LLM_PROVIDER", "") or "").lower()
@@ -89,6 +151,8 @@ class AdElementExtractorServiceV2:
             return "ollama", getattr(ModelConfig, "OLLAMA_MODEL", None)
         if provider == "gemini":
             return "gemini", getattr(ModelConfig, "GEMINI_MODEL", None)
+        if provider == "stub":
+            return "stub", None
         logger.warning(f"Unknown LLM_PROVIDER='{provider}', fallback to 'gemini'")
         return "gemini", getattr(ModelConfig, "GEMINI_MODEL", None)
 
@@ -110,5 +174,9 @@ class AdElementExtractorServiceV2:
             return None
 
 
-# 싱글톤
-ad_element_extractor_service_single_ton = AdElementExtractorServiceV2()
\ No newline at end of file
+# 싱글톤 (첫 사용 시 생성)
+_ad_element_extractor_service = LazySingleton(AdElementExtractorServiceV2)
+
+
+def get_ad_element_extractor_service() -> AdElementExtractorServiceV2:
+    return _ad_element_extractor_service.get()
@@ -1,25 +1,26 @@
 # SPDX-License-Identifier: Apache-2.0
+from typing import Dict, Iterator, List
 
 from sqlalchemy.orm import Session
 
 from app.models.ptfo_tag_merged import PtfoTagMerged
+from app.utils.portfolio_loader import DEFAULT_PAGE_SIZE, count_portfolios, iter_grouped_portfolios
 
 
 class PortFolioServiceV2:
+    COLUMNS = ["PTFO_SEQNO", "PTFO_NM", "PTFO_DESC"]
+
     @staticmethod
-    def load_portfolio_data(db: Session):
-        rows = db.query(PtfoTagMerged).all()
-        grouped_data = {}
+    def iter_portfolio_data(db: Session, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict]:
+        """
+        tb_ptfo_tag_merged 를 PTFO_SEQNO 순으로 스트리밍하며 포트폴리오별 dict(tags 포함)를 yield
+        """
+        return iter_grouped_portfolios(db, PtfoTagMerged, PortFolioServiceV2.COLUMNS, page_size=page_size)
 
-        for row in rows:
-            ptfo_seqno = row.PTFO_SEQNO
-            if ptfo_seqno not in grouped_data:
-                grouped_data[ptfo_seqno] = {
-                    "PTFO_SEQNO": row.PTFO_SEQNO,
-                    "PTFO_NM": row.PTFO_NM,
-                    "PTFO_DESC": row.PTFO_DESC,
-                    "tags": []
-                }
-            grouped_data[ptfo_seqno]["tags"].append(row.TAG_NM)
+    @staticmethod
+    def count_portfolio_data(db: Session) -> int:
+        return count_portfolios(db, PtfoTagMerged)
 
-        return list(grouped_data.values())
\ No newline at end of file
+    @staticmethod
+    def load_portfolio_data(db: Session) -> List[Dict]:
+        return list(PortFolioServiceV2.iter_portfolio_data(db))
@@ -3,9 +3,10 @@ from app.preprocess.text_cleaner import TextCleaner
 from app.schemas.v2.ad_element_extractor_dto import AdElementDTOV2
 from app.schemas.v2.rank_dto import RankDTOV2
 from app.schemas.v2.search_dto import SearchDTOV2
-from app.services.v2.ad_element_extractor_service import ad_element_extractor_service_single_ton
-from app.services.v2.search_service import SearchServiceV2
+from app.services.v2.ad_element_extractor_service import get_ad_element_extractor_service
+from app.services.v2.search_service import get_search_service_v2
 from app.utils.log_utils import get_logger
+from app.utils.metrics import span
 
 logger = get_logger("RankServiceV2")
 
@@ -23,7 +24,7 @@ class RankServiceV2:
 
 
     def __init__(self):
-        self.search_service = SearchServiceV2()
+        self.search_service = get_search_service_v2()
         self.cleaner = TextCleaner()
 
     def get_ranked_portfolios(self, req: RankDTOV2.GetRankPtfoRequest) -> RankDTOV2.GetRankPtfoResponse:
@@ -37,7 +38,7 @@ class RankServiceV2:
             RankDTOV2.GetRankPtfoResponse: factor (desc, what, how, style) 및 랭킹 결과
         """
         ad_element_req = req.to_ad_element_req_dto()
-        ad_element_resp = ad_element_extractor_service_single_ton.extract_elements(ad_element_req)
+        ad_element_resp = get_ad_element_extractor_service().extract_elements(ad_element_req)
 
         limit = self._validate_limit(req.limit)
         return self._rank_with_ad_elements(ad_element_resp, limit, req.diversity)
@@ -87,7 +88,8 @@ class RankServiceV2:
             RankDTOV2.GetRankPtfoResponse: 광고 요소와 해당 요소 기반의 포트폴리오 랭킹 결과
         """
         full_text = self._build_full_text(ad_element_resp)
-        clean_full_text = self.cleaner.clean(full_text)
+        with span("clean"):
+            clean_full_text = self.cleaner.clean(full_text)
 
         search_req = SearchDTOV2.SearchRequest(
             full=clean_full_text,
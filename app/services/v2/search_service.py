@@ -1,18 +1,19 @@
 # SPDX-License-Identifier: Apache-2.0
 from typing import List, Dict, Tuple
 import os
-import pickle
 import numpy as np
 import faiss
 
-from sentence_transformers import SentenceTransformer
-import fasttext
 
 from app.core.config import SearchConfig, ModelConfig
 from app.schemas.v2.search_dto import SearchDTOV2
+from app.utils.fasttext_table import load_word_embedding_model
+from app.utils.lazy_singleton import LazySingleton
+from app.utils.metrics import span
 from app.utils.mmr_reranker import mmr_rerank
-from app.core.database import get_db
-from app.models.ptfo_tag_merged import PtfoTagMerged
+from app.utils.record_store import load_factor_bundle
+from app.utils.sbert_encoder import get_sentence_encoder
+from app.utils.tag_mapping import load_tag_mapping
 
 
 class SearchServiceV2:
@@ -29,9 +30,9 @@ class SearchServiceV2:
     MIN_CANDIDATES = 50        # 후보 최소 개수
 
     def __init__(self):
-        self.embedding_model = SentenceTransformer(ModelConfig.EMBEDDING_MODEL)
-        self.fasttext_model = fasttext.load_model(ModelConfig.WORD_EMBEDDING_MODEL_PATH)
-        self.artifacts_dir = f"./artifacts/v2/{ModelConfig.EMBEDDING_MODEL}"
+        self.embedding_model = get_sentence_encoder()
+        self.fasttext_model = load_word_embedding_model()
+        self.artifacts_dir = f"{ModelConfig.ARTIFACTS_ROOT}/v2/{ModelConfig.EMBEDDING_MODEL}"
 
         self.factor_names = ["full", "desc", "what", "how", "style"]
         self.factor_weights = (
@@ -43,30 +44,13 @@ class SearchServiceV2:
         )
 
         self.indices: Dict[str, faiss.Index] = {}
-        self.embeddings: Dict[str, np.ndarray] = {}
-        self.records = None
-
         for f in self.factor_names:
             self.indices[f] = faiss.read_index(os.path.join(self.artifacts_dir, f"{f}_index.faiss"))
-            with open(os.path.join(self.artifacts_dir, f"{f}_embeddings.pkl"), "rb") as fp:
-                meta = pickle.load(fp)
-            self.embeddings[f] = meta["embeddings"]  # shape: (N, d_f)
-            if self.records is None:
-                self.records = meta["data"]
-
-        self.portfolio_tag_mapping = self._load_portfolio_tag_mapping()
+        # factor별 임베딩 shape: (N, d_f), 메타 레코드는 컬럼형 RecordStore
+        self.embeddings, self.records = load_factor_bundle(self.artifacts_dir, self.factor_names)
 
-    @staticmethod
-    def _load_portfolio_tag_mapping() -> dict:
-        """
-        DB에서 PTFO_SEQNO별 태그 목록을 불러옴
-        """
-        db = next(get_db())
-        rows = db.query(PtfoTagMerged).all()
-        tag_mapping = {}
-        for row in rows:
-            tag_mapping.setdefault(row.PTFO_SEQNO, []).append(row.TAG_NM)
-        return tag_mapping
+        # PTFO_SEQNO별 태그 목록 (artifacts 의 tag_mapping.json, DB 조회 없음)
+        self.portfolio_tag_mapping = load_tag_mapping(self.artifacts_dir, self.records)
 
     # ---------- 쿼리 임베딩 ----------
 
@@ -105,13 +89,11 @@ class SearchServiceV2:
             M = N
 
         # 1) factor별 쿼리 임베딩
-        q = {
-            "full":  self._embed_query_sbert(request.full),
-            "desc":  self._embed_query_sbert(request.desc),
-            "what":  self._embed_query_fasttext(request.what),
-            "how":   self._embed_query_sbert(request.how),
-            "style": self._embed_query_sbert(request.style),
-        }
+        q = {}
+        for f in self.factor_names:
+            with span(f"embed_{f}"):
+                text = getattr(request, f)
+                q[f] = self._embed_query_fasttext(text) if f == "what" else self._embed_query_sbert(text)
 
         # 2) factor별 top-M 검색 (IndexFlatIP, 벡터 L2정규화 가정 → 내적 == cos)
         factor_scores: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}  # f -> (D0, I0)
@@ -123,7 +105,8 @@ class SearchServiceV2:
                 continue
 
             kf = min(M, Nf)
-            D, I = idx.search(q[f], kf)  # (1, kf)
+            with span("faiss_search"):
+                D, I = idx.search(q[f], kf)  # (1, kf)
 
             I0 = I[0].astype(int)
             D0 = D[0].astype(np.float32)
@@ -142,73 +125,76 @@ class SearchServiceV2:
             return []
 
         # 3) 가중합 점수 계산
-        weights = dict(zip(self.factor_names, self.factor_weights))
-        final_scores = np.zeros(len(cand_ids), dtype=np.float32)
-        comp_scores = {f: np.zeros(len(cand_ids), dtype=np.float32) for f in self.factor_names}
-
-        # 빠른 위치 맵
-        pos_maps: Dict[str, Dict[int, int]] = {}
-        for f, (Df, If) in factor_scores.items():
-            pos_maps[f] = {int(gid): i for i, gid in enumerate(If.tolist())}
-
-        for j, gid in enumerate(cand_ids):
-            score_sum = 0.0
-            for f in self.factor_names:
-                pos = pos_maps.get(f, {}).get(int(gid))
-                s = float(factor_scores[f][0][pos]) if pos is not None else 0.0
-                if not np.isfinite(s):
-                    s = 0.0
-                comp_scores[f][j] = s
-                score_sum += weights.get(f, 0.0) * s
-            if not np.isfinite(score_sum):
+        with span("rescore"):
+            weights = dict(zip(self.factor_names, self.factor_weights))
+            final_scores = np.zeros(len(cand_ids), dtype=np.float32)
+            comp_scores = {f: np.zeros(len(cand_ids), dtype=np.float32) for f in self.factor_names}
+
+            # 빠른 위치 맵
+            pos_maps: Dict[str, Dict[int, int]] = {}
+            for f, (Df, If) in factor_scores.items():
+                pos_maps[f] = {int(gid): i for i, gid in enumerate(If.tolist())}
+
+            for j, gid in enumerate(cand_ids):
                 score_sum = 0.0
-            final_scores[j] = np.float32(score_sum)
+                for f in self.factor_names:
+                    pos = pos_maps.get(f, {}).get(int(gid))
+                    s = float(factor_scores[f][0][pos]) if pos is not None else 0.0
+                    if not np.isfinite(s):
+                        s = 0.0
+                    comp_scores[f][j] = s
+                    score_sum += weights.get(f, 0.0) * s
+                if not np.isfinite(score_sum):
+                    score_sum = 0.0
+                final_scores[j] = np.float32(score_sum)
+
+            fs = np.where(np.isfinite(final_scores), final_scores, 0.0).astype(np.float32)
 
         # 4) 정렬/다양성(MMR)
-        fs = np.where(np.isfinite(final_scores), final_scores, 0.0).astype(np.float32)
-
-        if request.diversity:
-            # 후보에 대해서만 평균 SBERT 임베딩 사용
-            mmr_emb = self._get_avg_sbert_embeddings_subset(cand_ids)
-            selected_indices = mmr_rerank(
-                embeddings=mmr_emb,
-                scores=fs,
-                k=k,
-                lambda_param=0.7,
-            )
-            ordered_ids = [cand_ids[i] for i in selected_indices]
-        else:
-            order = np.argsort(-fs)
-            ordered_ids = [cand_ids[i] for i in order[:k]]
+        with span("mmr" if request.diversity else "topk"):
+            if request.diversity:
+                # 후보에 대해서만 평균 SBERT 임베딩 사용
+                mmr_emb = self._get_avg_sbert_embeddings_subset(cand_ids)
+                selected_indices = mmr_rerank(
+                    embeddings=mmr_emb,
+                    scores=fs,
+                    k=k,
+                    lambda_param=0.7,
+                )
+                ordered_ids = [cand_ids[i] for i in selected_indices]
+            else:
+                order = np.argsort(-fs)
+                ordered_ids = [cand_ids[i] for i in order[:k]]
 
         # 5) DTO 변환
-        idx_map = {gid: i for i, gid in enumerate(cand_ids)}
-        results: List[SearchDTOV2.SearchResponse] = []
-
-        for gid in ordered_ids:
-            j = idx_map[gid]
-            rec = self.records[gid]
-            ptfo_seqno = rec["PTFO_SEQNO"]
-            tags = self.portfolio_tag_mapping.get(ptfo_seqno, [])
-
-            results.append(
-                SearchDTOV2.SearchResponse(
-                    final_score=float(fs[j]),
-                    full_score=float(comp_scores["full"][j]),
-                    desc_score=float(comp_scores["desc"][j]),
-                    what_score=float(comp_scores["what"][j]),
-                    how_score=float(comp_scores["how"][j]),
-                    style_score=float(comp_scores["style"][j]),
-                    desc=rec["desc"],
-                    what=rec["what"],
-                    how=rec["how"],
-                    style=rec["style"],
-                    ptfo_seqno=ptfo_seqno,
-                    ptfo_nm=rec["PTFO_NM"],
-                    ptfo_desc=rec["PTFO_DESC"],
-                    tags=tags,
+        with span("dto"):
+            idx_map = {gid: i for i, gid in enumerate(cand_ids)}
+            results: List[SearchDTOV2.SearchResponse] = []
+
+            for gid in ordered_ids:
+                j = idx_map[gid]
+                rec = self.records[gid]
+                ptfo_seqno = rec["PTFO_SEQNO"]
+                tags = self.portfolio_tag_mapping.get(ptfo_seqno, [])
+
+                results.append(
+                    SearchDTOV2.SearchResponse(
+                        final_score=float(fs[j]),
+                        full_score=float(comp_scores["full"][j]),
+                        desc_score=float(comp_scores["desc"][j]),
+                        what_score=float(comp_scores["what"][j]),
+                        how_score=float(comp_scores["how"][j]),
+                        style_score=float(comp_scores["style"][j]),
+                        desc=rec["desc"],
+                        what=rec["what"],
+                        how=rec["how"],
+                        style=rec["style"],
+                        ptfo_seqno=ptfo_seqno,
+                        ptfo_nm=rec["PTFO_NM"],
+                        ptfo_desc=rec["PTFO_DESC"],
+                        tags=tags,
+                    )
                 )
-            )
 
         return results
 
@@ -224,3 +210,11 @@ class SearchServiceV2:
         avg = np.mean(mats, axis=0)
         avg /= (np.linalg.norm(avg, axis=1, keepdims=True) + 1e-8)
         return avg
+
+
+# 싱글톤 (모델/인덱스를 요청마다 다시 로드하지 않도록 첫 사용 시 1회 생성)
+_search_service_v2 = LazySingleton(SearchServiceV2)
+
+
+def get_search_service_v2() -> SearchServiceV2:
+    return _search_service_v2.get()
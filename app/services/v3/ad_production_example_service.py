@@ -3,12 +3,16 @@
 import json
 import logging
 import time
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+from app.core.config import ModelConfig
 from app.schemas.v3.production_example_dto import ProductionExampleDTOV3 as DTO
-from app.utils.gemini_api import GeminiClient
+from app.utils.lazy_singleton import LazySingleton
 from app.utils.log_utils import get_logger
 
+if TYPE_CHECKING:
+    from app.utils.gemini_api import GeminiClient
+
 logger = get_logger("AdProductionExampleServiceV3")
 
 
@@ -20,8 +24,16 @@ class AdProductionExampleServiceV3:
     """
     MAX_RETRIES = 3
 
-    def __init__(self, gemini: Optional[GeminiClient] = None):
-        self.gemini = gemini or GeminiClient()
+    def __init__(self, gemini: Optional["GeminiClient"] = None):
+        if gemini is None:
+            if (ModelConfig.LLM_PROVIDER or "").lower() == "stub":
+                # 부하 테스트용 로컬 대역 (같은 chat_completion 인터페이스)
+                from app.utils.stub_llm import StubLLMClient
+                gemini = StubLLMClient()
+            else:
+                from app.utils.gemini_api import GeminiClient
+                gemini = GeminiClient()
+        self.gemini = gemini
 
     def generate(self, req: DTO.ProductionExampleRequest) -> DTO.ProductionExampleResponse:
         system_prompt, user_prompt = self._build_prompt(req)
@@ -115,4 +127,12 @@ class AdProductionExampleServiceV3:
             ],
         }
         user_prompt = json.dumps(compact, ensure_ascii=False, indent=2)
-        return system_prompt, user_prompt
\ No newline at end of file
+        return system_prompt, user_prompt
+
+
+# 싱글톤 (첫 요청 시 GeminiClient 생성)
+_production_example_service = LazySingleton(AdProductionExampleServiceV3)
+
+
+def get_production_example_service() -> AdProductionExampleServiceV3:
+    return _production_example_service.get()
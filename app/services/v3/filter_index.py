@@ -0,0 +1,180 @@
+# SPDX-License-Identifier: Apache-2.0
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import faiss
+
+from app.schemas.v3.search_dto import SearchDTOV3
+from app.utils.prdn_parser import parse_prdn_cost, parse_prdn_perd
+
+FILTER_COLUMNS_FILE = "filter_columns.npz"
+
+
+class FilterIndex:
+    """
+    검색 필터용 컬럼(인덱스 생성 시 1회 계산, records 순서와 동일).
+    - 제작비/제작기간: 문자열을 파싱한 (최소, 최대) 숫자 컬럼 (해석 불가 → NaN)
+    - 스튜디오: 이름 오름차순으로 부여한 정수 id 컬럼 (없음 → -1)
+    - 태그: 태그별 포트폴리오 행 목록 (CSR: tag_indptr / tag_rows)
+
+    mask() 로 만든 bool 마스크를 faiss IDSelectorBitmap 으로 넘기면
+    인덱스 안에서 필터를 만족하는 항목만 top-M 으로 검색된다 (후처리 필터링/과다 검색 없음).
+    """
+
+    def __init__(
+        self,
+        cost_min: np.ndarray,
+        cost_max: np.ndarray,
+        perd_min: np.ndarray,
+        perd_max: np.ndarray,
+        studio_ids: np.ndarray,
+        studio_names: List[str],
+        tag_indptr: np.ndarray,
+        tag_rows: np.ndarray,
+        tag_names: List[str],
+    ):
+        self.cost_min = cost_min
+        self.cost_max = cost_max
+        self.perd_min = perd_min
+        self.perd_max = perd_max
+        self.studio_ids = studio_ids
+        self.studio_names = list(studio_names)
+        self.tag_indptr = tag_indptr
+        self.tag_rows = tag_rows
+        self.tag_names = list(tag_names)
+        self._studio_to_id = {n: i for i, n in enumerate(self.studio_names)}
+        self._tag_to_id = {t: i for i, t in enumerate(self.tag_names)}
+
+    def __len__(self) -> int:
+        return int(self.studio_ids.shape[0])
+
+    # ---------- 생성/저장 ----------
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "FilterIndex":
+        n = len(records)
+        cost = np.full((n, 2), np.nan, dtype=np.float64)
+        perd = np.full((n, 2), np.nan, dtype=np.float64)
+        for i, rec in enumerate(records):
+            lo, hi = parse_prdn_cost(rec.get("PRDN_COST"))
+            if lo is not None:
+                cost[i] = (lo, hi)
+            lo, hi = parse_prdn_perd(rec.get("PRDN_PERD"))
+            if lo is not None:
+                perd[i] = (lo, hi)
+
+        studios = [(rec.get("PRDN_STDO_NM") or "").strip() for rec in records]
+        studio_names = sorted({s for s in studios if s})
+        studio_to_id = {name: i for i, name in enumerate(studio_names)}
+        studio_ids = np.array([studio_to_id.get(s, -1) for s in studios], dtype=np.int32)
+
+        postings: Dict[str, List[int]] = {}
+        for i, rec in enumerate(records):
+            for tag in set(rec.get("tags") or []):
+                postings.setdefault(tag, []).append(i)
+        tag_names = sorted(postings)
+        lengths = [len(postings[t]) for t in tag_names]
+        tag_indptr = np.zeros(len(tag_names) + 1, dtype=np.int64)
+        tag_indptr[1:] = np.cumsum(lengths)
+        tag_rows = np.array([r for t in tag_names for r in postings[t]], dtype=np.int64)
+
+        return cls(cost[:, 0], cost[:, 1], perd[:, 0], perd[:, 1], studio_ids, studio_names,
+                   tag_indptr, tag_rows, tag_names)
+
+    def save(self, directory: str) -> None:
+        np.savez(
+            os.path.join(directory, FILTER_COLUMNS_FILE),
+            cost_min=self.cost_min, cost_max=self.cost_max,
+            perd_min=self.perd_min, perd_max=self.perd_max,
+            studio_ids=self.studio_ids, studio_names=np.array(self.studio_names, dtype=str),
+            tag_indptr=self.tag_indptr, tag_rows=self.tag_rows, tag_names=np.array(self.tag_names, dtype=str),
+        )
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["FilterIndex"]:
+        path = os.path.join(directory, FILTER_COLUMNS_FILE)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as z:
+            return cls(
+                z["cost_min"], z["cost_max"], z["perd_min"], z["perd_max"],
+                z["studio_ids"], z["studio_names"].tolist(),
+                z["tag_indptr"], z["tag_rows"], z["tag_names"].tolist(),
+            )
+
+    def take(self, rows: np.ndarray) -> "FilterIndex":
+        """
+        일부 행만 남긴 FilterIndex (샤드 분할용, 행 번호는 rows 순서로 다시 매김)
+        """
+        remap = np.full(len(self), -1, dtype=np.int64)
+        remap[rows] = np.arange(rows.size, dtype=np.int64)
+        new_rows, lengths = [], []
+        for t in range(len(self.tag_names)):
+            mapped = remap[self.tag_rows[self.tag_indptr[t]:self.tag_indptr[t + 1]]]
+            mapped = np.sort(mapped[mapped >= 0])
+            new_rows.append(mapped)
+            lengths.append(mapped.size)
+        tag_indptr = np.zeros(len(self.tag_names) + 1, dtype=np.int64)
+        tag_indptr[1:] = np.cumsum(lengths)
+        tag_rows = np.concatenate(new_rows) if new_rows else np.zeros(0, dtype=np.int64)
+        return FilterIndex(
+            self.cost_min[rows], self.cost_max[rows], self.perd_min[rows], self.perd_max[rows],
+            self.studio_ids[rows], self.studio_names, tag_indptr, tag_rows, self.tag_names,
+        )
+
+    # ---------- 필터 ----------
+    @staticmethod
+    def _range_mask(lo_col: np.ndarray, hi_col: np.ndarray, lo: Optional[float], hi: Optional[float],
+                    include_unknown: bool) -> np.ndarray:
+        """
+        [lo_col, hi_col] 구간이 요청 구간 [lo, hi] 와 겹치면 통과 (예: "300~500만원" 은 max_cost=400만 에 포함)
+        """
+        known = ~np.isnan(lo_col)
+        mask = known.copy()
+        if lo is not None:
+            mask &= hi_col >= lo
+        if hi is not None:
+            mask &= lo_col <= hi
+        if include_unknown:
+            mask |= ~known
+        return mask
+
+    def mask(self, filters: Optional[SearchDTOV3.SearchFilters]) -> Optional[np.ndarray]:
+        """
+        필터를 만족하는 행의 bool 마스크. 필터가 없으면 None (전체 검색).
+        """
+        if filters is None or filters.is_empty():
+            return None
+        n = len(self)
+        mask = np.ones(n, dtype=bool)
+
+        if filters.min_cost is not None or filters.max_cost is not None:
+            mask &= self._range_mask(self.cost_min, self.cost_max, filters.min_cost, filters.max_cost,
+                                     filters.include_unknown)
+        if filters.min_period_days is not None or filters.max_period_days is not None:
+            mask &= self._range_mask(self.perd_min, self.perd_max, filters.min_period_days,
+                                     filters.max_period_days, filters.include_unknown)
+
+        if filters.studios:
+            ids = [self._studio_to_id[s.strip()] for s in filters.studios if s.strip() in self._studio_to_id]
+            mask &= np.isin(self.studio_ids, np.array(ids, dtype=np.int32))
+
+        for tag in filters.required_tags:
+            t = self._tag_to_id.get(tag)
+            tag_mask = np.zeros(n, dtype=bool)
+            if t is not None:
+                tag_mask[self.tag_rows[self.tag_indptr[t]:self.tag_indptr[t + 1]]] = True
+            mask &= tag_mask
+
+        return mask
+
+
+def make_search_params(mask: np.ndarray) -> faiss.SearchParameters:
+    """
+    bool 마스크 → faiss 검색 파라미터 (IDSelectorBitmap). 비트맵 버퍼는 파라미터 객체에 붙여 수명 유지.
+    """
+    bitmap = np.packbits(mask, bitorder="little")
+    selector = faiss.IDSelectorBitmap(mask.size, faiss.swig_ptr(bitmap))
+    params = faiss.SearchParameters(sel=selector)
+    params._bitmap, params._selector = bitmap, selector
+    return params
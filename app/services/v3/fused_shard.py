@@ -0,0 +1,252 @@
+# SPDX-License-Identifier: Apache-2.0
+import base64
+import json
+import os
+from typing import Dict, List, Optional
+
+import numpy as np
+import faiss
+
+from app.schemas.v3.search_dto import SearchDTOV3
+from app.services.v3.filter_index import FilterIndex, make_search_params
+from app.utils.record_store import save_npy
+
+FACTOR_ORDER = ["full", "desc", "what", "how", "style"]
+MMR_FACTORS = ["full", "desc", "how", "style"]  # MMR 다양성 계산에 쓰는 SBERT factor
+
+
+class CandidateSet:
+    """
+    fused 인덱스 검색 결과 후보 집합 (샤드 1개 또는 병합된 전체).
+    - ids: 전역 포트폴리오 id (records 인덱스)
+    - fused_scores: fused 인덱스 내적 점수 (후보 정렬 기준)
+    - factor_scores: factor별 코사인 점수 {factor: (n,)}
+    - mmr_emb: MMR 용 평균 SBERT 임베딩 (n, d), 요청한 경우만
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        fused_scores: np.ndarray,
+        factor_scores: Dict[str, np.ndarray],
+        mmr_emb: Optional[np.ndarray] = None,
+    ):
+        self.ids = ids
+        self.fused_scores = fused_scores
+        self.factor_scores = factor_scores
+        self.mmr_emb = mmr_emb
+
+    def __len__(self) -> int:
+        return int(self.ids.shape[0])
+
+    @classmethod
+    def empty(cls) -> "CandidateSet":
+        return cls(
+            np.zeros(0, dtype=np.int64),
+            np.zeros(0, dtype=np.float32),
+            {f: np.zeros(0, dtype=np.float32) for f in FACTOR_ORDER},
+        )
+
+    def take(self, order: np.ndarray) -> "CandidateSet":
+        return CandidateSet(
+            self.ids[order],
+            self.fused_scores[order],
+            {f: s[order] for f, s in self.factor_scores.items()},
+            self.mmr_emb[order] if self.mmr_emb is not None else None,
+        )
+
+    @classmethod
+    def concat(cls, parts: List["CandidateSet"]) -> "CandidateSet":
+        """
+        후보 집합을 순서대로 이어 붙임 (MMR 임베딩은 모든 집합에 있을 때만 유지)
+        """
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        with_mmr = all(p.mmr_emb is not None for p in parts)
+        return cls(
+            np.concatenate([p.ids for p in parts]),
+            np.concatenate([p.fused_scores for p in parts]),
+            {f: np.concatenate([p.factor_scores[f] for p in parts]) for f in parts[0].factor_scores},
+            np.concatenate([p.mmr_emb for p in parts], axis=0) if with_mmr else None,
+        )
+
+    @classmethod
+    def merge(cls, parts: List["CandidateSet"], M: int) -> "CandidateSet":
+        """
+        샤드별 top-M 후보를 fused 점수 기준 전역 top-M 으로 병합 (동점은 전역 id 오름차순)
+        """
+        merged = cls.concat(parts)
+        if not len(merged):
+            return merged
+        order = np.lexsort((merged.ids, -merged.fused_scores))[:M]
+        return merged.take(order)
+
+    # ---------- 직렬화 (샤드 서버 ↔ API) ----------
+    def to_payload(self) -> Dict:
+        return {
+            "ids": encode_array(self.ids),
+            "fused_scores": encode_array(self.fused_scores),
+            "factor_scores": {f: encode_array(s) for f, s in self.factor_scores.items()},
+            "mmr_emb": encode_array(self.mmr_emb) if self.mmr_emb is not None else None,
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict) -> "CandidateSet":
+        return cls(
+            decode_array(payload["ids"]),
+            decode_array(payload["fused_scores"]),
+            {f: decode_array(s) for f, s in payload["factor_scores"].items()},
+            decode_array(payload["mmr_emb"]) if payload.get("mmr_emb") else None,
+        )
+
+
+def encode_array(arr: np.ndarray) -> Dict:
+    arr = np.ascontiguousarray(arr)
+    return {"dtype": arr.dtype.str, "shape": list(arr.shape), "b64": base64.b64encode(arr.tobytes()).decode("ascii")}
+
+
+def decode_array(obj: Dict) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(obj["b64"]), dtype=np.dtype(obj["dtype"])).reshape(obj["shape"])
+
+
+class FusedShard:
+    """
+    fused 인덱스 + factor 행렬 한 조각.
+    - 단일 프로세스 모드: 전체 카탈로그를 하나의 샤드로 사용 (global_ids == arange(N))
+    - 샤드 모드: 샤드 서버 프로세스가 자기 조각만 로드해 후보 검색 + factor 점수까지 계산
+    """
+
+    def __init__(
+        self,
+        fused_index: faiss.Index,
+        embeddings: Dict[str, np.ndarray],
+        global_ids: np.ndarray,
+        filter_index: Optional[FilterIndex] = None,
+    ):
+        self.fused_index = fused_index
+        self.embeddings = embeddings
+        self.global_ids = global_ids
+        self.filter_index = filter_index
+
+    @property
+    def ntotal(self) -> int:
+        return int(self.fused_index.ntotal)
+
+    @classmethod
+    def load(cls, shard_dir: str) -> "FusedShard":
+        fused_index = faiss.read_index(os.path.join(shard_dir, "fused_index.faiss"))
+        embeddings = {
+            f: np.load(os.path.join(shard_dir, f"{f}_embeddings.npy"), mmap_mode="r") for f in FACTOR_ORDER
+        }
+        global_ids = np.load(os.path.join(shard_dir, "global_ids.npy"))
+        return cls(fused_index, embeddings, global_ids, FilterIndex.load(shard_dir))
+
+    @staticmethod
+    def save(
+        shard_dir: str,
+        fused: np.ndarray,
+        embeddings: Dict[str, np.ndarray],
+        global_ids: np.ndarray,
+        filter_index: Optional[FilterIndex] = None,
+    ) -> None:
+        os.makedirs(shard_dir, exist_ok=True)
+        index = faiss.IndexFlatIP(fused.shape[1])
+        index.add(np.ascontiguousarray(fused, dtype=np.float32))
+        faiss.write_index(index, os.path.join(shard_dir, "fused_index.faiss"))
+        # 샤드 서버가 mmap 중일 수 있으므로 임시 파일 → os.replace 로 교체 (제자리 덮어쓰기 금지)
+        for f in FACTOR_ORDER:
+            save_npy(os.path.join(shard_dir, f"{f}_embeddings.npy"), np.ascontiguousarray(embeddings[f], dtype=np.float32))
+        save_npy(os.path.join(shard_dir, "global_ids.npy"), global_ids.astype(np.int64))
+        if filter_index is not None:
+            filter_index.save(shard_dir)
+
+    def search(
+        self,
+        q_fused: np.ndarray,
+        q_fac: Dict[str, np.ndarray],
+        M: int,
+        with_mmr: bool = False,
+        filters: Optional[SearchDTOV3.SearchFilters] = None,
+    ) -> CandidateSet:
+        """
+        fused 인덱스 top-M 후보 검색 후 후보에 한해 factor별 점수(내적 == 코사인) 계산.
+        filters 가 있으면 조건을 만족하는 항목만 인덱스 안에서 검색 (IDSelectorBitmap).
+        """
+        M = min(int(M), self.ntotal)
+        params = None
+        if filters is not None and self.filter_index is not None:
+            mask = self.filter_index.mask(filters)
+            if mask is not None:
+                M = min(M, int(mask.sum()))
+                params = make_search_params(mask)
+        if M <= 0:
+            return CandidateSet.empty()
+
+        D, I = self.fused_index.search(q_fused, M, params=params)
+        I0 = I[0].astype(np.int64)
+        D0 = D[0].astype(np.float32)
+        keep = (I0 != -1) & np.isfinite(D0)
+        local_ids, fused_scores = I0[keep], D0[keep]
+        if local_ids.size == 0:
+            return CandidateSet.empty()
+        return self.score(local_ids, fused_scores, q_fac, with_mmr)
+
+    def search_many(
+        self,
+        q_fused: np.ndarray,
+        q_facs: List[Dict[str, np.ndarray]],
+        Ms: List[int],
+        with_mmr: List[bool],
+        filters: List[Optional[SearchDTOV3.SearchFilters]],
+    ) -> List[CandidateSet]:
+        """
+        여러 질의(q_fused 의 행)를 한 번에 검색. 결과는 행마다 search 를 호출한 것과 같음.
+        - 필터가 없는 질의는 후보폭(M)이 같은 것끼리 fused_index.search 1회(행렬-행렬 곱)로 검색
+          (최대 M 으로 한 번에 검색 후 자르면 경계의 동점 후보가 단건 검색과 달라질 수 있어 M 별로 묶음)
+        - 필터가 있는 질의는 질의마다 허용 목록이 달라 개별 search 로 처리
+        """
+        out: List[CandidateSet] = [CandidateSet.empty()] * len(q_facs)
+        by_width: Dict[int, List[int]] = {}
+        for i, f in enumerate(filters):
+            if f is not None and self.filter_index is not None:
+                out[i] = self.search(q_fused[i:i + 1], q_facs[i], Ms[i], with_mmr=with_mmr[i], filters=f)
+            else:
+                by_width.setdefault(min(int(Ms[i]), self.ntotal), []).append(i)
+
+        for M, rows in by_width.items():
+            if M <= 0:
+                continue
+            D, I = self.fused_index.search(np.ascontiguousarray(q_fused[rows]), M)
+            for row, i in enumerate(rows):
+                I0 = I[row].astype(np.int64)
+                D0 = D[row].astype(np.float32)
+                keep = (I0 != -1) & np.isfinite(D0)
+                if keep.any():
+                    out[i] = self.score(I0[keep], D0[keep], q_facs[i], with_mmr[i])
+        return out
+
+    def score(
+        self,
+        local_ids: np.ndarray,
+        fused_scores: np.ndarray,
+        q_fac: Dict[str, np.ndarray],
+        with_mmr: bool = False,
+    ) -> CandidateSet:
+        """
+        주어진 행(local id)에 대해 factor별 점수(내적 == 코사인)와 MMR 임베딩을 계산해 후보 집합 생성.
+        (다른 후보 소스 — 예: BM25 — 에서 온 행을 dense 점수로 재채점할 때도 사용)
+        """
+        factor_scores = {
+            f: (q_fac[f] @ self.embeddings[f][local_ids].T).astype(np.float32)[0] for f in FACTOR_ORDER
+        }
+        mmr_emb = None
+        if with_mmr:
+            mmr_emb = np.mean([self.embeddings[f][local_ids] for f in MMR_FACTORS], axis=0).astype(np.float32)
+            mmr_emb /= (np.linalg.norm(mmr_emb, axis=1, keepdims=True) + 1e-8)
+        return CandidateSet(self.global_ids[local_ids], fused_scores, factor_scores, mmr_emb)
+
+
+def load_shard_manifest(shards_dir: str) -> Dict:
+    with open(os.path.join(shards_dir, "manifest.json"), "r", encoding="utf-8") as fp:
+        return json.load(fp)
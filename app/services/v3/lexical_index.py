@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: Apache-2.0
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.preprocess.text_cleaner import TextCleaner
+
+LEXICAL_INDEX_FILE = "lexical_index.npz"
+# 색인 대상 필드: 제목/설명(정제 전 원문) + 정제된 factor 텍스트 (full 은 factor 를 이어 붙인 것이라 제외)
+RAW_FIELDS = ["PTFO_NM", "PTFO_DESC"]
+FACTOR_FIELDS = ["desc", "what", "how", "style"]
+
+
+class LexicalIndex:
+    """
+    BM25 역색인 (인덱스 생성 시 1회 계산, records 순서와 동일한 행 번호).
+    - 토큰: TextCleaner 정제(소문자/특수문자 제거/불용어 제거) 후 공백 분리
+    - 용어별 posting 을 CSR (term_indptr / doc_ids / impacts) 로 저장.
+      impacts 는 BM25 용어 점수(idf · tf 포화 · 문서 길이 정규화)를 미리 계산한 값이라
+      질의 점수 = 질의 용어 posting 의 impacts 합 (posting 몇 개를 모으는 것뿐 → 마이크로초 단위)
+    """
+
+    def __init__(
+        self,
+        terms: List[str],
+        term_indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        impacts: np.ndarray,
+        n_docs: int,
+    ):
+        self.terms = list(terms)
+        self.term_indptr = term_indptr
+        self.doc_ids = doc_ids
+        self.impacts = impacts
+        self.n_docs = int(n_docs)
+        self._term_to_id: Dict[str, int] = {t: i for i, t in enumerate(self.terms)}
+        self.cleaner = TextCleaner()
+
+    def __len__(self) -> int:
+        return self.n_docs
+
+    # ---------- 생성/저장 ----------
+    @classmethod
+    def from_records(cls, records: Iterable[Dict], k1: float = 1.2, b: float = 0.75) -> "LexicalIndex":
+        cleaner = TextCleaner()
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        doc_lens: List[int] = []
+        for i, rec in enumerate(records):
+            tokens = []
+            for field in RAW_FIELDS:
+                tokens.extend(cleaner.clean(rec.get(field) or "").split())
+            for field in FACTOR_FIELDS:
+                tokens.extend((rec.get(field) or "").split())
+            doc_lens.append(len(tokens))
+            counts: Dict[str, int] = {}
+            for t in tokens:
+                counts[t] = counts.get(t, 0) + 1
+            for t, tf in counts.items():
+                postings.setdefault(t, []).append((i, tf))
+
+        n = len(doc_lens)
+        lens = np.asarray(doc_lens, dtype=np.float32)
+        avgdl = float(lens.mean()) if n and lens.mean() > 0 else 1.0
+        terms = sorted(postings)
+        term_indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        term_indptr[1:] = np.cumsum([len(postings[t]) for t in terms])
+        doc_ids = np.empty(int(term_indptr[-1]), dtype=np.int32)
+        impacts = np.empty(int(term_indptr[-1]), dtype=np.float32)
+        for t_id, t in enumerate(terms):
+            lo, hi = term_indptr[t_id], term_indptr[t_id + 1]
+            docs = np.fromiter((d for d, _ in postings[t]), dtype=np.int32, count=hi - lo)
+            tf = np.fromiter((c for _, c in postings[t]), dtype=np.float32, count=hi - lo)
+            df = hi - lo
+            idf = np.log(1.0 + (n - df + 0.5) / (df + 0.5))
+            doc_ids[lo:hi] = docs
+            impacts[lo:hi] = idf * tf * (k1 + 1.0) / (tf + k1 * (1.0 - b + b * lens[docs] / avgdl))
+        return cls(terms, term_indptr, doc_ids, impacts, n)
+
+    def save(self, directory: str) -> None:
+        np.savez(
+            os.path.join(directory, LEXICAL_INDEX_FILE),
+            terms=np.array(self.terms, dtype=str), term_indptr=self.term_indptr,
+            doc_ids=self.doc_ids, impacts=self.impacts, n_docs=np.int64(self.n_docs),
+        )
+
+    @classmethod
+    def load(cls, directory: str) -> Optional["LexicalIndex"]:
+        path = os.path.join(directory, LEXICAL_INDEX_FILE)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as z:
+            return cls(z["terms"].tolist(), z["term_indptr"], z["doc_ids"], z["impacts"], int(z["n_docs"]))
+
+    # ---------- 검색 ----------
+    def tokenize(self, text: str) -> List[str]:
+        return self.cleaner.clean(text or "").split()
+
+    def search(self, text: str, M: int, mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        질의 텍스트의 BM25 상위 M 문서 (ids, scores). 점수 내림차순, 동점은 id 오름차순.
+        mask(bool, 길이 n_docs)가 있으면 True 인 문서만 반환. 일치하는 용어가 없으면 빈 배열.
+        """
+        term_ids = [self._term_to_id[t] for t in self.tokenize(text) if t in self._term_to_id]
+        if not term_ids or M <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        docs = np.concatenate([self.doc_ids[self.term_indptr[t]:self.term_indptr[t + 1]] for t in term_ids])
+        weights = np.concatenate([self.impacts[self.term_indptr[t]:self.term_indptr[t + 1]] for t in term_ids])
+        if mask is not None:
+            keep = mask[docs]
+            docs, weights = docs[keep], weights[keep]
+            if docs.size == 0:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        # 질의 용어가 반복되면 그 용어 점수도 반복해 더함 (BM25 질의 tf)
+        ids, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse.reshape(-1), weights=weights).astype(np.float32)
+        if ids.size > M:
+            # M 번째 점수 이상(동점 포함)만 남긴 뒤 정렬
+            kth = np.partition(scores, ids.size - M)[ids.size - M]
+            sel = np.flatnonzero(scores >= kth)
+            ids, scores = ids[sel], scores[sel]
+        top = np.lexsort((ids, -scores))[:M]
+        return ids[top].astype(np.int64), scores[top]
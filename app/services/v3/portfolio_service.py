@@ -1,37 +1,32 @@
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import List, Dict
+from typing import Dict, Iterator, List
 from sqlalchemy.orm import Session
 
 from app.models.ptfo_tag_merged_mv import PtfoTagMergedMV
+from app.utils.portfolio_loader import DEFAULT_PAGE_SIZE, count_portfolios, iter_grouped_portfolios
+
 
 class PortFolioServiceV3:
+    COLUMNS = ["PTFO_SEQNO", "PTFO_NM", "PTFO_DESC", "VIEW_LNK_URL", "PRDN_STDO_NM", "PRDN_COST", "PRDN_PERD"]
+
     @staticmethod
-    def load_portfolio_data(db: Session) -> List[Dict]:
+    def iter_portfolio_data(db: Session, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict]:
         """
-        tb_ptfo_tag_merged_mv 로드
+        tb_ptfo_tag_merged_mv 를 PTFO_SEQNO 순으로 스트리밍하며 포트폴리오별 dict 를 yield
+        (필요 컬럼만 조회, 태그는 중복 제거 + 정렬)
         """
-        rows = db.query(PtfoTagMergedMV).all()
-        grouped: Dict[int, Dict] = {}
+        return iter_grouped_portfolios(
+            db, PtfoTagMergedMV, PortFolioServiceV3.COLUMNS, sort_tags=True, page_size=page_size
+        )
 
-        for row in rows:
-            pid = row.PTFO_SEQNO
-            if pid not in grouped:
-                grouped[pid] = {
-                    "PTFO_SEQNO":   row.PTFO_SEQNO,
-                    "PTFO_NM":      row.PTFO_NM,
-                    "PTFO_DESC":    row.PTFO_DESC,
-                    "VIEW_LNK_URL": row.VIEW_LNK_URL,
-                    "PRDN_STDO_NM": row.PRDN_STDO_NM,
-                    "PRDN_COST":    row.PRDN_COST,
-                    "PRDN_PERD":    row.PRDN_PERD,
-                    "tags": []
-                }
-            if row.TAG_NM:
-                grouped[pid]["tags"].append(row.TAG_NM)
-
-        # 태그 중복 제거 및 정렬
-        for data in grouped.values():
-            data["tags"] = sorted(set(data["tags"]))
+    @staticmethod
+    def count_portfolio_data(db: Session) -> int:
+        return count_portfolios(db, PtfoTagMergedMV)
 
-        return list(grouped.values())
\ No newline at end of file
+    @staticmethod
+    def load_portfolio_data(db: Session) -> List[Dict]:
+        """
+        tb_ptfo_tag_merged_mv 로드 (전체 리스트가 필요한 경우용)
+        """
+        return list(PortFolioServiceV3.iter_portfolio_data(db))
@@ -1,15 +1,36 @@
 # SPDX-License-Identifier: Apache-2.0
-from app.core.config import RankConfig
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+from app.core.config import RankConfig, CacheConfig
 from app.preprocess.text_cleaner import TextCleaner
 from app.schemas.v2.ad_element_extractor_dto import AdElementDTOV2
 from app.schemas.v3.rank_dto import RankDTOV3
 from app.schemas.v3.search_dto import SearchDTOV3
-from app.services.v2.ad_element_extractor_service import ad_element_extractor_service_single_ton
-from app.services.v3.search_service import search_service_singleton
+from app.schemas.v3.studio_stat import StudioStat
+from app.services.v2.ad_element_extractor_service import get_ad_element_extractor_service
+from app.services.v3.result_cursor import CursorStore
+from app.services.v3.search_service import get_search_service
 from app.utils.log_utils import get_logger
+from app.utils.metrics import span
+from app.utils.response_cache import SingleFlightCache
 
 logger = get_logger("RankServiceV3")
 
+# 랭킹 응답 캐시 (RankServiceV3 는 요청마다 생성되므로 모듈 단위로 공유)
+rank_response_cache = SingleFlightCache(
+    max_size=CacheConfig.RANK_CACHE_MAX_SIZE,
+    ttl_sec=CacheConfig.RANK_CACHE_TTL_SEC,
+)
+# 다음 페이지용 후보 풀 (next_cursor → ResultCursor), prefork 서버는 fork 전에 공유 디렉터리를 지정
+rank_cursor_store = CursorStore(
+    max_size=CacheConfig.CURSOR_CACHE_MAX_SIZE,
+    ttl_sec=CacheConfig.CURSOR_TTL_SEC,
+    shared_dir=CacheConfig.CURSOR_SHARED_DIR,
+)
+
 
 class RankServiceV3:
     """
@@ -21,7 +42,7 @@ class RankServiceV3:
     MAX_LIMIT = 50
 
     def __init__(self):
-        self.search_service = search_service_singleton
+        self.search_service = get_search_service()
         self.cleaner = TextCleaner()
 
     def get_ranked_portfolios(self, req: RankDTOV3.GetRankPtfoRequest) -> RankDTOV3.GetRankPtfoResponse:
@@ -29,7 +50,7 @@ class RankServiceV3:
         사용자 프롬프트로 요소 추출 → 랭킹 + 스튜디오 TOP 반환
         """
         ad_element_req = req.to_ad_element_req_dto()
-        ad_element_resp = ad_element_extractor_service_single_ton.extract_elements(ad_element_req)
+        ad_element_resp = get_ad_element_extractor_service().extract_elements(ad_element_req)
 
         limit = self._validate_limit(getattr(req, "limit", None))
         min_cands = RankConfig.MIN_CANDIDATE_TOP_STDO_K
@@ -41,6 +62,8 @@ class RankServiceV3:
             diversity=getattr(req, "diversity", False),
             min_candidates=min_cands,
             top_studio_k=top_studio_k,
+            filters=req.filters,
+            paginate=req.paginate,
         )
 
     def get_ranked_portfolios_by_ad_elements(
@@ -60,8 +83,137 @@ class RankServiceV3:
             diversity=req.diversity,
             min_candidates=min_cands,
             top_studio_k=top_studio_k,
+            filters=req.filters,
+            paginate=req.paginate,
+        )
+
+    def get_next_page(self, req: RankDTOV3.GetRankPtfoNextPageRequest) -> RankDTOV3.GetRankPtfoResponse:
+        """
+        next_cursor 로 이어지는 다음 페이지 (요소 추출/임베딩/검색 없이 캐시된 후보 풀에서 잘라서 반환)
+        - 커서가 만료되었거나 artifacts 가 다시 로드되었으면 CursorExpiredError
+        """
+        cursor_id, offset = CursorStore.parse_token(req.cursor)
+        cursor = rank_cursor_store.get(cursor_id)
+        limit = self._validate_limit(req.limit)
+
+        results = self.search_service.page(cursor, offset, limit)
+        end = offset + len(results)
+        return RankDTOV3.GetRankPtfoResponse.model_construct(
+            **cursor.context,
+            search_results=results,
+            next_cursor=CursorStore.make_token(cursor_id, end) if end < len(cursor) else None,
         )
 
+    def get_ranked_portfolios_batch(
+        self, req: RankDTOV3.GetRankPtfoBatchRequest
+    ) -> Iterator[RankDTOV3.GetRankPtfoBatchLine]:
+        """
+        여러 브리프(요소 또는 user_prompt)를 한 번에 랭킹하고, 완료된 항목부터 한 줄씩 생성.
+        - 항목 수 검증은 호출 즉시 수행 (ValueError), 실제 처리는 반복하면서 진행
+        - 항목별 실패는 해당 항목의 error 줄로 전달 (나머지 항목은 계속 처리)
+        """
+        if not req.items:
+            raise ValueError("items 가 비어 있습니다")
+        if len(req.items) > RankConfig.RANK_BATCH_MAX_ITEMS:
+            raise ValueError(f"items 는 최대 {RankConfig.RANK_BATCH_MAX_ITEMS}개까지 가능합니다 (요청: {len(req.items)}개)")
+        return self._iter_batch(req.items)
+
+    def _iter_batch(self, items: List[RankDTOV3.RankBatchItem]) -> Iterator[RankDTOV3.GetRankPtfoBatchLine]:
+        prompt_idx = [i for i, item in enumerate(items) if item.user_prompt is not None]
+        pool = None
+        if prompt_idx:
+            pool = ThreadPoolExecutor(
+                max_workers=max(1, min(len(prompt_idx), RankConfig.RANK_BATCH_EXTRACT_WORKERS)),
+                thread_name_prefix="batch-extract",
+            )
+        try:
+            # LLM 요소 추출을 먼저 백그라운드로 시작하고, 그동안 요소가 주어진 항목부터 랭킹
+            extractor = get_ad_element_extractor_service()
+            futures = {
+                pool.submit(contextvars.copy_context().run, extractor.extract_elements, items[i].to_ad_element_req_dto()): i
+                for i in prompt_idx
+            }
+            given = [(i, item.to_ad_element_resp_dto()) for i, item in enumerate(items) if item.user_prompt is None]
+            yield from self._rank_batch(items, given)
+
+            # 추출이 끝나는 대로 랭킹 (느린 LLM 호출 하나가 다른 항목을 붙잡지 않음).
+            # 동시에 끝나 있는 추출은 묶어서 search_batch 1회로 처리
+            remaining = set(futures)
+            while remaining:
+                done, remaining = wait(remaining, return_when=FIRST_COMPLETED)
+                extracted = []
+                for fut in sorted(done, key=futures.get):
+                    i = futures[fut]
+                    try:
+                        extracted.append((i, fut.result()))
+                    except Exception as e:
+                        logger.error(f"[RankServiceV3] 배치 항목 {i} 요소 추출 실패: {e}")
+                        yield RankDTOV3.GetRankPtfoBatchLine.model_construct(index=i, result=None, error=str(e))
+                yield from self._rank_batch(items, extracted)
+        finally:
+            # 클라이언트가 중간에 끊으면 아직 시작하지 않은 추출은 취소
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def _rank_batch(
+        self,
+        items: List[RankDTOV3.RankBatchItem],
+        elements: List[Tuple[int, AdElementDTOV2.AdElementResponse]],
+    ) -> Iterator[RankDTOV3.GetRankPtfoBatchLine]:
+        """
+        요소가 준비된 항목들을 캐시 조회 후 남은 것만 search_batch 1회로 랭킹.
+        - 새로 검색한 응답도 캐시에 저장 (캐시된 응답은 항상 커서가 없으므로 단건 요청과 공유 가능)
+        - 배치 안에서 같은 요청(cache key 동일)은 한 번만 검색
+        """
+        min_cands = RankConfig.MIN_CANDIDATE_TOP_STDO_K
+        top_studio_k = RankConfig.TOP_STDO_K
+        groups: Dict[Hashable, List[Tuple[int, AdElementDTOV2.AdElementResponse]]] = {}
+        keys: List[Hashable] = []
+        search_reqs: List[SearchDTOV3.SearchRequest] = []
+        for i, ad in elements:
+            item = items[i]
+            limit = self._validate_limit(item.limit)
+            key = self._cache_key(ad, limit, item.diversity, min_cands, top_studio_k, item.filters)
+            cached = rank_response_cache.peek(key) if CacheConfig.RANK_CACHE_ENABLED else None
+            if cached is not None:
+                yield RankDTOV3.GetRankPtfoBatchLine.model_construct(
+                    index=i, result=cached.model_copy(update={"generated": ad}), error=None
+                )
+                continue
+            if key not in groups:
+                groups[key] = []
+                keys.append(key)
+                search_reqs.append(self._build_search_request(ad, limit, item.diversity, item.filters))
+            groups[key].append((i, ad))
+        if not search_reqs:
+            return
+
+        pending = list(groups.values())
+        try:
+            searched = self.search_service.search_batch(
+                search_reqs, min_candidates=min_cands, want_studio_stats=True, top_studio_k=top_studio_k
+            )
+            for key, members, (results, extra) in zip(keys, list(pending), searched):
+                resp = RankDTOV3.GetRankPtfoResponse.model_construct(
+                    generated=members[0][1],
+                    search_results=results,
+                    top_studios=[StudioStat.model_construct(**st) for st in extra.get("studio_stats", [])],
+                    candidate_size=extra.get("candidate_size", len(results)),
+                    next_cursor=None,
+                )
+                if CacheConfig.RANK_CACHE_ENABLED:
+                    rank_response_cache.put(key, resp)
+                for i, ad in members:
+                    yield RankDTOV3.GetRankPtfoBatchLine.model_construct(
+                        index=i, result=resp.model_copy(update={"generated": ad}), error=None
+                    )
+                pending = pending[1:]
+        except Exception as e:
+            logger.error(f"[RankServiceV3] 배치 검색 실패 ({sum(len(m) for m in pending)}개 항목): {e}")
+            for members in pending:
+                for i, _ in members:
+                    yield RankDTOV3.GetRankPtfoBatchLine.model_construct(index=i, result=None, error=str(e))
+
     def _validate_limit(self, limit: int | None) -> int:
         """
         limit 값 유효성 검사 및 기본/최대 제한
@@ -82,37 +234,123 @@ class RankServiceV3:
         diversity: bool,
         min_candidates: int,
         top_studio_k: int,
+        filters: Optional[SearchDTOV3.SearchFilters] = None,
+        paginate: bool = False,
     ) -> RankDTOV3.GetRankPtfoResponse:
         """
         광고 요소 기반 검색 + 스튜디오 TOP 집계 포함 반환
+        - 동일 (요소, limit, diversity, 후보/스튜디오 설정, 필터, artifact 버전)이면 캐시된 응답 반환
+        - paginate=true 면 요청마다 후보 풀을 새로 만들어 next_cursor 발급 (응답 캐시를 거치지 않음).
+          커서는 커서 저장소 크기/TTL 로 따로 만료되므로, 커서가 담긴 응답은 캐시에 넣지 않음
         """
-        full_text = self._build_full_text(ad_element_resp)
-        clean_full_text = self.cleaner.clean(full_text)
-
-        search_req = SearchDTOV3.SearchRequest(
-            full=clean_full_text,
-            desc=ad_element_resp.desc,
-            what=ad_element_resp.what,
-            how=ad_element_resp.how,
-            style=ad_element_resp.style,
+        paginate = bool(paginate) and CacheConfig.CURSOR_ENABLED
+        compute = partial(
+            self._search_with_ad_elements,
+            ad_element_resp,
             limit=limit,
             diversity=diversity,
+            min_candidates=min_candidates,
+            top_studio_k=top_studio_k,
+            filters=filters,
+            paginate=paginate,
         )
+        if paginate or not CacheConfig.RANK_CACHE_ENABLED:
+            return compute()
 
+        cache_key = self._cache_key(ad_element_resp, limit, diversity, min_candidates, top_studio_k, filters)
+        resp = rank_response_cache.get_or_compute(cache_key, compute)
+        # 공백만 다른 요청이 같은 key 를 공유하므로 generated 는 호출자 값으로 교체 (얕은 복사)
+        return resp.model_copy(update={"generated": ad_element_resp})
+
+    def _search_with_ad_elements(
+        self,
+        ad_element_resp: AdElementDTOV2.AdElementResponse,
+        *,
+        limit: int,
+        diversity: bool,
+        min_candidates: int,
+        top_studio_k: int,
+        filters: Optional[SearchDTOV3.SearchFilters] = None,
+        paginate: bool = False,
+    ) -> RankDTOV3.GetRankPtfoResponse:
+        search_req = self._build_search_request(ad_element_resp, limit, diversity, filters)
         results, extra = self.search_service.search(
             search_req,
             min_candidates=min_candidates,
             want_studio_stats=True,
             top_studio_k=top_studio_k,
+            # 후보 풀(CURSOR_POOL_SIZE)은 다음 페이지를 요청한 경우에만 검색/재채점
+            cursor_pool=CacheConfig.CURSOR_POOL_SIZE if paginate else 0,
         )
 
-        return RankDTOV3.GetRankPtfoResponse(
+        top_studios = [StudioStat.model_construct(**s) for s in extra.get("studio_stats", [])]
+        candidate_size = extra.get("candidate_size", len(results))
+        next_cursor = None
+        cursor = extra.get("cursor")
+        if cursor is not None and len(results) < len(cursor):
+            # 다음 페이지 응답도 같은 추출 요소/스튜디오 TOP 을 그대로 사용
+            cursor.context = {"generated": ad_element_resp, "top_studios": top_studios, "candidate_size": candidate_size}
+            next_cursor = CursorStore.make_token(rank_cursor_store.put(cursor), len(results))
+
+        return RankDTOV3.GetRankPtfoResponse.model_construct(
             generated=ad_element_resp,
             search_results=results,
-            top_studios=extra.get("studio_stats", []),
-            candidate_size=extra.get("candidate_size", len(results)),
+            top_studios=top_studios,
+            candidate_size=candidate_size,
+            next_cursor=next_cursor,
+        )
+
+    def _cache_key(
+        self,
+        ad_element_resp: AdElementDTOV2.AdElementResponse,
+        limit: int,
+        diversity: bool,
+        min_candidates: int,
+        top_studio_k: int,
+        filters: Optional[SearchDTOV3.SearchFilters],
+    ) -> Tuple:
+        return (
+            self.search_service.artifact_version,
+            self._normalize(ad_element_resp.desc),
+            self._normalize(ad_element_resp.what),
+            self._normalize(ad_element_resp.how),
+            self._normalize(ad_element_resp.style),
+            limit,
+            bool(diversity),
+            min_candidates,
+            top_studio_k,
+            filters.model_dump_json() if filters is not None else None,
+        )
+
+    def _build_search_request(
+        self,
+        ad_element_resp: AdElementDTOV2.AdElementResponse,
+        limit: int,
+        diversity: bool,
+        filters: Optional[SearchDTOV3.SearchFilters],
+    ) -> SearchDTOV3.SearchRequest:
+        full_text = self._build_full_text(ad_element_resp)
+        with span("clean"):
+            clean_full_text = self.cleaner.clean(full_text)
+
+        return SearchDTOV3.SearchRequest(
+            full=clean_full_text,
+            desc=ad_element_resp.desc,
+            what=ad_element_resp.what,
+            how=ad_element_resp.how,
+            style=ad_element_resp.style,
+            limit=limit,
+            diversity=diversity,
+            filters=filters,
         )
 
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """
+        캐시 key 용 정규화: 앞뒤/중복 공백만 정리 (임베딩 결과가 달라지지 않는 범위)
+        """
+        return " ".join((text or "").split())
+
     @staticmethod
     def _build_full_text(ad_elements: AdElementDTOV2.AdElementResponse) -> str:
         """
@@ -0,0 +1,195 @@
+# SPDX-License-Identifier: Apache-2.0
+import os
+import pickle
+import re
+import secrets
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from cachetools import TTLCache
+
+from app.services.v3.fused_shard import CandidateSet
+from app.utils.log_utils import get_logger
+from app.utils.mmr_reranker import MMRSelector
+from app.utils.record_store import atomic_write
+
+logger = get_logger("ResultCursor")
+
+CURSOR_ID_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+class CursorExpiredError(Exception):
+    """
+    커서가 만료(TTL/용량 초과로 제거)되었거나 artifacts 가 다시 로드되어 더 이어볼 수 없음 → 검색을 다시 실행해야 함
+    """
+
+
+class ResultCursor:
+    """
+    검색 1회의 후보 풀(CandidateSet + 최종 점수)과 지금까지의 노출 순서.
+    - 일반: 첫 페이지 이후는 최종 점수 내림차순 (생성 시 1회 정렬)
+    - diversity: 첫 페이지 선택 상태에서 MMR 을 이어서 선택 (필요한 만큼만, MMRSelector 상태 유지)
+    다음 페이지는 순서 목록을 자르기만 하므로 인코더/FAISS 를 다시 거치지 않음.
+    context 에는 응답 재구성에 필요한 값(추출 요소, 스튜디오 TOP 등)을 호출자가 담아 둠.
+    직렬화(pickle)는 생성 인자만 저장하고 복원 시 순서를 다시 만든다 (MMR 선택은 결정적이라 어느 워커에서 이어도 같은 순서).
+    """
+
+    def __init__(
+        self,
+        cands: CandidateSet,
+        final_scores: np.ndarray,
+        first_page: np.ndarray,
+        diversity: bool,
+        lambda_param: float,
+        artifact_version: str,
+    ):
+        self.cands = cands
+        self.final_scores = final_scores
+        self.first_page = np.asarray(first_page, dtype=np.int64)
+        self.diversity = bool(diversity)
+        self.lambda_param = float(lambda_param)
+        self.artifact_version = artifact_version
+        self.context: Dict[str, Any] = {}
+        self.order: List[int] = [int(i) for i in first_page]
+        self._lock = threading.Lock()
+        self._selector: Optional[MMRSelector] = None
+
+        if diversity and cands.mmr_emb is not None:
+            self._selector = MMRSelector(cands.mmr_emb, final_scores, lambda_param, selected=self.order)
+        else:
+            rest = np.ones(len(cands), dtype=bool)
+            rest[self.order] = False
+            remaining = np.flatnonzero(rest)
+            self.order.extend(int(i) for i in remaining[np.argsort(-final_scores[remaining], kind="stable")])
+
+    def __len__(self) -> int:
+        return len(self.cands)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "cands": self.cands, "final_scores": self.final_scores, "first_page": self.first_page,
+            "diversity": self.diversity, "lambda_param": self.lambda_param,
+            "artifact_version": self.artifact_version, "context": self.context,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        context = state.pop("context")
+        self.__init__(**state)
+        self.context = context
+
+    def positions(self, offset: int, limit: int) -> np.ndarray:
+        """
+        노출 순서 [offset, offset + limit) 의 후보 위치 (MMR 이면 부족한 만큼 이어서 선택)
+        """
+        end = min(offset + limit, len(self))
+        with self._lock:
+            if self._selector is not None and len(self.order) < end:
+                self.order.extend(self._selector.next(end - len(self.order)))
+            return np.asarray(self.order[offset:end], dtype=np.int64)
+
+
+class CursorStore:
+    """
+    크기/TTL 제한 커서 저장소. 커서 토큰은 "{id}.{offset}" (id 는 추측 불가한 임의 문자열)
+    - 기본: 프로세스 메모리 (단일 워커 전용)
+    - shared_dir 지정 시: 커서를 "{id}.pkl" 파일로도 저장해 같은 디렉터리를 보는 다른 워커/인스턴스가 이어볼 수 있음.
+      (prefork 서버는 연결을 아무 워커나 받으므로 워커 2개 이상이면 필요. 파일 수/TTL 은 메모리 캐시와 같은 제한)
+    """
+
+    def __init__(self, max_size: int, ttl_sec: float, shared_dir: Optional[str] = None):
+        self.max_size = max(1, int(max_size))
+        self.ttl_sec = float(ttl_sec)
+        self._cache: TTLCache = TTLCache(maxsize=self.max_size, ttl=self.ttl_sec)
+        self._lock = threading.Lock()
+        self.shared_dir: Optional[str] = None
+        if shared_dir:
+            self.enable_shared(shared_dir)
+
+    def enable_shared(self, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        self.shared_dir = directory
+
+    def _path(self, cursor_id: str) -> str:
+        return os.path.join(self.shared_dir, f"{cursor_id}.pkl")
+
+    def put(self, cursor: ResultCursor) -> str:
+        cursor_id = secrets.token_urlsafe(12)
+        with self._lock:
+            self._cache[cursor_id] = cursor
+        if self.shared_dir:
+            payload = pickle.dumps(cursor, protocol=pickle.HIGHEST_PROTOCOL)
+            atomic_write(self._path(cursor_id), lambda fp: fp.write(payload))
+            self._prune_shared()
+        return cursor_id
+
+    def get(self, cursor_id: str) -> ResultCursor:
+        with self._lock:
+            cursor = self._cache.get(cursor_id)
+        if cursor is None and self.shared_dir:
+            cursor = self._load_shared(cursor_id)
+        if cursor is None:
+            raise CursorExpiredError("커서가 만료되었습니다. 검색을 다시 실행하세요.")
+        return cursor
+
+    def _load_shared(self, cursor_id: str) -> Optional[ResultCursor]:
+        path = self._path(cursor_id)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_sec:
+                return None
+            with open(path, "rb") as fp:
+                cursor = pickle.load(fp)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"[Cursor] 공유 커서 로드 실패 {cursor_id}: {e}")
+            return None
+        with self._lock:
+            self._cache[cursor_id] = cursor
+        return cursor
+
+    def _prune_shared(self) -> None:
+        """
+        TTL 이 지난 파일과 max_size 를 넘는 오래된 파일 삭제 (다른 워커와 동시에 지워도 무방)
+        """
+        try:
+            entries = []
+            for entry in os.scandir(self.shared_dir):
+                if entry.name.endswith(".pkl"):
+                    entries.append((entry.stat().st_mtime, entry.path))
+        except FileNotFoundError:
+            return
+        entries.sort(reverse=True)
+        now = time.time()
+        for i, (mtime, path) in enumerate(entries):
+            if i >= self.max_size or now - mtime > self.ttl_sec:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+        if self.shared_dir:
+            for entry in os.scandir(self.shared_dir):
+                if entry.name.endswith(".pkl"):
+                    try:
+                        os.remove(entry.path)
+                    except FileNotFoundError:
+                        pass
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    @staticmethod
+    def make_token(cursor_id: str, offset: int) -> str:
+        return f"{cursor_id}.{offset}"
+
+    @staticmethod
+    def parse_token(token: str) -> Tuple[str, int]:
+        cursor_id, sep, offset = (token or "").rpartition(".")
+        if not sep or not CURSOR_ID_RE.match(cursor_id) or not offset.isdigit():
+            raise ValueError("잘못된 cursor 형식입니다")
+        return cursor_id, int(offset)
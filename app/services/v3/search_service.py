@@ -1,18 +1,34 @@
 # SPDX-License-Identifier: Apache-2.0
-from collections import Counter
-from typing import List, Dict, Tuple, Optional
+import hashlib
+from typing import Iterator, List, Dict, Optional, Tuple
+import json
 import os
 import pickle
+import threading
+import time
 import numpy as np
 import faiss
-from sentence_transformers import SentenceTransformer
-import fasttext
 
-from app.core.config import ModelConfig
+from app.core.config import ModelConfig, RankConfig, SearchConfig
 from app.schemas.v3.search_dto import SearchDTOV3
+from app.services.v3.filter_index import FILTER_COLUMNS_FILE, FilterIndex
+from app.services.v3.fused_shard import CandidateSet, FusedShard, load_shard_manifest
+from app.services.v3.lexical_index import LEXICAL_INDEX_FILE, LexicalIndex
+from app.services.v3.result_cursor import CursorExpiredError, ResultCursor
+from app.services.v3.shard_client import ShardedFusedIndex
+from app.utils.fasttext_table import load_word_embedding_model
+from app.utils.lazy_singleton import LazySingleton
+from app.utils.metrics import span
 from app.utils.mmr_reranker import mmr_rerank
-from app.core.database import get_db
-from app.models.ptfo_tag_merged import PtfoTagMerged
+from app.utils.record_store import RECORD_STORE_DIR, RecordStore, load_factor_bundle
+from app.utils.sbert_encoder import get_sentence_encoder
+from app.utils.tag_mapping import load_tag_mapping, refresh_tag_mapping
+from app.utils.log_utils import get_logger
+
+logger = get_logger("SearchServiceV3")
+
+
+FUSED_META_FILE = "fused_meta.json"
 
 
 class SearchServiceV3:
@@ -21,55 +37,168 @@ class SearchServiceV3:
     - 요청 시: fused 인덱스에서 후보 M 검색 → 후보에 한해 factor별 점수 및 최종 점수 계산
     - diversity=true면 후보 M을 더 넉넉히 가져와 MMR로 재랭킹
     - 필요 시 스튜디오 통계(PRDN_STDO_NM) 집계까지 반환
+    - request.filters(제작비/기간/스튜디오/태그)는 인덱스 검색 단계에서 적용 → 항상 조건을 만족하는 top-K
+    - V3_SHARD_URLS 설정 시 후보 검색/factor 점수는 샤드 서버들에 나눠 보내고 전역 top-M 으로 병합
+    - V3_LEXICAL_MODE 설정 시 BM25 역색인을 후보 소스로 추가 (rrf: dense 와 RRF 결합 / first_stage: BM25 후보만) → 후보는 dense 로 재채점
     """
 
     # 후보폭(튜닝 파라미터)
     ALPHA = 4
     MIN_CANDS = 10
     MAX_CANDS_CAP = 500
+    MMR_LAMBDA = 0.7
     FACTOR_ORDER = ["full", "desc", "what", "how", "style"]
+    LEXICAL_MODES = ("off", "rrf", "first_stage")
+    # BM25 질의로 쓰는 요청 factor (full 은 나머지를 이어 붙인 것이라 제외)
+    LEXICAL_QUERY_FACTORS = ["desc", "what", "how", "style"]
 
-    def __init__(self):
-        self.embedding_model = SentenceTransformer(ModelConfig.EMBEDDING_MODEL)
-        self.fasttext_model = fasttext.load_model(ModelConfig.WORD_EMBEDDING_MODEL_PATH)
-        self.artifacts_dir = f"./artifacts/v3/{ModelConfig.EMBEDDING_MODEL}"
+    def __init__(self, previous: Optional["SearchServiceV3"] = None):
+        # previous: 다시 로드할 때 모델/샤드 클라이언트를 재사용할 기존 인스턴스 (reload_search_service)
+        self.embedding_model = previous.embedding_model if previous is not None else get_sentence_encoder()
+        self.fasttext_model = previous.fasttext_model if previous is not None else load_word_embedding_model()
+        self.artifacts_dir = f"{ModelConfig.ARTIFACTS_ROOT}/v3/{ModelConfig.EMBEDDING_MODEL}"
+        self.lexical_mode = SearchConfig.V3_LEXICAL_MODE
+        if self.lexical_mode not in self.LEXICAL_MODES:
+            logger.warning(f"Unknown V3_LEXICAL_MODE='{self.lexical_mode}', fallback to 'off'")
+            self.lexical_mode = "off"
+        self.rrf_k = SearchConfig.V3_RRF_K
 
-        # factor별 원본 임베딩 로드
-        self.embeddings: Dict[str, np.ndarray] = {}
-        # 메타 레코드 로드
-        self.records: Optional[List[Dict]] = None
-        for f in self.FACTOR_ORDER:
-            with open(os.path.join(self.artifacts_dir, f"{f}_embeddings.pkl"), "rb") as fp:
-                meta = pickle.load(fp)
-            self.embeddings[f] = meta["embeddings"]
-            if self.records is None:
-                self.records = meta["data"]
+        # 태그 매핑은 artifacts(tag_mapping.json)에 포함 → 기동 시 DB 조회 없음
+        self._load_artifacts(previous)
+
+    def _load_artifacts(self, previous: Optional["SearchServiceV3"] = None) -> None:
+        """
+        artifacts 디렉토리에서 factor 임베딩/레코드/fused 인덱스/가중치를 로드하고 버전을 갱신.
+        샤드 모드(V3_SHARD_URLS)면 인덱스/행렬은 샤드 서버가 들고 있으므로 manifest 와 레코드만 로드.
+        """
+        if SearchConfig.V3_SHARD_URLS:
+            self._load_sharded_artifacts(previous)
+            return
+
+        # factor별 원본 임베딩 + 메타 레코드(RecordStore) 로드
+        embeddings, records = load_factor_bundle(self.artifacts_dir, self.FACTOR_ORDER)
 
         # fused 인덱스/메타 (검색용)
-        self.fused_index = faiss.read_index(os.path.join(self.artifacts_dir, "fused_index.faiss"))
-        with open(os.path.join(self.artifacts_dir, "fused_embeddings.pkl"), "rb") as fp:
-            fused_meta = pickle.load(fp)
+        fused_index = faiss.read_index(os.path.join(self.artifacts_dir, "fused_index.faiss"))
+        fused_meta = self._load_fused_meta()
+
+        self.embeddings = embeddings
+        self.records = records
+        self.fused_index = fused_index
+        filter_index = self._load_filter_index(self.artifacts_dir, records)
+        self._set_studio_columns(filter_index)
+        self.tag_mapping_dir = self.artifacts_dir
+        self.portfolio_tag_mapping = load_tag_mapping(self.tag_mapping_dir, records)
+        # 전체 카탈로그를 하나의 샤드로 취급 (샤드 모드와 같은 후보 검색 경로 사용)
+        self.candidate_index = FusedShard(
+            fused_index, embeddings, np.arange(fused_index.ntotal, dtype=np.int64), filter_index
+        )
+        self.lexical_index = self._load_lexical_index(records) if self.lexical_mode != "off" else None
         self.weights: Dict[str, float] = fused_meta["weights"]
         self.sqrt_w = {k: np.sqrt(float(v)).astype(np.float32) for k, v in self.weights.items()}
+        self.artifact_version = self._compute_artifact_version(("fused_index.faiss", "fused_embeddings.pkl"))
 
-        # 태그 매핑(초기화 시 1회 로드)
-        self.portfolio_tag_mapping = self._load_tag_mapping_once()
+    def _load_sharded_artifacts(self, previous: Optional["SearchServiceV3"] = None) -> None:
+        shards_dir = os.path.join(self.artifacts_dir, "shards")
+        manifest = load_shard_manifest(shards_dir)
+        records = RecordStore.load(os.path.join(shards_dir, RECORD_STORE_DIR))
 
-    # ---------- 초기 로드 헬퍼 ----------
-    @staticmethod
-    def _load_tag_mapping_once() -> Dict[int, List[str]]:
-        db = next(get_db())
+        self.embeddings = {}
+        self.records = records
+        self.fused_index = None
+        self._set_studio_columns(self._load_filter_index(shards_dir, records))
+        self.tag_mapping_dir = shards_dir
+        self.portfolio_tag_mapping = load_tag_mapping(self.tag_mapping_dir, records)
+        if previous is not None and isinstance(previous.candidate_index, ShardedFusedIndex):
+            self.candidate_index = previous.candidate_index  # 샤드 서버 연결/스레드 풀 재사용
+        else:
+            self.candidate_index = ShardedFusedIndex(SearchConfig.V3_SHARD_URLS, SearchConfig.V3_SHARD_TIMEOUT_SEC)
+        # BM25 후보의 dense 재채점에는 factor 행렬이 필요하므로 샤드 모드에서는 dense 후보만 사용
+        self.lexical_index = None
+        if self.lexical_mode != "off":
+            logger.warning(f"[SearchServiceV3] 샤드 모드에서는 V3_LEXICAL_MODE={self.lexical_mode} 를 지원하지 않아 dense 후보만 사용합니다")
+        self.weights = manifest["weights"]
+        self.sqrt_w = {k: np.sqrt(float(v)).astype(np.float32) for k, v in self.weights.items()}
+        self._ntotal = int(manifest["ntotal"])
+        self.artifact_version = self._compute_artifact_version(("shards/manifest.json", f"shards/{RECORD_STORE_DIR}/meta.json"))
+
+        # 샤드 서버가 같은 버전의 manifest 로 떠 있는지 확인 (불일치 시 경고만)
         try:
-            rows = db.query(PtfoTagMerged).all()
-            tag_mapping: Dict[int, List[str]] = {}
-            for r in rows:
-                tag_mapping.setdefault(r.PTFO_SEQNO, []).append(r.TAG_NM)
-            return tag_mapping
-        finally:
-            try:
-                db.close()
-            except Exception:
-                pass
+            versions = {h.get("version") for h in self.candidate_index.health()}
+            if versions != {manifest["version"]}:
+                logger.warning(f"[SearchServiceV3] 샤드 버전 불일치: manifest={manifest['version']} shards={versions}")
+        except Exception as e:
+            logger.warning(f"[SearchServiceV3] 샤드 서버 상태 확인 실패: {e}")
+        logger.info(f"[SearchServiceV3] 샤드 모드: shards={len(SearchConfig.V3_SHARD_URLS)} ntotal={self._ntotal}")
+
+    def _load_fused_meta(self) -> Dict:
+        """
+        가중치/factor 순서 메타. fused_meta.json 이 없으면(이전 artifacts) fused_embeddings.pkl 에서 읽음
+        """
+        path = os.path.join(self.artifacts_dir, FUSED_META_FILE)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fp:
+                return json.load(fp)
+        with open(os.path.join(self.artifacts_dir, "fused_embeddings.pkl"), "rb") as fp:
+            return pickle.load(fp)
+
+    @staticmethod
+    def _load_filter_index(directory: str, records: RecordStore) -> FilterIndex:
+        """
+        필터/스튜디오 컬럼은 인덱스 생성 시 저장, 이전 artifacts 라 없으면 레코드로부터 생성
+        """
+        filter_index = FilterIndex.load(directory)
+        if filter_index is None:
+            logger.warning(f"[SearchServiceV3] {FILTER_COLUMNS_FILE} 없음 → 레코드로부터 필터 컬럼 생성")
+            filter_index = FilterIndex.from_records(records)
+        return filter_index
+
+    def _load_lexical_index(self, records: RecordStore) -> LexicalIndex:
+        """
+        BM25 역색인은 인덱스 생성 시 저장, 이전 artifacts 라 없으면 레코드로부터 생성
+        """
+        lexical_index = LexicalIndex.load(self.artifacts_dir)
+        if lexical_index is None:
+            logger.warning(f"[SearchServiceV3] {LEXICAL_INDEX_FILE} 없음 → 레코드로부터 BM25 역색인 생성")
+            lexical_index = LexicalIndex.from_records(records, k1=SearchConfig.BM25_K1, b=SearchConfig.BM25_B)
+        logger.info(f"[SearchServiceV3] BM25 후보 소스: mode={self.lexical_mode} terms={len(lexical_index.terms)}")
+        return lexical_index
+
+    def _set_studio_columns(self, filter_index: FilterIndex) -> None:
+        # 스튜디오 통계용: records 순서의 정수 id 배열 + id → 이름 (id 는 이름 오름차순으로 부여됨)
+        self.studio_ids = filter_index.studio_ids
+        self.studio_names = filter_index.studio_names
+
+    def _compute_artifact_version(self, names: Tuple[str, ...]) -> str:
+        """
+        artifact 파일들의 (크기, 수정시각)으로 artifact 버전 문자열 생성.
+        재색인 후 reload_search_service 로 다시 로드하면 값이 바뀌므로 응답 캐시 key 에 포함해 자동 무효화에 사용.
+        """
+        parts = []
+        for name in names:
+            st = os.stat(os.path.join(self.artifacts_dir, name))
+            parts.append(f"{name}:{st.st_size}:{st.st_mtime_ns}")
+        return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:12]
+
+    def refresh_tag_mapping(self) -> int:
+        """
+        DB(tb_ptfo_tag_merged)에서 태그 매핑을 다시 읽어 artifacts 의 tag_mapping.json 과 메모리 매핑을 갱신.
+        DB 를 조회하는 유일한 경로 (명시적 갱신 시에만 호출). 갱신된 포트폴리오 수를 반환.
+        """
+        self.portfolio_tag_mapping = refresh_tag_mapping([self.tag_mapping_dir])
+        return len(self.portfolio_tag_mapping)
+
+    def freeze_arrays(self) -> int:
+        """
+        factor 임베딩 행렬을 읽기 전용으로 고정하고 고정한 바이트 수를 반환.
+        prefork 서버에서 fork 전에 호출 → 워커가 실수로 쓰더라도 예외가 나므로 copy-on-write 공유가 깨지지 않음.
+        """
+        frozen = 0
+        for mat in self.embeddings.values():
+            if isinstance(mat, np.ndarray):
+                mat.setflags(write=False)
+                frozen += mat.nbytes
+        return frozen
 
     # ---------- 임베딩 유틸 ----------
     @staticmethod
@@ -90,17 +219,43 @@ class SearchServiceV3:
         return self._l2norm(v)
 
     def _embed_query_fused(self, req: SearchDTOV3.SearchRequest) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
-        q = {
-            "full":  self._embed_sbert(req.full),
-            "desc":  self._embed_sbert(req.desc),
-            "what":  self._embed_fasttext(req.what),
-            "how":   self._embed_sbert(req.how),
-            "style": self._embed_sbert(req.style),
-        }
+        q = {}
+        for f in self.FACTOR_ORDER:
+            with span(f"embed_{f}"):
+                text = getattr(req, f)
+                q[f] = self._embed_fasttext(text) if f == "what" else self._embed_sbert(text)
         scaled = [q[f] * self.sqrt_w[f] for f in self.FACTOR_ORDER]
         q_fused = np.concatenate(scaled, axis=1).astype(np.float32)
         return q_fused, q
 
+    def _embed_queries_fused(
+        self, requests: List[SearchDTOV3.SearchRequest]
+    ) -> Tuple[np.ndarray, List[Dict[str, np.ndarray]]]:
+        """
+        여러 요청의 질의 임베딩. SBERT factor 텍스트는 요청 전체에서 고유한 것만 모아 encode 1회로 처리.
+        반환: (q_fused (B, D), 요청별 {factor: (1, d)}) — 요청마다 _embed_query_fused 를 호출한 것과 같은 값
+        """
+        sbert_factors = [f for f in self.FACTOR_ORDER if f != "what"]
+        texts: Dict[str, int] = {}
+        for r in requests:
+            for f in sbert_factors:
+                texts.setdefault(getattr(r, f) or "", len(texts))
+        with span("embed_sbert_batch"):
+            sbert = self._l2norm(
+                np.asarray(self.embedding_model.encode(list(texts), convert_to_numpy=True), dtype=np.float32)
+            )
+
+        q_facs: List[Dict[str, np.ndarray]] = []
+        with span("embed_what"):
+            for r in requests:
+                q = {f: sbert[texts[getattr(r, f) or ""]][None, :] for f in sbert_factors}
+                q["what"] = self._embed_fasttext(r.what)
+                q_facs.append(q)
+        q_fused = np.concatenate(
+            [np.concatenate([q[f] for q in q_facs], axis=0) * self.sqrt_w[f] for f in self.FACTOR_ORDER], axis=1
+        ).astype(np.float32)
+        return q_fused, q_facs
+
     # ---------- 퍼블릭 검색 ----------
     def search(
         self,
@@ -109,6 +264,7 @@ class SearchServiceV3:
         min_candidates: int = 30,          # 최소 후보 수(M)
         want_studio_stats: bool = False,   # 스튜디오 TOP 집계 반환 여부
         top_studio_k: int = 3,             # 스튜디오 상위 K
+        cursor_pool: int = 0,              # > 0 이면 이어보기용 후보 풀 크기 (extra["cursor"] 반환)
     ) -> Tuple[List[SearchDTOV3.SearchResponse], Dict]:
         """
         반환값: (results, extra)
@@ -116,71 +272,241 @@ class SearchServiceV3:
           - extra:
               { "candidate_size": int,
                 "studio_stats": [{"name": str, "count": int, "ratio": float}, ...]  # 옵션
+                "cursor": ResultCursor  # cursor_pool > 0 인 경우
               }
+        cursor_pool 이 M 보다 크면 후보 풀을 따로 검색하고, 첫 페이지/스튜디오 통계는 풀 없이 검색한 상위 M 후보로 계산.
+        (풀의 앞 M 개는 경계 동점 · RRF 결합 폭 · BM25 대체 조건 때문에 top-M 과 다를 수 있음)
         """
         k = int(request.limit or 5)
-        N = int(self.fused_index.ntotal)
+        N = self.corpus_size()
         if N <= 0:
             return [], {}
 
-        # 후보폭(M) 결정, 최소 후보 보장
-        if request.diversity:
-            M = min(N, max(k * self.ALPHA, self.MIN_CANDS, min_candidates))
-        else:
-            M = min(N, max(k, min_candidates))
-
-        # fused 인덱스 검색
+        # fused 인덱스 검색 + 후보에 대해서만 factor 점수 계산 (샤드 모드면 샤드별 top-M 을 전역 top-M 으로 병합)
+        M = self.candidate_width(k, N, bool(request.diversity), min_candidates)
+        pool = min(N, max(M, int(cursor_pool))) if cursor_pool > 0 else M
         q_fused, q_fac = self._embed_query_fused(request)
-        D, I = self.fused_index.search(q_fused, M)
-        I0 = I[0].astype(int)
-        D0 = D[0].astype(np.float32)
-        keep = (I0 != -1) & np.isfinite(D0)
-        cand_ids = I0[keep].tolist()
-        if not cand_ids:
+        with span("faiss_search"):
+            cands = self.retrieve_candidates(q_fused, q_fac, M, request)
+            pool_cands = self.retrieve_candidates(q_fused, q_fac, pool, request) if pool > M else None
+        return self._rank_candidates(
+            request, cands,
+            want_studio_stats=want_studio_stats, top_studio_k=top_studio_k,
+            with_cursor=cursor_pool > 0, pool_cands=pool_cands,
+        )
+
+    def search_batch(
+        self,
+        requests: List[SearchDTOV3.SearchRequest],
+        *,
+        min_candidates: int = 30,
+        want_studio_stats: bool = False,
+        top_studio_k: int = 3,
+    ) -> Iterator[Tuple[List[SearchDTOV3.SearchResponse], Dict]]:
+        """
+        여러 요청을 한 번에 검색해 요청 순서대로 (results, extra) 를 하나씩 생성 (각 결과는 search 와 동일, 커서 없음).
+        - 질의 임베딩: 고유 SBERT 텍스트를 encode 1회로 처리
+        - 후보 검색: 후보폭이 같은 요청끼리 다행 fused_index.search 1회 (필터가 있는 요청, BM25 후보 소스 사용 시에는 요청별 검색)
+        - 재채점/선택/DTO 변환은 요청별로 진행하며 끝나는 대로 yield → 호출자가 바로 스트리밍 가능
+        """
+        if not requests:
+            return
+        N = self.corpus_size()
+        if N <= 0:
+            for _ in requests:
+                yield [], {}
+            return
+
+        Ms = [self.candidate_width(int(r.limit or 5), N, bool(r.diversity), min_candidates) for r in requests]
+        q_fused, q_facs = self._embed_queries_fused(requests)
+        with span("faiss_search"):
+            if self.lexical_index is None:
+                cands_list = self.candidate_index.search_many(
+                    q_fused, q_facs, Ms, [bool(r.diversity) for r in requests], [r.filters for r in requests]
+                )
+            else:
+                cands_list = [
+                    self.retrieve_candidates(q_fused[i:i + 1], q_facs[i], Ms[i], r) for i, r in enumerate(requests)
+                ]
+
+        for request, cands in zip(requests, cands_list):
+            yield self._rank_candidates(
+                request, cands, want_studio_stats=want_studio_stats, top_studio_k=top_studio_k, with_cursor=False
+            )
+
+    def _rank_candidates(
+        self,
+        request: SearchDTOV3.SearchRequest,
+        cands: CandidateSet,
+        *,
+        want_studio_stats: bool,
+        top_studio_k: int,
+        with_cursor: bool,
+        pool_cands: Optional[CandidateSet] = None,
+    ) -> Tuple[List[SearchDTOV3.SearchResponse], Dict]:
+        """
+        검색된 top-M 후보로 최종 점수 → 상위 k 선택 → DTO 변환 (+ 커서/스튜디오 통계).
+        pool_cands 가 있으면 커서는 첫 페이지 + 풀의 나머지 후보로 만듦 (없으면 top-M 후보로)
+        """
+        if not len(cands):
             return [], {}
+        k = int(request.limit or 5)
+
+        with span("rescore"):
+            final_scores = self.final_scores(cands)
+        with span("mmr" if request.diversity else "topk"):
+            order_idx = self.select(cands, final_scores, k, bool(request.diversity))
+        with span("dto"):
+            results = self.build_results(cands, final_scores, order_idx)
+
+        extra: Dict = {"candidate_size": len(cands)}
+        if with_cursor:
+            extra["cursor"] = self._make_cursor(request, cands, final_scores, order_idx, pool_cands)
+
+        # 스튜디오 순위 산정
+        if want_studio_stats:
+            with span("studio_stats"):
+                extra["studio_stats"] = self._studio_stats(
+                    cands.ids, final_scores, top_studio_k, score_weighted=RankConfig.STUDIO_STATS_SCORE_WEIGHTED
+                )
+
+        return results, extra
+
+    def _make_cursor(
+        self,
+        request: SearchDTOV3.SearchRequest,
+        cands: CandidateSet,
+        final_scores: np.ndarray,
+        order_idx: np.ndarray,
+        pool_cands: Optional[CandidateSet],
+    ) -> ResultCursor:
+        """
+        커서 후보 = 첫 페이지(top-M 에서 선택한 순서) + 풀에서 첫 페이지를 뺀 나머지 → 다음 페이지는 나머지에서 이어서 선택
+        """
+        if pool_cands is None:
+            pool_cands = cands
+        with span("rescore"):
+            pool_scores = self.final_scores(pool_cands)
+        page = cands.take(order_idx)
+        rest = np.flatnonzero(~np.isin(pool_cands.ids, page.ids))
+        merged = CandidateSet.concat([page, pool_cands.take(rest)])
+        scores = np.concatenate([final_scores[order_idx], pool_scores[rest]]).astype(np.float32)
+        return ResultCursor(
+            merged, scores, np.arange(len(page)), bool(request.diversity), self.MMR_LAMBDA, self.artifact_version
+        )
 
-        # 후보에 대해서만 factor 점수 계산 (내적 == 코사인, 벡터 L2정규화 가정)
-        def dot_scores(qv: np.ndarray, mat: np.ndarray) -> np.ndarray:
-            return (qv @ mat.T).astype(np.float32)[0]
-
-        full_s  = dot_scores(q_fac["full"],  self.embeddings["full"][cand_ids])
-        desc_s  = dot_scores(q_fac["desc"],  self.embeddings["desc"][cand_ids])
-        what_s  = dot_scores(q_fac["what"],  self.embeddings["what"][cand_ids])
-        how_s   = dot_scores(q_fac["how"],   self.embeddings["how"][cand_ids])
-        style_s = dot_scores(q_fac["style"], self.embeddings["style"][cand_ids])
-
-        Wf = float(self.weights["full"]);  Wd = float(self.weights["desc"])
-        Ww = float(self.weights["what"]);  Wh = float(self.weights["how"]);  Ws = float(self.weights["style"])
-        final_scores = (Wf*full_s + Wd*desc_s + Ww*what_s + Wh*how_s + Ws*style_s).astype(np.float32)
-        final_scores = np.where(np.isfinite(final_scores), final_scores, 0.0)
-
-        # MMR 사용 여부 판단
-        if request.diversity:
-            mmr_emb = self._avg_sbert_emb_subset(cand_ids)
-            sel = mmr_rerank(mmr_emb, final_scores, k=min(k, len(cand_ids)), lambda_param=0.7)
-            order_idx = sel
+    # ---------- 검색 단계 (search 가 순서대로 호출, 벤치마크에서 단계별 측정에 사용) ----------
+    def candidate_width(self, k: int, N: int, diversity: bool, min_candidates: int) -> int:
+        """
+        후보폭(M) 결정, 최소 후보 보장. MAX_CANDS_CAP 으로 상한을 두되 k 보다 작아지지는 않음
+        """
+        if diversity:
+            M = max(k * self.ALPHA, self.MIN_CANDS, min_candidates)
+        else:
+            M = max(k, min_candidates)
+        return min(N, M, max(k, self.MAX_CANDS_CAP))
+
+    def retrieve_candidates(
+        self,
+        q_fused: np.ndarray,
+        q_fac: Dict[str, np.ndarray],
+        M: int,
+        request: SearchDTOV3.SearchRequest,
+    ) -> CandidateSet:
+        """
+        후보 top-M 과 factor 점수.
+        - off: fused dense 인덱스
+        - rrf: dense top-M 과 BM25 top-M 을 reciprocal-rank fusion 한 상위 M
+        - first_stage: BM25 top-M (일치 문서가 limit 보다 적으면 dense 로 대체)
+        BM25 를 거친 후보는 dense factor 점수로 재채점하고, fused_scores 는 가중합(= fused 내적)으로 채움
+        """
+        with_mmr = bool(request.diversity)
+        if self.lexical_index is None:
+            return self.candidate_index.search(q_fused, q_fac, M, with_mmr=with_mmr, filters=request.filters)
+
+        filter_index = self.candidate_index.filter_index
+        mask = filter_index.mask(request.filters) if filter_index is not None else None
+        with span("bm25"):
+            lex_ids, _ = self.lexical_index.search(self._lexical_query(request), M, mask)
+
+        if self.lexical_mode == "first_stage" and lex_ids.size >= min(M, int(request.limit or 5)):
+            ids = lex_ids
         else:
-            order_idx = np.argsort(-final_scores)[:k]
+            dense = self.candidate_index.search(q_fused, q_fac, M, with_mmr=with_mmr, filters=request.filters)
+            if self.lexical_mode == "first_stage" or lex_ids.size == 0:
+                return dense
+            ids = self.reciprocal_rank_fusion([dense.ids, lex_ids], M, self.rrf_k)
+
+        cands = self.candidate_index.score(ids, np.zeros(ids.size, dtype=np.float32), q_fac, with_mmr)
+        cands.fused_scores = self.final_scores(cands)
+        return cands
+
+    def _lexical_query(self, request: SearchDTOV3.SearchRequest) -> str:
+        return " ".join(getattr(request, f) or "" for f in self.LEXICAL_QUERY_FACTORS)
+
+    @staticmethod
+    def reciprocal_rank_fusion(rankings: List[np.ndarray], M: int, k: int = 60) -> np.ndarray:
+        """
+        순위 목록들의 RRF 상위 M id (점수 = Σ 1 / (k + 순위), 순위는 1부터). 동점은 id 오름차순
+        """
+        ids = np.concatenate(rankings)
+        contrib = np.concatenate([1.0 / (k + np.arange(1, r.size + 1, dtype=np.float64)) for r in rankings])
+        uniq, inverse = np.unique(ids, return_inverse=True)
+        scores = np.bincount(inverse.reshape(-1), weights=contrib)
+        return uniq[np.lexsort((uniq, -scores))[:M]]
+
+    def final_scores(self, cands: CandidateSet) -> np.ndarray:
+        """
+        후보별 factor 점수의 가중합 (NaN/inf 는 0)
+        """
+        final_scores = np.zeros(len(cands), dtype=np.float32)
+        for f in self.FACTOR_ORDER:
+            final_scores += np.float32(self.weights[f]) * cands.factor_scores[f]
+        return np.where(np.isfinite(final_scores), final_scores, 0.0).astype(np.float32)
 
-        ordered_ids = [cand_ids[i] for i in order_idx]
+    @classmethod
+    def select(cls, cands: CandidateSet, final_scores: np.ndarray, k: int, diversity: bool) -> np.ndarray:
+        """
+        후보 내 상위 k 위치 선택 (diversity 면 MMR 재랭킹)
+        """
+        if diversity:
+            return np.asarray(mmr_rerank(cands.mmr_emb, final_scores, k=min(k, len(cands)), lambda_param=cls.MMR_LAMBDA))
+        return np.argsort(-final_scores)[:k]
+
+    def page(self, cursor: ResultCursor, offset: int, limit: int) -> List[SearchDTOV3.SearchResponse]:
+        """
+        커서의 후보 풀에서 [offset, offset + limit) 결과 (인코더/FAISS 호출 없음)
+        """
+        if cursor.artifact_version != self.artifact_version:
+            raise CursorExpiredError("artifacts 가 다시 로드되어 커서를 이어볼 수 없습니다. 검색을 다시 실행하세요.")
+        with span("cursor_page"):
+            return self.build_results(cursor.cands, cursor.final_scores, cursor.positions(offset, limit))
+
+    def build_results(
+        self,
+        cands: CandidateSet,
+        final_scores: np.ndarray,
+        order_idx: np.ndarray,
+    ) -> List[SearchDTOV3.SearchResponse]:
+        full_s  = cands.factor_scores["full"]
+        desc_s  = cands.factor_scores["desc"]
+        what_s  = cands.factor_scores["what"]
+        how_s   = cands.factor_scores["how"]
+        style_s = cands.factor_scores["style"]
 
         results: List[SearchDTOV3.SearchResponse] = []
-        for j, gid in zip(order_idx, ordered_ids):
-            rec = self.records[gid]
+        for j in order_idx:
+            rec = self.records[int(cands.ids[j])]
             ptfo_seqno = rec["PTFO_SEQNO"]
             tags = self.portfolio_tag_mapping.get(ptfo_seqno, [])
             view_lnk_url = rec.get("VIEW_LNK_URL")
             prdn_stdo_nm = rec.get("PRDN_STDO_NM")
-            prdn_cost    = rec.get("PRDN_COST")
+            prdn_cost_val = rec.get("PRDN_COST_VALUE")  # 빌드 시 1회 파싱된 값
             prdn_perd    = rec.get("PRDN_PERD")
 
-            try:
-                prdn_cost_val = float(prdn_cost) if prdn_cost not in (None, "") else None
-            except Exception:
-                prdn_cost_val = None
-
+            # 내부에서 만든 값이라 검증 없이 생성 (요청당 최대 50개 모델의 재검증 비용 절감)
             results.append(
-                SearchDTOV3.SearchResponse(
+                SearchDTOV3.SearchResponse.model_construct(
                     final_score=float(final_scores[j]),
                     full_score=float(full_s[j]),
                     desc_score=float(desc_s[j]),
@@ -201,35 +527,73 @@ class SearchServiceV3:
                     prdn_perd=prdn_perd,
                 )
             )
+        return results
 
-        # 스튜디오 순위 산정
-        extra: Dict = {"candidate_size": len(cand_ids)}
-        if want_studio_stats:
-            studios = [(self.records[g].get("PRDN_STDO_NM") or "").strip() for g in cand_ids]
-            studios = [s for s in studios if s]
-            cnt = Counter(studios)
-            ranked = sorted(cnt.items(), key=lambda x: (-x[1], x[0]))[:max(1, top_studio_k)]
-            cand_size = len(cand_ids) or 1
-            extra["studio_stats"] = [
-                {"name": name, "count": c, "ratio": c / cand_size} for name, c in ranked
-            ]
+    def _studio_stats(
+        self,
+        cand_ids: np.ndarray,
+        final_scores: np.ndarray,
+        top_studio_k: int,
+        score_weighted: bool = False,
+    ) -> List[Dict]:
+        """
+        후보의 스튜디오 id 를 np.bincount 로 집계해 상위 K 스튜디오 반환 (이름은 반환 대상만 조회).
+        - 기본: 후보 수 내림차순, 동점은 이름 오름차순 (id 가 이름 순이므로 id 오름차순과 동일)
+        - score_weighted: 최종 점수(음수는 0) 합 기준으로 순위 산정, score 필드에 합계 포함
+        """
+        sids = self.studio_ids[cand_ids]
+        valid = sids >= 0
+        if not valid.any():
+            return []
+        sids = sids[valid]
+        counts = np.bincount(sids)
+        present = np.flatnonzero(counts)
 
-        return results, extra
+        if score_weighted:
+            sums = np.bincount(sids, weights=np.maximum(final_scores[valid], 0.0))
+            order = present[np.lexsort((present, -sums[present]))]
+        else:
+            sums = None
+            order = present[np.lexsort((present, -counts[present]))]
 
-    # ---------- MMR용 평균 임베딩 ----------
-    def _avg_sbert_emb_subset(self, cand_ids: List[int]) -> np.ndarray:
-        mats = [
-            self.embeddings["full"][cand_ids],
-            self.embeddings["desc"][cand_ids],
-            self.embeddings["how"][cand_ids],
-            self.embeddings["style"][cand_ids],
-        ]
-        avg = np.mean(mats, axis=0)
-        avg /= (np.linalg.norm(avg, axis=1, keepdims=True) + 1e-8)
-        return avg
+        cand_size = len(cand_ids) or 1
+        stats = []
+        for sid in order[:max(1, top_studio_k)]:
+            stat = {"name": self.studio_names[sid], "count": int(counts[sid]), "ratio": float(counts[sid] / cand_size)}
+            if sums is not None:
+                stat["score"] = float(sums[sid])
+            stats.append(stat)
+        return stats
 
     def corpus_size(self) -> int:
+        if self.fused_index is None:
+            return self._ntotal
         return int(self.fused_index.ntotal)
 
 
-search_service_singleton = SearchServiceV3()
\ No newline at end of file
+# 싱글톤 (첫 사용 또는 lifespan warm-up 시 생성)
+_search_service = LazySingleton(SearchServiceV3)
+
+
+_reload_lock = threading.Lock()
+
+
+def get_search_service() -> SearchServiceV3:
+    return _search_service.get()
+
+
+def reload_search_service() -> str:
+    """
+    재색인된 artifacts 를 모델 재로딩 없이 새 인스턴스로 읽은 뒤 싱글톤을 한 번에 교체. 새 artifact 버전을 반환.
+    - 요청은 시작 시 꺼낸 인스턴스 하나만 쓰므로 새 인덱스와 이전 레코드가 섞이지 않고,
+      응답 캐시 key 의 버전도 결과를 계산한 인스턴스의 것과 같음
+    - 이전 버전으로 만든 커서는 버전 불일치로 만료(410) 처리
+    """
+    with _reload_lock:
+        start = time.perf_counter()
+        current = _search_service.get()
+        fresh = SearchServiceV3(previous=current)
+        _search_service.replace(fresh)
+        logger.info(f"[SearchServiceV3] artifacts 다시 로드: {current.artifact_version} → {fresh.artifact_version} "
+                    f"({time.perf_counter() - start:.2f}s)")
+        return fresh.artifact_version
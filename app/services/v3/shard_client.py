@@ -0,0 +1,81 @@
+# SPDX-License-Identifier: Apache-2.0
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+from app.schemas.v3.search_dto import SearchDTOV3
+from app.services.v3.fused_shard import CandidateSet, encode_array
+from app.utils.log_utils import get_logger
+
+logger = get_logger("ShardClientV3")
+
+
+class ShardedFusedIndex:
+    """
+    샤드 서버(python -m app.shard_server)들에 fused 검색을 동시에 보내고(scatter)
+    샤드별 top-M 을 전역 top-M 으로 병합(gather)한다. FusedShard.search 와 같은 인터페이스.
+    """
+
+    def __init__(self, urls: List[str], timeout_sec: float = 2.0):
+        if not urls:
+            raise ValueError("샤드 서버 URL 이 비어 있습니다 (V3_SHARD_URLS)")
+        self.urls = [u.rstrip("/") for u in urls]
+        self._client = httpx.Client(
+            timeout=timeout_sec,
+            limits=httpx.Limits(max_connections=len(self.urls) * 16, max_keepalive_connections=len(self.urls) * 16),
+        )
+        self._pool = ThreadPoolExecutor(max_workers=len(self.urls) * 4, thread_name_prefix="shard-fanout")
+
+    def health(self) -> List[Dict]:
+        return [self._client.get(f"{url}/health").json() for url in self.urls]
+
+    def ntotal(self) -> int:
+        return sum(int(h["ntotal"]) for h in self.health())
+
+    def _search_one(self, url: str, body: Dict) -> CandidateSet:
+        resp = self._client.post(f"{url}/search", json=body)
+        resp.raise_for_status()
+        return CandidateSet.from_payload(resp.json())
+
+    def search(
+        self,
+        q_fused: np.ndarray,
+        q_fac: Dict[str, np.ndarray],
+        M: int,
+        with_mmr: bool = False,
+        filters: Optional[SearchDTOV3.SearchFilters] = None,
+    ) -> CandidateSet:
+        body = {
+            "q_fused": encode_array(q_fused.astype(np.float32)),
+            "q_fac": {f: encode_array(v.astype(np.float32)) for f, v in q_fac.items()},
+            "M": int(M),
+            "with_mmr": bool(with_mmr),
+            # 필터는 샤드마다 자기 컬럼으로 적용하므로 조건만 전달
+            "filters": filters.model_dump() if filters is not None else None,
+        }
+        futures = {url: self._pool.submit(self._search_one, url, body) for url in self.urls}
+        parts = []
+        for url, fut in futures.items():
+            try:
+                parts.append(fut.result())
+            except Exception as e:
+                # 일부 샤드만으로 순위를 내면 결과가 조용히 틀어지므로 요청 전체를 실패 처리
+                logger.error(f"[Shard] {url} 검색 실패: {e}")
+                raise RuntimeError(f"샤드 검색 실패: {url}") from e
+        return CandidateSet.merge(parts, M)
+
+    def search_many(
+        self,
+        q_fused: np.ndarray,
+        q_facs: List[Dict[str, np.ndarray]],
+        Ms: List[int],
+        with_mmr: List[bool],
+        filters: List[Optional[SearchDTOV3.SearchFilters]],
+    ) -> List[CandidateSet]:
+        # 샤드 서버 API 는 질의 1개 단위 → 질의별 scatter/gather (FusedShard.search_many 와 같은 인터페이스)
+        return [
+            self.search(q_fused[i:i + 1], q_facs[i], Ms[i], with_mmr=with_mmr[i], filters=filters[i])
+            for i in range(len(q_facs))
+        ]
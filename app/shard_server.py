@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: Apache-2.0
+import argparse
+import json
+import os
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.core.config import ModelConfig
+from app.schemas.v3.search_dto import SearchDTOV3
+from app.services.v3.fused_shard import FusedShard, decode_array, load_shard_manifest
+from app.utils.log_utils import get_logger
+
+logger = get_logger("ShardServerV3")
+
+
+def make_handler(shard: FusedShard, shard_no: int, version: str):
+    class ShardHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive (API 쪽 httpx 커넥션 재사용)
+
+        def _send_json(self, status: int, obj) -> None:
+            body = json.dumps(obj).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"shard": shard_no, "ntotal": shard.ntotal, "version": version})
+            else:
+                self._send_json(404, {"detail": "not found"})
+
+        def do_POST(self):
+            if self.path != "/search":
+                self._send_json(404, {"detail": "not found"})
+                return
+            try:
+                req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                cands = shard.search(
+                    decode_array(req["q_fused"]),
+                    {f: decode_array(v) for f, v in req["q_fac"].items()},
+                    int(req["M"]),
+                    with_mmr=bool(req.get("with_mmr")),
+                    filters=SearchDTOV3.SearchFilters(**req["filters"]) if req.get("filters") else None,
+                )
+                self._send_json(200, cands.to_payload())
+            except Exception as e:
+                logger.error(f"[Shard {shard_no}] 검색 실패: {e}")
+                self._send_json(500, {"detail": str(e)})
+
+        def log_message(self, fmt, *args):
+            pass  # 요청마다 stderr 로 찍히는 기본 access 로그 비활성화
+
+    return ShardHandler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="v3 fused 인덱스 샤드 서버")
+    parser.add_argument("--shard", type=int, required=True, help="샤드 번호 (manifest 의 shards 순서)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--shards-dir", default=f"{ModelConfig.ARTIFACTS_ROOT}/v3/{ModelConfig.EMBEDDING_MODEL}/shards")
+    cli = parser.parse_args()
+
+    manifest = load_shard_manifest(cli.shards_dir)
+    shard_info = manifest["shards"][cli.shard]
+    shard = FusedShard.load(os.path.join(cli.shards_dir, shard_info["dir"]))
+    logger.info(f"[Shard {cli.shard}] 로드 완료: ntotal={shard.ntotal} version={manifest['version']}")
+
+    server = ThreadingHTTPServer((cli.host, cli.port), make_handler(shard, cli.shard, manifest["version"]))
+    logger.info(f"[Shard {cli.shard}] http://{cli.host}:{cli.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
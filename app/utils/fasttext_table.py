@@ -0,0 +1,151 @@
+# SPDX-License-Identifier: Apache-2.0
+import json
+import os
+from typing import Dict, List
+
+import numpy as np
+
+from app.core.config import ModelConfig
+from app.utils.log_utils import get_logger
+
+logger = get_logger("FastTextTable")
+
+BOW, EOW = "<", ">"
+
+
+def fasttext_hash(s: str) -> int:
+    """
+    fastText 의 FNV-1a 해시 (Dictionary::hash 와 동일, 바이트를 int8 로 부호 확장하는 특성 포함)
+    """
+    h = 2166136261
+    for b in s.encode("utf-8"):
+        h ^= (b - 256 if b > 127 else b) & 0xFFFFFFFF
+        h = (h * 16777619) & 0xFFFFFFFF
+    return h
+
+
+def compute_subword_buckets(word: str, minn: int, maxn: int, bucket: int) -> List[int]:
+    """
+    fastText Dictionary::computeSubwords 와 동일한 규칙으로 "<word>" 의 문자 n-gram 버킷 번호 목록 반환.
+    (입력 행렬 기준 행 번호 = nwords + bucket 번호)
+    """
+    if bucket <= 0 or maxn <= 0:
+        return []
+    chars = list(BOW + word + EOW)
+    buckets = []
+    for i in range(len(chars)):
+        for n in range(1, maxn + 1):
+            if i + n > len(chars):
+                break
+            if n >= minn and not (n == 1 and (i == 0 or i + n == len(chars))):
+                buckets.append(fasttext_hash("".join(chars[i:i + n])) % bucket)
+    return buckets
+
+
+class CompactFastText:
+    """
+    export_fasttext_table 로 추출한 경량 fastText 벡터 테이블.
+
+    - 단어 → 벡터: 추출 시점에 fastText get_word_vector 결과를 그대로 저장 (memory-mapped)
+    - OOV: 저장된 subword n-gram 버킷 벡터의 평균 (fastText 와 같은 해시 규칙, 테이블에 없는 n-gram 은 제외)
+    - fastText 모델과 동일한 get_dimension()/get_word_vector() 인터페이스 제공
+    """
+
+    META_FILE = "meta.json"
+    WORDS_FILE = "words.json"
+    WORD_VECTORS_FILE = "word_vectors.npy"
+    NGRAM_BUCKETS_FILE = "ngram_buckets.npy"
+    NGRAM_VECTORS_FILE = "ngram_vectors.npy"
+
+    def __init__(
+        self,
+        words: List[str],
+        word_vectors: np.ndarray,
+        ngram_buckets: np.ndarray,
+        ngram_vectors: np.ndarray,
+        minn: int,
+        maxn: int,
+        bucket: int,
+    ):
+        self.word_to_id: Dict[str, int] = {w: i for i, w in enumerate(words)}
+        self.word_vectors = word_vectors        # (n_words, d)
+        self.ngram_buckets = ngram_buckets      # (n_ngrams,) 오름차순 정렬된 버킷 번호
+        self.ngram_vectors = ngram_vectors      # (n_ngrams, d)
+        self.minn, self.maxn, self.bucket = int(minn), int(maxn), int(bucket)
+        self._dim = int(word_vectors.shape[1])
+
+    # ---------- 저장/로드 ----------
+    @classmethod
+    def load(cls, table_dir: str, mmap: bool = True) -> "CompactFastText":
+        mmap_mode = "r" if mmap else None
+        with open(os.path.join(table_dir, cls.META_FILE), "r", encoding="utf-8") as fp:
+            meta = json.load(fp)
+        with open(os.path.join(table_dir, cls.WORDS_FILE), "r", encoding="utf-8") as fp:
+            words = json.load(fp)
+        return cls(
+            words=words,
+            word_vectors=np.load(os.path.join(table_dir, cls.WORD_VECTORS_FILE), mmap_mode=mmap_mode),
+            ngram_buckets=np.load(os.path.join(table_dir, cls.NGRAM_BUCKETS_FILE), mmap_mode=mmap_mode),
+            ngram_vectors=np.load(os.path.join(table_dir, cls.NGRAM_VECTORS_FILE), mmap_mode=mmap_mode),
+            minn=meta["minn"],
+            maxn=meta["maxn"],
+            bucket=meta["bucket"],
+        )
+
+    @classmethod
+    def save(
+        cls,
+        table_dir: str,
+        words: List[str],
+        word_vectors: np.ndarray,
+        ngram_buckets: np.ndarray,
+        ngram_vectors: np.ndarray,
+        meta: Dict,
+    ) -> None:
+        os.makedirs(table_dir, exist_ok=True)
+        order = np.argsort(ngram_buckets, kind="stable")
+        np.save(os.path.join(table_dir, cls.WORD_VECTORS_FILE), np.ascontiguousarray(word_vectors))
+        np.save(os.path.join(table_dir, cls.NGRAM_BUCKETS_FILE), np.ascontiguousarray(ngram_buckets[order], dtype=np.int64))
+        np.save(os.path.join(table_dir, cls.NGRAM_VECTORS_FILE), np.ascontiguousarray(ngram_vectors[order]))
+        with open(os.path.join(table_dir, cls.WORDS_FILE), "w", encoding="utf-8") as fp:
+            json.dump(words, fp, ensure_ascii=False)
+        with open(os.path.join(table_dir, cls.META_FILE), "w", encoding="utf-8") as fp:
+            json.dump(meta, fp, ensure_ascii=False, indent=2)
+
+    # ---------- fastText 호환 인터페이스 ----------
+    def get_dimension(self) -> int:
+        return self._dim
+
+    def get_word_vector(self, word: str) -> np.ndarray:
+        wid = self.word_to_id.get(word)
+        if wid is not None:
+            return np.asarray(self.word_vectors[wid], dtype=np.float32)
+        return self._oov_vector(word)
+
+    def _oov_vector(self, word: str) -> np.ndarray:
+        buckets = np.asarray(compute_subword_buckets(word, self.minn, self.maxn, self.bucket), dtype=np.int64)
+        if buckets.size == 0 or self.ngram_buckets.size == 0:
+            return np.zeros(self._dim, dtype=np.float32)
+
+        pos = np.searchsorted(self.ngram_buckets, buckets)
+        pos = np.minimum(pos, self.ngram_buckets.size - 1)
+        found = pos[self.ngram_buckets[pos] == buckets]
+        if found.size == 0:
+            return np.zeros(self._dim, dtype=np.float32)
+        return np.asarray(self.ngram_vectors[found], dtype=np.float32).mean(axis=0)
+
+
+def load_word_embedding_model():
+    """
+    `what` factor 용 단어 임베딩 모델 로더.
+    - WORD_EMBEDDING_TABLE_DIR 에 경량 테이블이 있으면 CompactFastText (mmap)
+    - 없으면 기존처럼 전체 fastText .bin 로드
+    """
+    table_dir = ModelConfig.WORD_EMBEDDING_TABLE_DIR
+    if table_dir and os.path.exists(os.path.join(table_dir, CompactFastText.META_FILE)):
+        logger.info(f"[FastTextTable] 경량 테이블 사용: {table_dir}")
+        return CompactFastText.load(table_dir)
+
+    import fasttext
+    logger.info(f"[FastTextTable] 경량 테이블 없음 → 전체 모델 로드: {ModelConfig.WORD_EMBEDDING_MODEL_PATH}")
+    return fasttext.load_model(ModelConfig.WORD_EMBEDDING_MODEL_PATH)
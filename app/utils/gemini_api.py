@@ -8,6 +8,7 @@ from google import genai
 from google.genai import types
 
 from app.core.config import ModelConfig
+from app.utils.metrics import record_llm_usage
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +53,12 @@ class GeminiClient:
                 contents=user_prompt,
             )
             self.request_count += 1  # 호출 성공 시 count 증가
+            usage = getattr(response, "usage_metadata", None)
+            record_llm_usage(
+                "gemini",
+                getattr(usage, "prompt_token_count", None),
+                getattr(usage, "candidates_token_count", None),
+            )
             return response.text.strip()
         except Exception as e:
             logger.error(f"[GeminiClient] Gemini API 호출 실패: {e}")
@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: Apache-2.0
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LazySingleton(Generic[T]):
+    """
+    첫 사용 시점에 1회만 생성되는 싱글톤 holder (스레드 안전).
+    - import 시점에는 아무것도 로드하지 않음 → 서버 기동 속도 확보
+    - FastAPI lifespan 에서 get() 을 호출해 미리 로드(warm-up)할 수도 있음
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def is_loaded(self) -> bool:
+        return self._instance is not None
+
+    def replace(self, instance: T) -> None:
+        """
+        보관 중인 인스턴스를 새 인스턴스로 교체 (참조 1회 대입 — 이미 꺼내 간 호출자는 이전 인스턴스를 계속 사용)
+        """
+        with self._lock:
+            self._instance = instance
+
+    def reset(self) -> None:
+        """
+        보관 중인 인스턴스를 버림 (다음 get() 에서 다시 생성)
+        """
+        with self._lock:
+            self._instance = None
@@ -1,11 +1,163 @@
 # SPDX-License-Identifier: Apache-2.0
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import random
 import sys
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+from app.core.config import LogConfig
+from app.utils.request_context import get_request_id
+
+TEXT_FORMAT = "[%(name)s] [%(asctime)s] [%(levelname)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# LogRecord 기본 속성 (이 외의 속성은 logger.info(..., extra={...}) 로 넘긴 구조화 필드)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+_EXC_FORMATTER = logging.Formatter()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    한 줄에 JSON 객체 하나 (ts, level, logger, message, request_id, extra 필드, exc)
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            payload["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _RequestIdFilter(logging.Filter):
+    # 호출한 스레드에서 실행되므로 contextvar 의 요청 id 를 레코드에 고정한 뒤 큐로 넘김
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = get_request_id()
+        return True
+
+
+def _dropped_record(n: int) -> logging.LogRecord:
+    return logging.makeLogRecord({
+        "name": "ragvertise", "levelno": logging.WARNING, "levelname": "WARNING",
+        "msg": f"[Log] 큐가 가득 차 버린 로그 {n}건",
+    })
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    큐가 가득 차면 기다리지 않고 버림 (요청 스레드가 로그 때문에 막히지 않도록). 버린 개수는 다음 기록 때 경고로 남김
+    """
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지/예외는 호출 스레드에서 문자열로 고정하고, 포맷(text/json)은 writer 의 formatter 가 담당
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped:
+            n, self.dropped = self.dropped, 0
+            try:
+                self.queue.put_nowait(_dropped_record(n))
+            except queue.Full:
+                self.dropped += n
+
+
+class _LogPipeline:
+    """
+    모든 서비스 로거가 공유하는 출력 경로.
+    - LOG_ASYNC=true: 호출 스레드는 큐에 넣기만 하고, 백그라운드 QueueListener 가 stdout 에 기록
+    - LOG_ASYNC=false: 기존처럼 호출 스레드에서 바로 stdout 에 기록
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.output = logging.StreamHandler(sys.stdout)
+        if LogConfig.LOG_FORMAT == "json":
+            self.output.setFormatter(JsonFormatter())
+        else:
+            self.output.setFormatter(logging.Formatter(TEXT_FORMAT, DATE_FORMAT))
+
+        self.listener = None
+        if LogConfig.LOG_ASYNC:
+            self.handler = _DroppingQueueHandler(queue.Queue(maxsize=LogConfig.LOG_QUEUE_SIZE))
+            self._start_listener()
+            atexit.register(self.stop)
+            # prefork 워커에는 writer 스레드가 복제되지 않으므로 fork 후 자식에서 새 큐/writer 시작
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+        else:
+            self.handler = self.output
+        self.handler.addFilter(_RequestIdFilter())
+
+    def _start_listener(self) -> None:
+        self.listener = QueueListener(self.handler.queue, self.output, respect_handler_level=True)
+        self.listener.start()
+
+    def _after_fork_in_child(self) -> None:
+        self.handler.queue = queue.Queue(maxsize=LogConfig.LOG_QUEUE_SIZE)
+        self.handler.dropped = 0
+        self._start_listener()
+
+    def stop(self) -> None:
+        """
+        남은 로그를 모두 기록하고 writer 종료 (프로세스 종료 시 자동 호출)
+        """
+        with self._lock:
+            if self.listener is not None:
+                self.listener.stop()
+                self.listener = None
+            dropped = getattr(self.handler, "dropped", 0)
+            if dropped:
+                self.output.handle(_dropped_record(dropped))
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def _get_pipeline() -> _LogPipeline:
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                _pipeline = _LogPipeline()
+    return _pipeline
 
 
 def get_logger(service_name: str = "ragvertise", level: int = logging.INFO) -> logging.Logger:
     """
     서비스 이름별로 구분되는 표준 로거를 반환한다.
+    모든 로거는 공유 출력 경로(기본: 큐 + 백그라운드 writer)를 사용하며, LOG_FORMAT=json 이면 요청 id 를 포함한 JSON 한 줄로 기록한다.
 
     :param service_name: 서비스 이름
     :param level: 로깅 레벨
@@ -16,17 +168,20 @@ def get_logger(service_name: str = "ragvertise", level: int = logging.INFO) -> l
         return logger
 
     logger.setLevel(level)
+    logger.addHandler(_get_pipeline().handler)
+    return logger
 
-    handler = logging.StreamHandler(sys.stdout)
-    formatter = logging.Formatter(
-        f"[{service_name}] [%(asctime)s] [%(levelname)s] %(message)s", "%Y-%m-%d %H:%M:%S"
-    )
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-
-    # 필요하다면, 파일 핸들러도 추가할 수 있음
-    # file_handler = logging.FileHandler(f'logs/{service_name}.log')
-    # file_handler.setFormatter(formatter)
-    # logger.addHandler(file_handler)
 
-    return logger
\ No newline at end of file
+def log_payload(logger: logging.Logger, message: str, payload, level: int = logging.INFO) -> None:
+    """
+    LLM 원문 응답처럼 크고 자주 남는 payload 로그.
+    LOG_PAYLOAD_SAMPLE_RATE 확률로만 기록하고, LOG_PAYLOAD_MAX_CHARS 를 넘는 부분은 잘라냄.
+    """
+    rate = LogConfig.LOG_PAYLOAD_SAMPLE_RATE
+    if rate <= 0 or not logger.isEnabledFor(level) or (rate < 1 and random.random() >= rate):
+        return
+    text = str(payload)
+    limit = LogConfig.LOG_PAYLOAD_MAX_CHARS
+    if 0 < limit < len(text):
+        text = f"{text[:limit]}...(+{len(text) - limit} chars)"
+    logger.log(level, f"{message}{text}")
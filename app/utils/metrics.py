@@ -0,0 +1,249 @@
+# SPDX-License-Identifier: Apache-2.0
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import MetricsConfig
+from app.utils.log_utils import get_logger
+
+logger = get_logger("Metrics")
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """
+    Prometheus 누적 버킷 히스토그램 (라벨 조합별 버킷 카운트 / 합계 / 개수)
+    """
+
+    def __init__(self, name: str, help_text: str, buckets: List[float]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = sorted(buckets)
+        self.series: Dict[LabelKey, List] = {}  # labels -> [버킷별 개수(+Inf 포함), 합계, 개수]
+
+    def observe(self, labels: LabelKey, value: float) -> None:
+        s = self.series.get(labels)
+        if s is None:
+            s = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        s[0][bisect.bisect_left(self.buckets, value)] += 1
+        s[1] += value
+        s[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, n) in sorted(self.series.items()):
+            cum = 0
+            for le, c in zip(self.buckets + [float("inf")], counts):
+                cum += c
+                le_str = "+Inf" if le == float("inf") else f"{le:g}"
+                lines.append(f"{self.name}_bucket{_fmt_labels(labels + (('le', le_str),))} {cum}")
+            lines.append(f"{self.name}_sum{_fmt_labels(labels)} {total:.6f}")
+            lines.append(f"{self.name}_count{_fmt_labels(labels)} {n}")
+        return lines
+
+
+class _Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.series: Dict[LabelKey, float] = {}
+
+    def inc(self, labels: LabelKey, value: float) -> None:
+        self.series[labels] = self.series.get(labels, 0.0) + value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, v in sorted(self.series.items()):
+            lines.append(f"{self.name}{_fmt_labels(labels)} {_fmt_value(v)}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    프로세스 단위 메트릭 저장소 (외부 의존성 없이 Prometheus text format 0.0.4 로 출력).
+    prefork 서버에서는 워커마다 별도 저장소를 가짐 (스크랩은 요청을 받은 워커의 값).
+    """
+
+    def __init__(self, buckets_sec: List[float]):
+        self._lock = threading.Lock()
+        self.stage_seconds = _Histogram(
+            "ragvertise_stage_duration_seconds", "Duration of instrumented request stages.", buckets_sec
+        )
+        self.request_seconds = _Histogram(
+            "ragvertise_http_request_duration_seconds", "HTTP request duration by route and status.", buckets_sec
+        )
+        self.llm_tokens = _Counter("ragvertise_llm_tokens_total", "LLM tokens by provider and kind (prompt/completion).")
+        self.llm_calls = _Counter("ragvertise_llm_calls_total", "LLM calls by provider and outcome.")
+        self.llm_retries = _Counter("ragvertise_llm_retries_total", "LLM extraction retries by provider.")
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stage_seconds.observe((("stage", stage),), seconds)
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self.request_seconds.observe((("method", method), ("route", route), ("status", str(status))), seconds)
+
+    def inc(self, counter: _Counter, labels: LabelKey, value: float = 1.0) -> None:
+        with self._lock:
+            counter.inc(labels, value)
+
+    def render(self) -> str:
+        with self._lock:
+            lines: List[str] = []
+            for metric in (self.stage_seconds, self.request_seconds, self.llm_tokens, self.llm_calls, self.llm_retries):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry([ms / 1000.0 for ms in MetricsConfig.LATENCY_BUCKETS_MS])
+
+
+# ---------- 요청 단위 수집 (Server-Timing) ----------
+class RequestTimings:
+    """
+    한 요청 동안의 단계별 소요 시간(ms, 같은 이름은 합산)과 부가 값(토큰 수/재시도 수 등).
+    contextvar 로 전달되며, threadpool 로 넘어간 서비스 코드에서도 같은 객체에 기록됨.
+    """
+
+    __slots__ = ("durations", "annotations")
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.annotations: Dict[str, float] = {}
+
+    def add(self, name: str, ms: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + ms
+
+    def annotate(self, name: str, value: float) -> None:
+        self.annotations[name] = self.annotations.get(name, 0) + value
+
+    def server_timing(self, total_ms: Optional[float] = None) -> str:
+        parts = [f"{name};dur={ms:.1f}" for name, ms in self.durations.items()]
+        parts.extend(f'{name};desc="{value:g}"' for name, value in self.annotations.items())
+        if total_ms is not None:
+            parts.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def begin_request() -> Tuple[RequestTimings, object]:
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def end_request(token) -> None:
+    _current.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+# ---------- OpenTelemetry (선택) ----------
+_tracer = None
+_tracer_checked = False
+
+
+def _get_tracer():
+    """
+    OTEL_TRACES_ENABLED=true 이고 opentelemetry-api 가 설치된 경우에만 tracer 반환 (exporter 설정은 OTel SDK/환경변수 몫)
+    """
+    global _tracer, _tracer_checked
+    if _tracer_checked:
+        return _tracer
+    _tracer_checked = True
+    if not MetricsConfig.OTEL_TRACES_ENABLED:
+        return None
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        logger.warning("[Metrics] OTEL_TRACES_ENABLED=true 이지만 opentelemetry-api 가 없어 trace 를 건너뜁니다")
+        return None
+    _tracer = trace.get_tracer("ragvertise")
+    return _tracer
+
+
+# ---------- 퍼블릭 API ----------
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """
+    단계 소요 시간을 /metrics 히스토그램, 요청의 Server-Timing, (설정 시) OTel span 에 기록
+    """
+    if not MetricsConfig.METRICS_ENABLED:
+        yield
+        return
+    tracer = _get_tracer()
+    otel_cm = tracer.start_as_current_span(name) if tracer is not None else None
+    if otel_cm is not None:
+        otel_cm.__enter__()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe_stage(name, elapsed)
+        timings = _current.get()
+        if timings is not None:
+            timings.add(name, elapsed * 1000.0)
+        if otel_cm is not None:
+            otel_cm.__exit__(None, None, None)
+
+
+def annotate(name: str, value: float) -> None:
+    """
+    요청 단위 부가 값(토큰 수/재시도 수 등)을 Server-Timing 과 현재 OTel span 속성에 추가
+    """
+    timings = _current.get()
+    if timings is not None:
+        timings.annotate(name, value)
+    if _get_tracer() is not None:
+        from opentelemetry import trace
+        trace.get_current_span().set_attribute(f"ragvertise.{name}", value)
+
+
+def record_llm_call(provider: str, outcome: str) -> None:
+    if MetricsConfig.METRICS_ENABLED:
+        registry.inc(registry.llm_calls, (("provider", provider), ("outcome", outcome)))
+
+
+def record_llm_retry(provider: str) -> None:
+    if MetricsConfig.METRICS_ENABLED:
+        registry.inc(registry.llm_retries, (("provider", provider),))
+    annotate("llm_retries", 1)
+
+
+def record_llm_usage(provider: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """
+    LLM 클라이언트가 응답의 토큰 사용량을 보고 (provider 가 값을 주지 않으면 None → 생략)
+    """
+    for kind, value in (("prompt", prompt_tokens), ("completion", completion_tokens)):
+        if value is None:
+            continue
+        if MetricsConfig.METRICS_ENABLED:
+            registry.inc(registry.llm_tokens, (("provider", provider), ("kind", kind)), float(value))
+        annotate(f"llm_tokens_{kind}", value)
+
+
+def render_prometheus() -> str:
+    return registry.render()
@@ -63,4 +63,39 @@ def mmr_rerank(
         selected.append(best_idx)
         candidate_indices.remove(best_idx)
 
-    return selected
\ No newline at end of file
+    return selected
+
+class MMRSelector:
+    """
+    이어서 선택할 수 있는 MMR (mmr_rerank 와 같은 선택 규칙: 첫 항목은 relevance 최댓값, 이후 MMR 점수 최댓값, 동점은 앞 인덱스).
+    - 이미 선택된 항목(selected)으로 시작할 수 있고, 후보별 "선택된 것들과의 최대 유사도" 를 유지하므로
+      next(n) 은 항목 1개당 행렬-벡터 곱 1번으로 다음 n개를 고름 (페이지 이어보기용)
+    """
+
+    def __init__(self, embeddings: np.ndarray, scores: np.ndarray, lambda_param: float = 0.5, selected=None):
+        emb = np.asarray(embeddings, dtype=np.float32)
+        self.embeddings = emb / (np.linalg.norm(emb, axis=1, keepdims=True) + 1e-10)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self.lambda_param = float(lambda_param)
+        self.remaining = np.ones(self.scores.shape[0], dtype=bool)
+        self.max_sim = np.full(self.scores.shape[0], -np.inf, dtype=np.float32)
+        self.selected: List[int] = []
+        for i in selected if selected is not None else []:
+            self._add(int(i))
+
+    def _add(self, i: int) -> None:
+        self.selected.append(i)
+        self.remaining[i] = False
+        np.maximum(self.max_sim, self.embeddings @ self.embeddings[i], out=self.max_sim)
+
+    def next(self, n: int) -> List[int]:
+        picked: List[int] = []
+        while len(picked) < n and self.remaining.any():
+            if self.selected:
+                mmr = self.lambda_param * self.scores - (1 - self.lambda_param) * self.max_sim
+            else:
+                mmr = self.scores
+            i = int(np.argmax(np.where(self.remaining, mmr, -np.inf)))
+            self._add(i)
+            picked.append(i)
+        return picked
@@ -2,6 +2,7 @@
 import logging
 import ollama
 from app.core.config import ModelConfig
+from app.utils.metrics import record_llm_usage
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +30,8 @@ class OllamaClient:
             logger.debug(f"[OllamaClient] 모델={self.model}, messages={messages}")
 
             resp = ollama.chat(model=self.model, messages=messages)
+            # 토큰 수: prompt_eval_count(입력) / eval_count(출력)
+            record_llm_usage("ollama", resp.get("prompt_eval_count"), resp.get("eval_count"))
 
             return resp["message"]["content"].strip()
         except Exception as e:
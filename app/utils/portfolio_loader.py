@@ -0,0 +1,53 @@
+# SPDX-License-Identifier: Apache-2.0
+from itertools import groupby
+from typing import Dict, Iterator, List, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+DEFAULT_PAGE_SIZE = 500  # 한 번에 읽는 포트폴리오 수
+
+
+def iter_grouped_portfolios(
+    db: Session,
+    model,
+    columns: Sequence[str],
+    sort_tags: bool = False,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Iterator[Dict]:
+    """
+    (포트폴리오, 태그) 행 테이블을 PTFO_SEQNO 순으로 페이지 단위로 읽어 포트폴리오 dict 를 하나씩 yield.
+
+    - 필요한 컬럼(columns + TAG_NM)만 SELECT (ORM 객체 생성 없음)
+    - PTFO_SEQNO keyset 페이지네이션: 다음 page_size 개 포트폴리오 id → 해당 행만 조회
+      (서버 사이드 커서를 빌드 내내 열어 두면 LLM 호출로 소비가 느릴 때 net_write_timeout 으로 끊기므로 짧은 쿼리 반복)
+    - 메모리는 카탈로그 크기가 아니라 page_size 에 비례, 첫 페이지가 오면 바로 추출을 시작할 수 있음
+    - sort_tags=True 면 태그 중복 제거 + 정렬, 아니면 TAG_SEQNO 순
+    """
+    seq_col = getattr(model, "PTFO_SEQNO")
+    select_cols = [getattr(model, c) for c in columns] + [model.TAG_NM]
+    tag_order = model.TAG_NM if sort_tags else model.TAG_SEQNO
+    last = None
+
+    while True:
+        id_query = select(seq_col).distinct().order_by(seq_col).limit(page_size)
+        if last is not None:
+            id_query = id_query.where(seq_col > last)
+        ids: List[int] = list(db.execute(id_query).scalars())
+        if not ids:
+            return
+
+        rows = db.execute(
+            select(*select_cols).where(seq_col.in_(ids)).order_by(seq_col, tag_order)
+        ).all()
+        for _, group in groupby(rows, key=lambda r: r[0]):
+            group = list(group)
+            data = dict(zip(columns, group[0][:len(columns)]))
+            tags = [r[-1] for r in group if r[-1]]
+            data["tags"] = sorted(set(tags)) if sort_tags else tags
+            yield data
+        last = ids[-1]
+
+
+def count_portfolios(db: Session, model) -> int:
+    return int(db.execute(select(func.count(func.distinct(model.PTFO_SEQNO)))).scalar() or 0)
@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: Apache-2.0
+import re
+from datetime import date
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# PRDN_COST / PRDN_PERD 는 자유 입력 문자열(String(30)/String(50))이라 인덱스 생성 시 1회 숫자 범위로 변환해 둔다.
+#   "500만원" → (5e6, 5e6), "3천5백만원" → (3.5e7, 3.5e7), "1억 5천만원" → (1.5e8, 1.5e8), "300~500만원" → (3e6, 5e6)
+#   "2주" → (14, 14), "1~2개월" → (30, 60), "2024.01.01~2024.02.01" → (31, 31)
+
+# 제작비: 한국어 수 읽기처럼 천/백/십 항을 묶은 뒤 다음 만/억/조 단위를 곱함 ("3천5백만" = (3000 + 500) × 1만)
+COST_GROUP_UNITS: Dict[str, float] = {"천": 1e3, "백": 1e2, "십": 1e1}
+COST_BIG_UNITS: Dict[str, float] = {"조": 1e12, "억": 1e8, "만": 1e4}
+PERIOD_UNITS: Dict[str, float] = {
+    "일": 1, "day": 1, "days": 1,
+    "주": 7, "week": 7, "weeks": 7,
+    "개월": 30, "달": 30, "month": 30, "months": 30,
+    "년": 365, "year": 365, "years": 365,
+}
+
+# "-" 는 날짜("2024-01-01")에도 쓰이므로 날짜 범위를 먼저 처리한 뒤 구분자로 사용
+RANGE_SEP_RE = re.compile(r"\s*[~〜∼\-–]\s*")
+DATE_RE = re.compile(r"(\d{4})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})")
+
+COST_TOKEN_RE = re.compile(r"(\d+(?:\.\d+)?)|({})".format("|".join(list(COST_GROUP_UNITS) + list(COST_BIG_UNITS))))
+PERIOD_AMOUNT_RE = re.compile(
+    r"(\d+(?:\.\d+)?)\s*({})?".format("|".join(sorted(PERIOD_UNITS, key=len, reverse=True))),  # 긴 단위 우선
+    re.IGNORECASE,
+)
+
+# 범위 한쪽 파싱 결과: (값, 범위 앞쪽에 적용할 단위 배수 — 단위가 없으면 None)
+PartParser = Callable[[str], Tuple[Optional[float], Optional[float]]]
+
+
+def _parse_cost_part(text: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    제작비 한쪽 값 → (원 단위 값, 마지막 만/억/조 단위 배수). 숫자나 천/백/십 단위가 없으면 값은 None.
+    """
+    total = group = 0.0
+    pending: Optional[float] = None
+    found, big_mult = False, None
+    for num, unit in COST_TOKEN_RE.findall(text):
+        if num:
+            group += pending or 0.0
+            pending, found = float(num), True
+        elif unit in COST_GROUP_UNITS:
+            group += (1.0 if pending is None else pending) * COST_GROUP_UNITS[unit]
+            pending, found = None, True
+        else:
+            group += pending or 0.0
+            total += (group or 1.0) * COST_BIG_UNITS[unit]
+            group, pending, big_mult = 0.0, None, COST_BIG_UNITS[unit]
+    if not found:
+        return None, None
+    return total + group + (pending or 0.0), big_mult
+
+
+def _parse_period_part(text: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    제작기간 한쪽 값 → (일 단위 값, 마지막 단위 배수). "1년 6개월" 처럼 여러 단위 조합은 합산.
+    """
+    total, found, last_mult = 0.0, False, None
+    for num, unit in PERIOD_AMOUNT_RE.findall(text):
+        mult = PERIOD_UNITS.get(unit.lower()) if unit else None
+        total += float(num) * (mult if mult is not None else 1.0)
+        last_mult = mult
+        found = True
+    return (total if found else None), last_mult
+
+
+def _parse_range(
+    text: str,
+    parse_part: PartParser,
+    unitless_ok: bool,
+    head_units: Sequence[float] = (),
+) -> Tuple[Optional[float], Optional[float]]:
+    parts = RANGE_SEP_RE.split(text, maxsplit=1)
+    values = [parse_part(p) for p in parts]
+    if any(v is None for v, _ in values):
+        return None, None
+
+    # "300~500만원", "3천~5천만원" 처럼 앞쪽에 단위가 없으면 뒤쪽 단위를 따름.
+    # head_units 가 있으면 뒤쪽 값을 넘지 않는 가장 큰 단위를 사용 ("5천~1억" → 5천만~1억)
+    tail_value, tail_mult = values[-1]
+    parsed = []
+    for v, mult in values:
+        if mult is None:
+            if tail_mult is None:
+                if not unitless_ok:
+                    return None, None
+            else:
+                fits = [m for m in sorted(head_units, reverse=True) if m <= tail_mult and v * m <= tail_value]
+                v = v * (fits[0] if fits else tail_mult)
+        parsed.append(v)
+    return min(parsed), max(parsed)
+
+
+def _normalize(text: Optional[str]) -> str:
+    return "" if text is None else str(text).replace(",", "").strip()
+
+
+def parse_prdn_cost(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    제작비 문자열 → (최소, 최대) 원 단위. 해석할 수 없으면 (None, None). 단위가 없으면 원으로 간주.
+    """
+    s = _normalize(text)
+    if not s:
+        return None, None
+    return _parse_range(s, _parse_cost_part, unitless_ok=True, head_units=list(COST_BIG_UNITS.values()))
+
+
+def _date_span_days(s: str) -> Optional[float]:
+    dates = DATE_RE.findall(s)
+    if len(dates) != 2:
+        return None
+    try:
+        start, end = (date(int(y), int(m), int(d)) for y, m, d in dates)
+    except ValueError:
+        return None
+    return float(abs((end - start).days))
+
+
+def parse_prdn_perd(text: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    제작기간 문자열 → (최소, 최대) 일 단위. 해석할 수 없으면 (None, None).
+    - 날짜 범위("2024.01.01~2024.02.01", "2024-01-01 ~ 2024-02-01")는 두 날짜 사이 일수
+    - 단위 없는 숫자("30")는 일/주/개월을 알 수 없으므로 해석하지 않음 (None, None)
+    """
+    s = _normalize(text)
+    if not s:
+        return None, None
+    if DATE_RE.search(s):
+        days = _date_span_days(s)
+        return (days, days) if days is not None else (None, None)
+    return _parse_range(s, _parse_period_part, unitless_ok=False)
@@ -0,0 +1,217 @@
+# SPDX-License-Identifier: Apache-2.0
+import hmac
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool as _starlette_run_in_threadpool
+
+from app.core.config import ProfilerConfig
+from app.utils.log_utils import get_logger
+
+logger = get_logger("Profiler")
+
+MAX_STACK_DEPTH = 128
+# 이벤트 루프 스레드가 다음 이벤트를 기다리는 중인 프레임 (요청 작업이 아니므로 샘플에서 제외)
+# (uvloop 은 루프가 C 코드라 대기 중 맨 위 Python 프레임이 asyncio Runner.run)
+_IDLE_FRAMES = {("selectors.py", "select"), ("base_events.py", "_run_once"), ("runners.py", "run")}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class ProfileSession:
+    """
+    요청 1건의 샘플링 프로파일.
+    - 등록된 스레드(이벤트 루프 + 요청 작업을 실행 중인 threadpool 스레드)의 스택만 주기적으로 수집
+    - 스택은 collapsed 형식("a;b;c" → 샘플 수)으로 누적 → flamegraph.pl / speedscope 로 바로 시각화
+    """
+
+    def __init__(self, request_id: str, method: str, path: str, interval_sec: float, max_duration_sec: float):
+        self.request_id = request_id
+        self.method = method
+        self.path = path
+        self.interval_sec = interval_sec
+        self.max_duration_sec = max_duration_sec
+        self.started_at = time.time()
+        self.duration_sec = 0.0
+        self._start = 0.0
+        self.truncated = False
+        self.status: Optional[int] = None
+        self.samples: Counter = Counter()
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name=f"profiler-{request_id}", daemon=True)
+
+    # ---------- 스레드 등록 ----------
+    def add_thread(self, label: str) -> int:
+        ident = threading.get_ident()
+        with self._lock:
+            self._threads[ident] = label
+        return ident
+
+    def remove_thread(self, ident: int) -> None:
+        with self._lock:
+            self._threads.pop(ident, None)
+
+    # ---------- 샘플링 ----------
+    def start(self) -> None:
+        self._start = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+        self.duration_sec = time.perf_counter() - self._start
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            if time.perf_counter() - self._start > self.max_duration_sec:
+                self.truncated = True  # 오버헤드 상한: 최대 시간 이후에는 샘플링 중단
+                return
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, label in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                top = (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name)
+                if top in _IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.samples[(label, ";".join(reversed(stack)))] += 1
+
+    # ---------- 결과 ----------
+    def collapsed(self) -> List[str]:
+        return [f"{label};{stack} {n}" for (label, stack), n in self.samples.most_common()]
+
+    def top_functions(self, limit: int = 30) -> Dict[str, List[Dict]]:
+        """
+        self(스택 맨 위) / cumulative(스택 어디든) 샘플 수 상위 함수
+        """
+        self_counts: Counter = Counter()
+        cum_counts: Counter = Counter()
+        for (_label, stack), n in self.samples.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += n
+            for f in set(frames):
+                cum_counts[f] += n
+        total = sum(self.samples.values()) or 1
+        fmt = lambda counts: [
+            {"function": f, "samples": n, "ratio": round(n / total, 4)} for f, n in counts.most_common(limit)
+        ]
+        return {"self": fmt(self_counts), "cumulative": fmt(cum_counts)}
+
+    def save(self, output_dir: str) -> str:
+        """
+        {시각}_{request_id}.json (메타 + 상위 함수) 와 같은 이름의 .collapsed 저장. json 경로 반환
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        base = os.path.join(output_dir, f"{time.strftime('%Y%m%dT%H%M%S', time.localtime(self.started_at))}_{self.request_id}")
+        with open(base + ".collapsed", "w", encoding="utf-8") as fp:
+            fp.write("\n".join(self.collapsed()) + "\n")
+        summary = {
+            "request_id": self.request_id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "duration_ms": round(self.duration_sec * 1000.0, 2),
+            "interval_ms": round(self.interval_sec * 1000.0, 3),
+            "samples": sum(self.samples.values()),
+            "truncated": self.truncated,
+            "top": self.top_functions(),
+            "collapsed_file": os.path.basename(base + ".collapsed"),
+        }
+        with open(base + ".json", "w", encoding="utf-8") as fp:
+            json.dump(summary, fp, ensure_ascii=False, indent=2)
+        _prune(output_dir, ProfilerConfig.MAX_FILES)
+        logger.info(f"[Profiler] {self.method} {self.path} request_id={self.request_id} "
+                    f"samples={summary['samples']} duration={summary['duration_ms']}ms → {base}.json")
+        return base + ".json"
+
+
+def _prune(output_dir: str, max_files: int) -> None:
+    """
+    오래된 프로파일부터 삭제해 최대 max_files 건(json 기준)만 유지
+    """
+    if max_files <= 0:
+        return
+    summaries = sorted(f for f in os.listdir(output_dir) if f.endswith(".json"))
+    for name in summaries[:-max_files]:
+        for path in (name, name[:-len(".json")] + ".collapsed"):
+            try:
+                os.remove(os.path.join(output_dir, path))
+            except OSError:
+                pass
+
+
+# ---------- 요청 단위 활성화 ----------
+_session: ContextVar[Optional[ProfileSession]] = ContextVar("profile_session", default=None)
+# 동시에 프로파일링하는 요청 수 상한 (초과 시 프로파일 없이 처리)
+_slots = threading.BoundedSemaphore(max(1, ProfilerConfig.MAX_CONCURRENT))
+
+
+def is_authorized(token: Optional[str]) -> bool:
+    """
+    PROFILER_ENABLED 이고 관리자 토큰이 설정되어 있으며 요청 토큰이 일치할 때만 True
+    """
+    expected = ProfilerConfig.ADMIN_TOKEN
+    if not ProfilerConfig.ENABLED or not expected or not token:
+        return False
+    return hmac.compare_digest(token.encode("utf-8"), expected.encode("utf-8"))
+
+
+def try_begin(request_id: str, method: str, path: str) -> Optional[Tuple[ProfileSession, object]]:
+    """
+    빈 슬롯이 있으면 세션을 시작하고 (세션, contextvar 토큰) 반환, 없으면 None
+    """
+    if not _slots.acquire(blocking=False):
+        return None
+    session = ProfileSession(
+        request_id, method, path,
+        interval_sec=ProfilerConfig.SAMPLE_INTERVAL_MS / 1000.0,
+        max_duration_sec=ProfilerConfig.MAX_DURATION_SEC,
+    )
+    session.start()
+    return session, _session.set(session)
+
+
+def finish(session: ProfileSession, token) -> None:
+    _session.reset(token)
+    session.stop()
+    _slots.release()
+
+
+def current_session() -> Optional[ProfileSession]:
+    return _session.get()
+
+
+async def run_in_threadpool(func, *args, **kwargs):
+    """
+    starlette.concurrency.run_in_threadpool 과 동일. 프로파일링 중인 요청이면 작업 스레드를 세션에 등록
+    """
+    session = _session.get()
+    if session is None:
+        return await _starlette_run_in_threadpool(func, *args, **kwargs)
+
+    def tracked():
+        ident = session.add_thread("worker")
+        try:
+            return func(*args, **kwargs)
+        finally:
+            session.remove_thread(ident)
+
+    return await _starlette_run_in_threadpool(tracked)
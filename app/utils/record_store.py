@@ -0,0 +1,238 @@
+# SPDX-License-Identifier: Apache-2.0
+import json
+import os
+import pickle
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.utils.log_utils import get_logger
+from app.utils.prdn_parser import parse_prdn_cost
+
+logger = get_logger("RecordStore")
+
+RECORD_STORE_DIR = "record_store"
+
+# 문자열 컬럼 (레코드에 없는 컬럼은 전부 None 으로 저장)
+STRING_COLUMNS = [
+    "PTFO_NM", "PTFO_DESC",
+    "full", "desc", "what", "how", "style",
+    "VIEW_LNK_URL", "PRDN_STDO_NM", "PRDN_COST", "PRDN_PERD",
+]
+
+
+# ---------- 원자적 쓰기 ----------
+def atomic_write(path: str, write: Callable[[BinaryIO], None]) -> None:
+    """
+    임시 파일에 쓴 뒤 os.replace 로 교체.
+    실행 중인 서버가 mmap 한 파일을 제자리에서 덮어쓰면(truncate) SIGBUS/반쯤 쓴 데이터를 읽을 수 있으므로,
+    artifacts 파일은 항상 새 inode 로 만들어 교체 (기존 mmap 은 이전 파일을 계속 참조)
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as fp:
+        write(fp)
+    os.replace(tmp, path)
+
+
+def save_npy(path: str, arr: np.ndarray) -> None:
+    atomic_write(path, lambda fp: np.save(fp, arr))
+
+
+class PackedStrings:
+    """
+    문자열 배열을 UTF-8 바이트 버퍼 1개 + 오프셋 배열로 보관 (None 은 null 마스크로 구분).
+    i 번째 문자열은 buffer[offsets[i]:offsets[i+1]] 을 요청 시점에만 디코딩.
+    """
+
+    def __init__(self, buffer: np.ndarray, offsets: np.ndarray, nulls: np.ndarray):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.nulls = nulls
+
+    @classmethod
+    def from_list(cls, values: Sequence[Optional[str]]) -> "PackedStrings":
+        encoded = [(v if isinstance(v, str) else str(v)).encode("utf-8") if v is not None else b"" for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+        buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        nulls = np.array([v is None for v in values], dtype=bool)
+        return cls(buffer, offsets, nulls)
+
+    def __len__(self) -> int:
+        return int(self.nulls.shape[0])
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        if self.nulls[i]:
+            return None
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def save(self, directory: str, name: str) -> None:
+        atomic_write(os.path.join(directory, f"{name}.bytes"), lambda fp: fp.write(self.buffer.tobytes()))
+        save_npy(os.path.join(directory, f"{name}.offsets.npy"), self.offsets)
+        save_npy(os.path.join(directory, f"{name}.nulls.npy"), self.nulls)
+
+    @classmethod
+    def load(cls, directory: str, name: str) -> "PackedStrings":
+        path = os.path.join(directory, f"{name}.bytes")
+        buffer = np.memmap(path, dtype=np.uint8, mode="r") if os.path.getsize(path) else np.zeros(0, dtype=np.uint8)
+        return cls(
+            buffer,
+            np.load(os.path.join(directory, f"{name}.offsets.npy"), mmap_mode="r"),
+            np.load(os.path.join(directory, f"{name}.nulls.npy"), mmap_mode="r"),
+        )
+
+
+class RecordStore:
+    """
+    포트폴리오 메타 레코드의 컬럼형 저장소 (list-of-dicts `records` 대체).
+
+    - 숫자 컬럼: PTFO_SEQNO(int64), PRDN_COST_VALUE(float64, parse_prdn_cost 의 최소값 — 필터와 같은 값, 해석 불가 시 NaN)
+    - 문자열 컬럼: PackedStrings (오프셋 + 바이트 버퍼, mmap 로드)
+    - 태그: CSR (tags_indptr, tags_ids) + 태그 어휘
+    - 검색 결과로 반환되는 행만 row(i) 로 dict 를 만든다. records[i] / records[i].get(...) 형태도 그대로 동작.
+    """
+
+    def __init__(
+        self,
+        seqnos: np.ndarray,
+        cost_values: np.ndarray,
+        strings: Dict[str, PackedStrings],
+        tags_indptr: np.ndarray,
+        tags_ids: np.ndarray,
+        tag_vocab: PackedStrings,
+    ):
+        self.seqnos = seqnos
+        self.cost_values = cost_values
+        self.strings = strings
+        self.tags_indptr = tags_indptr
+        self.tags_ids = tags_ids
+        self.tag_vocab = tag_vocab
+        self._tag_names = [tag_vocab[i] for i in range(len(tag_vocab))]
+
+    def __len__(self) -> int:
+        return int(self.seqnos.shape[0])
+
+    def __getitem__(self, i: int) -> Dict:
+        return self.row(int(i))
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    # ---------- 조회 ----------
+    def get(self, i: int, column: str):
+        if column == "PTFO_SEQNO":
+            return int(self.seqnos[i])
+        if column == "PRDN_COST_VALUE":
+            v = float(self.cost_values[i])
+            return v if np.isfinite(v) else None
+        if column == "tags":
+            return self.tags(i)
+        return self.strings[column][i]
+
+    def tags(self, i: int) -> List[str]:
+        return [self._tag_names[t] for t in self.tags_ids[self.tags_indptr[i]:self.tags_indptr[i + 1]]]
+
+    def row(self, i: int) -> Dict:
+        rec = {"PTFO_SEQNO": int(self.seqnos[i])}
+        for col, packed in self.strings.items():
+            rec[col] = packed[i]
+        rec["tags"] = self.tags(i)
+        v = float(self.cost_values[i])
+        rec["PRDN_COST_VALUE"] = v if np.isfinite(v) else None
+        return rec
+
+    def column(self, name: str) -> List[Optional[str]]:
+        """
+        문자열 컬럼 전체를 리스트로 (빌드/분석 스크립트용)
+        """
+        packed = self.strings[name]
+        return [packed[i] for i in range(len(packed))]
+
+    # ---------- 생성/저장 ----------
+    @staticmethod
+    def _parse_cost(value) -> float:
+        # 필터(FilterIndex)와 같은 파서를 써서 "500만원" 이 필터에는 걸리고 응답에는 None 으로 보이지 않게 함
+        lo, _ = parse_prdn_cost(value)
+        return lo if lo is not None else np.nan
+
+    @classmethod
+    def from_records(cls, records: List[Dict]) -> "RecordStore":
+        seqnos = np.array([int(r["PTFO_SEQNO"]) for r in records], dtype=np.int64)
+        cost_values = np.array([cls._parse_cost(r.get("PRDN_COST")) for r in records], dtype=np.float64)
+        strings = {col: PackedStrings.from_list([r.get(col) for r in records]) for col in STRING_COLUMNS}
+
+        vocab = sorted({t for r in records for t in (r.get("tags") or [])})
+        tag_to_id = {t: i for i, t in enumerate(vocab)}
+        ids = [[tag_to_id[t] for t in (r.get("tags") or [])] for r in records]
+        tags_indptr = np.zeros(len(records) + 1, dtype=np.int64)
+        tags_indptr[1:] = np.cumsum([len(x) for x in ids])
+        tags_ids = np.array([t for x in ids for t in x], dtype=np.int32)
+
+        return cls(seqnos, cost_values, strings, tags_indptr, tags_ids, PackedStrings.from_list(vocab))
+
+    def save(self, directory: str) -> None:
+        # 모든 파일은 임시 파일 → os.replace (로드 중인 서버의 mmap 을 깨지 않음), meta.json 은 마지막에 교체
+        os.makedirs(directory, exist_ok=True)
+        save_npy(os.path.join(directory, "PTFO_SEQNO.npy"), self.seqnos)
+        save_npy(os.path.join(directory, "PRDN_COST_VALUE.npy"), self.cost_values)
+        for col, packed in self.strings.items():
+            packed.save(directory, col)
+        save_npy(os.path.join(directory, "tags_indptr.npy"), self.tags_indptr)
+        save_npy(os.path.join(directory, "tags_ids.npy"), self.tags_ids)
+        self.tag_vocab.save(directory, "tag_vocab")
+        meta = json.dumps({"n": len(self), "string_columns": list(self.strings)}, ensure_ascii=False).encode("utf-8")
+        atomic_write(os.path.join(directory, "meta.json"), lambda fp: fp.write(meta))
+
+    @classmethod
+    def load(cls, directory: str) -> "RecordStore":
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as fp:
+            meta = json.load(fp)
+        return cls(
+            np.load(os.path.join(directory, "PTFO_SEQNO.npy"), mmap_mode="r"),
+            np.load(os.path.join(directory, "PRDN_COST_VALUE.npy"), mmap_mode="r"),
+            {col: PackedStrings.load(directory, col) for col in meta["string_columns"]},
+            np.load(os.path.join(directory, "tags_indptr.npy"), mmap_mode="r"),
+            np.load(os.path.join(directory, "tags_ids.npy"), mmap_mode="r"),
+            PackedStrings.load(directory, "tag_vocab"),
+        )
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, "meta.json"))
+
+
+# ---------- artifacts 번들 ----------
+def save_factor_bundle(artifacts_dir: str, embeddings: Dict[str, np.ndarray], records: List[Dict]) -> None:
+    """
+    factor 임베딩(.npy)과 RecordStore 를 저장 (서비스가 pickle 대신 버퍼 읽기만으로 로드).
+    서버가 mmap 중인 파일이므로 제자리 덮어쓰기 대신 임시 파일 → os.replace 로 교체
+    """
+    for f, emb in embeddings.items():
+        save_npy(os.path.join(artifacts_dir, f"{f}_embeddings.npy"), np.ascontiguousarray(emb, dtype=np.float32))
+    RecordStore.from_records(records).save(os.path.join(artifacts_dir, RECORD_STORE_DIR))
+
+
+def load_factor_bundle(artifacts_dir: str, factors: Sequence[str]) -> Tuple[Dict[str, np.ndarray], RecordStore]:
+    """
+    factor 임베딩 + 레코드 로드.
+    - {f}_embeddings.npy + record_store/ 가 있으면 mmap 으로 로드
+    - 없으면(이전 artifacts) {f}_embeddings.pkl 에서 읽어 메모리 상에서 RecordStore 로 변환
+    """
+    npy_paths = {f: os.path.join(artifacts_dir, f"{f}_embeddings.npy") for f in factors}
+    store_dir = os.path.join(artifacts_dir, RECORD_STORE_DIR)
+    if RecordStore.exists(store_dir) and all(os.path.exists(p) for p in npy_paths.values()):
+        embeddings = {f: np.load(p, mmap_mode="r") for f, p in npy_paths.items()}
+        return embeddings, RecordStore.load(store_dir)
+
+    logger.warning(f"[RecordStore] {artifacts_dir} 에 npy/record_store 없음 → pickle 에서 로드 "
+                   f"(python -m app.preprocess.export_record_store 로 변환 가능)")
+    embeddings: Dict[str, np.ndarray] = {}
+    records: Optional[List[Dict]] = None
+    for f in factors:
+        with open(os.path.join(artifacts_dir, f"{f}_embeddings.pkl"), "rb") as fp:
+            meta = pickle.load(fp)
+        embeddings[f] = meta["embeddings"]
+        if records is None:
+            records = meta["data"]
+    return embeddings, RecordStore.from_records(records or [])
@@ -0,0 +1,35 @@
+# SPDX-License-Identifier: Apache-2.0
+import re
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+REQUEST_ID_HEADER = "x-request-id"
+# 외부에서 받은 id 는 로그/파일명에 그대로 쓰이므로 안전한 문자만 허용
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """
+    클라이언트가 보낸 X-Request-ID 가 유효하면 그대로, 아니면 새 id 생성
+    """
+    if incoming and _VALID_REQUEST_ID.match(incoming):
+        return incoming
+    return uuid.uuid4().hex
+
+
+def set_request_id(request_id: Optional[str]):
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token) -> None:
+    _request_id.reset(token)
+
+
+def get_request_id() -> Optional[str]:
+    """
+    현재 요청 id (요청 밖이면 None). run_in_threadpool 로 넘어간 코드에서도 같은 값
+    """
+    return _request_id.get()
@@ -0,0 +1,83 @@
+# SPDX-License-Identifier: Apache-2.0
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+from cachetools import TTLCache
+
+T = TypeVar("T")
+
+
+class SingleFlightCache:
+    """
+    크기/TTL 제한 응답 캐시 + in-flight 요청 병합(single-flight).
+
+    - 캐시에 있으면 즉시 반환
+    - 동일 key 계산이 진행 중이면 새로 계산하지 않고 그 결과를 기다림 (N개 동시 요청 → 1회 계산)
+    - 계산 실패 시 캐시에 저장하지 않고 대기 중인 요청 모두에 같은 예외 전달
+    """
+
+    def __init__(self, max_size: int, ttl_sec: float):
+        self._cache: TTLCache = TTLCache(maxsize=max(1, int(max_size)), ttl=float(ttl_sec))
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], T]) -> T:
+        with self._lock:
+            try:
+                value = self._cache[key]
+                self.hits += 1
+                return value
+            except KeyError:
+                pass
+
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._cache[key] = value
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def peek(self, key: Hashable) -> Optional[T]:
+        """
+        캐시에 있으면 반환, 없으면 None (계산/대기 없음)
+        """
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: T) -> None:
+        with self._lock:
+            self._cache[key] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,84 @@
+# SPDX-License-Identifier: Apache-2.0
+import os
+from typing import TYPE_CHECKING, Optional
+
+from app.core.config import ModelConfig
+from app.utils.lazy_singleton import LazySingleton
+from app.utils.log_utils import get_logger
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+logger = get_logger("SbertEncoder")
+
+
+def load_sentence_encoder(
+    backend: Optional[str] = None,
+    onnx_dir: Optional[str] = None,
+    onnx_file: Optional[str] = None,
+) -> "SentenceTransformer":
+    """
+    ENCODER_BACKEND 설정에 따라 SBERT 인코더 생성.
+    - torch: 기존 PyTorch 추론 (ENCODER_NUM_THREADS > 0 이면 torch 스레드 수 고정)
+    - onnx : export_onnx_encoder 로 내보낸 ONNX 모델(int8 양자화 포함)을 ONNX Runtime 으로 추론
+    - stub : 모델 없이 해시 기반 결정적 임베딩 (HashingSentenceEncoder, 부하 테스트/오프라인용)
+    """
+    backend = (backend or ModelConfig.ENCODER_BACKEND or "torch").lower()
+    threads = ModelConfig.ENCODER_NUM_THREADS
+
+    if backend == "stub":
+        from app.utils.stub_encoder import HashingSentenceEncoder
+
+        logger.info(f"[SbertEncoder] stub 인코더 사용 (dim={ModelConfig.STUB_ENCODER_DIM})")
+        return HashingSentenceEncoder(ModelConfig.STUB_ENCODER_DIM, ModelConfig.STUB_ENCODER_LATENCY_MS)
+
+    # sentence_transformers(torch) import 는 수 초가 걸리므로 실제 로드 시점까지 미룸
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "onnx":
+        import onnxruntime as ort
+
+        model_dir = onnx_dir or ModelConfig.ONNX_ENCODER_DIR
+        file_name = onnx_file or ModelConfig.ONNX_ENCODER_FILE
+        if not os.path.exists(os.path.join(model_dir, file_name)):
+            raise FileNotFoundError(
+                f"ONNX 인코더가 없습니다: {os.path.join(model_dir, file_name)} "
+                f"(python -m app.scripts.export_onnx_encoder 로 먼저 생성하세요)"
+            )
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            session_options.intra_op_num_threads = threads
+            session_options.inter_op_num_threads = 1
+
+        logger.info(f"[SbertEncoder] ONNX Runtime 인코더 로드: {model_dir}/{file_name} (threads={threads or 'auto'})")
+        return SentenceTransformer(
+            model_dir,
+            backend="onnx",
+            model_kwargs={
+                "file_name": file_name,
+                "provider": "CPUExecutionProvider",
+                "session_options": session_options,
+            },
+        )
+
+    if backend != "torch":
+        logger.warning(f"Unknown ENCODER_BACKEND='{backend}', fallback to 'torch'")
+
+    if threads > 0:
+        import torch
+        torch.set_num_threads(threads)
+
+    logger.info(f"[SbertEncoder] PyTorch 인코더 로드: {ModelConfig.EMBEDDING_MODEL}")
+    return SentenceTransformer(ModelConfig.EMBEDDING_MODEL)
+
+
+_encoder = LazySingleton(load_sentence_encoder)
+
+
+def get_sentence_encoder() -> "SentenceTransformer":
+    """
+    프로세스 공용 SBERT 인코더 (검색 서비스/프롬프트 캐시가 같은 인스턴스를 공유)
+    """
+    return _encoder.get()
@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: Apache-2.0
+import json
+import threading
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import faiss
+
+from app.core.config import CacheConfig
+from app.schemas.v2.ad_element_extractor_dto import AdElementDTOV2
+from app.utils.date_tool import get_seoul_time
+from app.utils.log_utils import get_logger
+from app.utils.sbert_encoder import get_sentence_encoder
+
+logger = get_logger("SemanticPromptCache")
+
+
+class SemanticPromptCache:
+    """
+    user_prompt 의 SBERT 임베딩 기반 최근접 이웃(nearest-neighbour) 캐시.
+
+    - 표현만 조금 다른 동일 요청을 LLM 호출 없이 이전 추출 결과(AdElementResponse)로 응답
+    - FAISS IndexIDMap2(IndexFlatIP) + L2 정규화 → 내적 == 코사인 유사도
+    - 유사도가 threshold 이상일 때만 적중, max_size 초과 시 LRU 순으로 제거
+    - 적중 시 (요청 프롬프트, 매칭된 프롬프트, 유사도)를 로그/JSON Lines 파일로 남겨 사후 감사 가능
+    """
+
+    RECENT_HITS_SIZE = 100  # 메모리에 보관하는 최근 적중 기록 수
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        max_size: Optional[int] = None,
+        hit_log_path: Optional[str] = None,
+        encoder: Optional[Callable[[List[str]], np.ndarray]] = None,
+    ):
+        self.threshold = float(threshold if threshold is not None else CacheConfig.PROMPT_CACHE_SIM_THRESHOLD)
+        self.max_size = max(1, int(max_size if max_size is not None else CacheConfig.PROMPT_CACHE_MAX_SIZE))
+        self.hit_log_path = hit_log_path if hit_log_path is not None else CacheConfig.PROMPT_CACHE_HIT_LOG_PATH
+
+        # 인코더는 첫 사용 시 로드 (주입 시 그대로 사용)
+        self._encoder = encoder
+        self._index: Optional[faiss.IndexIDMap2] = None
+        self._entries: "OrderedDict[int, Tuple[str, AdElementDTOV2.AdElementResponse]]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.recent_hits: Deque[Dict] = deque(maxlen=self.RECENT_HITS_SIZE)
+
+    # ---------- 임베딩 ----------
+    def _get_encoder(self) -> Callable[[List[str]], np.ndarray]:
+        if self._encoder is None:
+            model = get_sentence_encoder()
+            self._encoder = lambda texts: model.encode(texts, convert_to_numpy=True)
+        return self._encoder
+
+    def embed(self, prompt: str) -> np.ndarray:
+        """
+        프롬프트를 (1, d) L2 정규화 벡터로 변환
+        """
+        v = np.asarray(self._get_encoder()([prompt or ""]), dtype=np.float32).reshape(1, -1)
+        v /= (np.linalg.norm(v, axis=1, keepdims=True) + 1e-8)
+        return v
+
+    # ---------- 조회/저장 ----------
+    def lookup(self, prompt: str, embedding: Optional[np.ndarray] = None) -> Optional[AdElementDTOV2.AdElementResponse]:
+        """
+        가장 유사한 과거 프롬프트의 유사도가 threshold 이상이면 저장된 응답을 반환, 아니면 None.
+        """
+        if not (prompt or "").strip():
+            return None
+        q = embedding if embedding is not None else self.embed(prompt)
+
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                self.misses += 1
+                return None
+
+            D, I = self._index.search(q, 1)
+            sim, entry_id = float(D[0][0]), int(I[0][0])
+            if entry_id == -1 or not np.isfinite(sim) or sim < self.threshold:
+                self.misses += 1
+                return None
+
+            matched_prompt, response = self._entries[entry_id]
+            self._entries.move_to_end(entry_id)  # LRU 갱신
+            self.hits += 1
+
+        self._record_hit(prompt, matched_prompt, sim)
+        return response.model_copy()
+
+    def put(
+        self,
+        prompt: str,
+        response: AdElementDTOV2.AdElementResponse,
+        embedding: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        프롬프트/응답 쌍을 캐시에 저장. 최대 크기 초과 시 가장 오래 쓰지 않은 항목 제거.
+        """
+        if not (prompt or "").strip():
+            return
+        q = embedding if embedding is not None else self.embed(prompt)
+
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(q.shape[1]))
+
+            while len(self._entries) >= self.max_size:
+                evicted_id, _ = self._entries.popitem(last=False)
+                self._index.remove_ids(np.array([evicted_id], dtype=np.int64))
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._index.add_with_ids(q, np.array([entry_id], dtype=np.int64))
+            self._entries[entry_id] = (prompt, response.model_copy())
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._index is not None:
+                self._index.reset()
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------- 감사 로그 ----------
+    def _record_hit(self, prompt: str, matched_prompt: str, similarity: float) -> None:
+        record = {
+            "time": get_seoul_time().isoformat(),
+            "similarity": round(similarity, 6),
+            "prompt": prompt,
+            "matched_prompt": matched_prompt,
+        }
+        self.recent_hits.append(record)
+        logger.info(f"[PromptCache] hit sim={similarity:.4f} size={len(self._entries)} "
+                    f"hits={self.hits} misses={self.misses}")
+
+        if not self.hit_log_path:
+            return
+        try:
+            with open(self.hit_log_path, "a", encoding="utf-8") as fp:
+                fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+        except OSError as e:
+            logger.warning(f"[PromptCache] 적중 로그 기록 실패: {e}")
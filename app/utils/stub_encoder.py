@@ -0,0 +1,67 @@
+# SPDX-License-Identifier: Apache-2.0
+import hashlib
+import re
+import time
+from typing import List, Union
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[가-힣a-zA-Z0-9]+")
+
+
+def _bucket(feature: str, dim: int) -> int:
+    # 프로세스/실행마다 값이 같도록 내장 hash() 대신 blake2b 사용 (PYTHONHASHSEED 영향 없음)
+    h = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return h % (2 * dim)  # [0, dim) → +1, [dim, 2*dim) → -1
+
+
+class HashingSentenceEncoder:
+    """
+    SentenceTransformer.encode 호환 결정적 인코더 (ENCODER_BACKEND=stub).
+
+    - 단어 + 문자 2-gram 을 해시 버킷(부호 포함)에 더한 뒤 L2 정규화 → 겹치는 단어/음절이 많을수록 코사인 유사도가 높음
+    - 모델 파일/torch 없이 동작하므로 합성 artifacts 기반 부하 테스트나 오프라인 개발에 사용
+    - latency_ms > 0 이면 encode 호출마다 그만큼 대기해 실제 인코더 비용을 흉내냄
+    """
+
+    def __init__(self, dim: int = 384, latency_ms: float = 0.0):
+        self.dim = int(dim)
+        self.latency_ms = float(latency_ms)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_RE.findall((text or "").lower())
+        feats = [f"w:{t}" for t in tokens]
+        for t in tokens:
+            feats.extend(f"c:{t[i:i + 2]}" for i in range(len(t) - 1))
+        return feats
+
+    def _encode_one(self, text: str) -> np.ndarray:
+        v = np.zeros(self.dim, dtype=np.float32)
+        buckets = np.array([_bucket(f, self.dim) for f in self._features(text)], dtype=np.int64)
+        if buckets.size:
+            sign = np.where(buckets < self.dim, 1.0, -1.0).astype(np.float32)
+            np.add.at(v, buckets % self.dim, sign)
+        else:
+            v[0] = 1.0  # 빈 문자열도 0 벡터가 되지 않도록
+        return v
+
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        convert_to_numpy: bool = True,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        항상 L2 정규화된 float32 numpy 배열 반환 (batch_size 등 나머지 인자는 무시)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000.0)
+
+        out = np.stack([self._encode_one(t) for t in texts], axis=0) if texts else np.zeros((0, self.dim), np.float32)
+        out /= (np.linalg.norm(out, axis=1, keepdims=True) + 1e-8)
+        return out[0] if single else out
@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: Apache-2.0
+import hashlib
+import json
+import random
+import time
+from typing import List, Optional
+
+from app.core.config import ModelConfig
+from app.utils.metrics import record_llm_usage
+from app.utils.synthetic_catalog import HOW_WORDS, STYLE_WORDS, TAG_WORDS, WHAT_WORDS
+
+
+class StubLLMClient:
+    """
+    LLM_PROVIDER=stub 용 로컬 LLM 대역 (GeminiClient/OllamaClient 와 같은 chat_completion 인터페이스).
+
+    - 같은 (system_prompt, user_prompt) 에는 항상 같은 응답 (user_prompt 해시로 seed)
+    - 시스템 프롬프트 형식을 보고 응답 형태 결정: 광고 요소 추출(JSON desc/what/how/style),
+      v1 요약(JSON tags/summary), 그 외(작업지시서 예시 등)는 일반 텍스트
+    - 네트워크 없이 latency_ms ± jitter_ms 만큼 대기해 실제 LLM 지연을 흉내냄
+    """
+
+    def __init__(self, latency_ms: Optional[float] = None, jitter_ms: Optional[float] = None):
+        self.latency_ms = ModelConfig.STUB_LLM_LATENCY_MS if latency_ms is None else float(latency_ms)
+        self.jitter_ms = ModelConfig.STUB_LLM_JITTER_MS if jitter_ms is None else float(jitter_ms)
+
+    def _sleep(self) -> None:
+        delay = self.latency_ms + (random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms > 0 else 0.0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    @staticmethod
+    def _pick(rng: random.Random, words: List[str], prompt: str) -> str:
+        # 프롬프트에 등장하는 어휘가 있으면 그것을, 없으면 해시 기반으로 선택
+        found = [w for w in words if w in prompt]
+        return found[0] if found else rng.choice(words)
+
+    def chat_completion(self, system_prompt: str, user_prompt: str) -> str:
+        self._sleep()
+        response = self._respond(system_prompt, user_prompt)
+        # 토큰 수는 공백 단위 근사치
+        record_llm_usage("stub", len(system_prompt.split()) + len((user_prompt or "").split()), len(response.split()))
+        return response
+
+    def _respond(self, system_prompt: str, user_prompt: str) -> str:
+        prompt = user_prompt or ""
+        seed = int.from_bytes(hashlib.blake2b(prompt.encode("utf-8"), digest_size=8).digest(), "little")
+        rng = random.Random(seed)
+        summary = prompt.strip().split("\n")[0][:80]
+
+        if '"desc"' in system_prompt:
+            what = self._pick(rng, WHAT_WORDS, prompt)
+            how = self._pick(rng, HOW_WORDS, prompt)
+            style = self._pick(rng, STYLE_WORDS, prompt)
+            return json.dumps({
+                "desc": f"{summary} {style} {how} 광고",
+                "what": what, "how": how, "style": style,
+            }, ensure_ascii=False)
+
+        if '"summary"' in system_prompt:
+            tags = [t for t in TAG_WORDS if t in prompt] or rng.sample(TAG_WORDS, 2)
+            return json.dumps({"tags": tags[:3], "summary": summary}, ensure_ascii=False)
+
+        return f"[stub] {summary}\n- 촬영 방식: {rng.choice(HOW_WORDS)}\n- 톤앤매너: {rng.choice(STYLE_WORDS)}"
@@ -0,0 +1,49 @@
+# SPDX-License-Identifier: Apache-2.0
+import random
+from typing import Dict, List
+
+# 합성 카탈로그/stub LLM 이 공유하는 어휘 (stub LLM 이 추출하는 what/how/style 이 카탈로그와 겹치도록)
+WHAT_WORDS = ["식품", "음료", "건강", "뷰티", "자동차", "금융", "교육", "게임", "패션", "가전",
+              "여행", "부동산", "의료", "공공", "앱서비스", "유통", "스포츠", "반려동물", "주류", "화장품"]
+HOW_WORDS = ["영상", "디지털", "숏폼", "인터뷰", "드론", "모션그래픽", "3D", "라이브", "사진", "애니메이션"]
+STYLE_WORDS = ["따뜻함", "역동적", "감성적", "유머", "고급스러움", "신뢰", "친근함", "강렬함",
+               "미니멀", "다큐멘터리", "혁신적", "편안함"]
+TAG_WORDS = ["홍보영상", "행사 스케치", "TV CF", "관공서", "앱/서비스", "식음료", "공간/인테리어", "교육/기관",
+             "자동차", "뷰티", "의료/제약", "음악/리드미컬", "기록/정보전달", "코믹/흥미유발", "공감형성",
+             "신뢰형성", "브랜딩", "모션/인포그래픽", "드론", "배우/모델", "숏폼", "3D", "제품/기술"]
+STUDIO_NAMES = [f"스튜디오{i:02d}" for i in range(40)]
+DESC_TEMPLATES = [
+    "{what} 브랜드의 {style} 분위기를 살린 {how} 광고입니다",
+    "{style} 연출로 {what} 제품의 장점을 전달하는 {how} 콘텐츠입니다",
+    "타겟 고객에게 {what} 서비스를 알리는 {style} {how} 캠페인입니다",
+    "{how} 기법으로 {what} 의 신뢰를 쌓는 {style} 광고입니다",
+]
+PERIODS = ["2주", "1개월", "1.5개월", "2개월", "3개월", "4개월", "6개월"]
+
+
+def generate_catalog(n: int, seed: int = 0) -> List[Dict]:
+    """
+    v3 빌드 레코드와 같은 필드를 가진 합성 포트폴리오 n 개 생성 (seed 가 같으면 항상 같은 결과)
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        what, how, style = rng.choice(WHAT_WORDS), rng.choice(HOW_WORDS), rng.choice(STYLE_WORDS)
+        desc = rng.choice(DESC_TEMPLATES).format(what=what, how=how, style=style)
+        studio = rng.choice(STUDIO_NAMES)
+        records.append({
+            "PTFO_SEQNO": i + 1,
+            "PTFO_NM": f"{studio} {what} {how} {2015 + i % 10}",
+            "PTFO_DESC": desc,
+            "tags": sorted(rng.sample(TAG_WORDS, rng.randint(1, 4))),
+            "full": f"desc {desc} what {what} how {how} style {style}",
+            "desc": desc,
+            "what": what,
+            "how": how,
+            "style": style,
+            "VIEW_LNK_URL": f"https://example.com/video/{i + 1}",
+            "PRDN_STDO_NM": studio,
+            "PRDN_COST": str(rng.choice([5, 10, 20, 30, 50, 80, 120]) * 1_000_000) if rng.random() > 0.1 else None,
+            "PRDN_PERD": rng.choice(PERIODS) if rng.random() > 0.1 else None,
+        })
+    return records
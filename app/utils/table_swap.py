@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: Apache-2.0
+import time
+from typing import List, Tuple
+
+from sqlalchemy import MetaData, Table, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+
+from app.utils.log_utils import get_logger
+
+logger = get_logger("TableSwap")
+
+SHADOW_SUFFIX = "__shadow"
+OLD_SUFFIX = "__old"
+
+
+def _shadow_table(table: Table) -> Table:
+    # 컬럼 정의만 같은 가벼운 Table 객체 (실제 테이블은 CREATE TABLE ... LIKE 로 생성해 인덱스/PK 까지 복제)
+    return table.to_metadata(MetaData(), name=f"{table.name}{SHADOW_SUFFIX}")
+
+
+def _fill_insert_select(engine: Engine, shadow: Table, columns: List[str], select_stmt: Select) -> int:
+    """
+    INSERT ... SELECT 한 문장으로 DB 안에서 적재 (행이 파이썬으로 넘어오지 않음)
+    """
+    with engine.begin() as conn:
+        result = conn.execute(insert(shadow).from_select(columns, select_stmt))
+        return int(result.rowcount or 0)
+
+
+def _fill_streaming(engine: Engine, shadow: Table, columns: List[str], select_stmt: Select, chunk_size: int) -> int:
+    """
+    서버 사이드 커서(stream_results)로 조인 결과를 chunk 단위로 읽어 shadow 테이블에 executemany.
+    전체 결과를 메모리에 올리지 않으며, 원본 조회와 적재는 별도 커넥션을 사용.
+    """
+    total = 0
+    with engine.connect() as src, engine.begin() as dst:
+        result = src.execution_options(stream_results=True, yield_per=chunk_size).execute(select_stmt)
+        for chunk in result.partitions(chunk_size):
+            dst.execute(insert(shadow), [dict(zip(columns, row)) for row in chunk])
+            total += len(chunk)
+            logger.info(f"[TableSwap] {shadow.name}: {total}건 적재 중")
+    return total
+
+
+def refresh_by_shadow_swap(
+    engine: Engine,
+    table: Table,
+    select_stmt: Select,
+    mode: str = "insert-select",
+    chunk_size: int = 5000,
+) -> Tuple[int, float]:
+    """
+    테이블 전체 재적재를 읽기 쪽 공백/락 없이 수행 (MySQL).
+
+    1) {table}__shadow 를 CREATE TABLE ... LIKE 로 생성 (인덱스/PK 동일)
+    2) select_stmt 결과를 shadow 에 적재 (mode: insert-select | stream)
+    3) RENAME TABLE table → __old, __shadow → table 을 한 문장으로 원자적 교체
+    4) __old 삭제
+
+    적재 중에는 기존 테이블이 그대로 읽히고, 교체는 메타데이터 락 한 번으로 끝난다.
+    select_stmt 의 컬럼 순서는 table 의 컬럼 순서와 같아야 함. (적재 행 수, 소요 초)를 반환.
+    """
+    name = table.name
+    shadow = _shadow_table(table)
+    old_name = f"{name}{OLD_SUFFIX}"
+    columns = [c.name for c in table.columns]
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS `{shadow.name}`, `{old_name}`"))
+        conn.execute(text(f"CREATE TABLE `{shadow.name}` LIKE `{name}`"))
+
+    try:
+        if mode == "stream":
+            rows = _fill_streaming(engine, shadow, columns, select_stmt, chunk_size)
+        elif mode == "insert-select":
+            rows = _fill_insert_select(engine, shadow, columns, select_stmt)
+        else:
+            raise ValueError(f"지원하지 않는 적재 모드: {mode}")
+    except Exception:
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS `{shadow.name}`"))
+        raise
+    load_sec = time.perf_counter() - start
+
+    with engine.begin() as conn:
+        conn.execute(text(f"RENAME TABLE `{name}` TO `{old_name}`, `{shadow.name}` TO `{name}`"))
+        conn.execute(text(f"DROP TABLE `{old_name}`"))
+    elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"[TableSwap] {name} 교체 완료 ({mode}): {rows}건, 적재 {load_sec:.2f}s, 전체 {elapsed:.2f}s "
+        f"({rows / max(load_sec, 1e-9):,.0f} rows/s)"
+    )
+    return rows, elapsed
@@ -0,0 +1,92 @@
+# SPDX-License-Identifier: Apache-2.0
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from app.utils.log_utils import get_logger
+
+logger = get_logger("TagMapping")
+
+TAG_MAPPING_FILE = "tag_mapping.json"
+
+# 디렉토리별 캐시: {dir: (파일 mtime_ns, 매핑)} — 파일이 바뀌면 다음 조회 때 다시 읽음
+_cache: Dict[str, tuple] = {}
+_warned: set = set()
+
+
+def fetch_tag_mapping_from_db() -> Dict[int, List[str]]:
+    """
+    tb_ptfo_tag_merged 에서 PTFO_SEQNO별 태그 목록 조회 (빌드/명시적 갱신 시에만 호출)
+    """
+    from app.core.database import SessionLocal
+    from app.models.ptfo_tag_merged import PtfoTagMerged
+
+    db = SessionLocal()
+    try:
+        rows = db.query(PtfoTagMerged.PTFO_SEQNO, PtfoTagMerged.TAG_NM).all()
+    finally:
+        db.close()
+    tag_mapping: Dict[int, List[str]] = {}
+    for seqno, tag_nm in rows:
+        tag_mapping.setdefault(int(seqno), []).append(tag_nm)
+    return tag_mapping
+
+
+def save_tag_mapping(directory: str, tag_mapping: Dict[int, List[str]]) -> str:
+    """
+    artifacts 디렉토리에 tag_mapping.json 저장 (임시 파일에 쓴 뒤 교체 → 읽는 쪽이 반쯤 쓴 파일을 보지 않음)
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, TAG_MAPPING_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump({
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "mapping": {str(k): v for k, v in tag_mapping.items()},
+        }, fp, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _tags_from_records(records: Iterable) -> Dict[int, List[str]]:
+    tag_mapping: Dict[int, List[str]] = {}
+    for rec in records:
+        tags = rec.get("tags") or []
+        if tags:
+            tag_mapping[int(rec["PTFO_SEQNO"])] = list(tags)
+    return tag_mapping
+
+
+def load_tag_mapping(directory: str, records: Optional[Iterable] = None) -> Dict[int, List[str]]:
+    """
+    artifacts 의 tag_mapping.json 에서 PTFO_SEQNO별 태그 목록 로드 (DB 조회 없음).
+    파일이 없으면(이전 artifacts) 레코드의 tags 컬럼으로 대체하고 경고만 남김.
+    """
+    path = os.path.join(directory, TAG_MAPPING_FILE)
+    if os.path.exists(path):
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = _cache.get(directory)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        with open(path, "r", encoding="utf-8") as fp:
+            tag_mapping = {int(k): v for k, v in json.load(fp)["mapping"].items()}
+        _cache[directory] = (mtime_ns, tag_mapping)
+        return tag_mapping
+
+    if directory not in _warned:
+        _warned.add(directory)
+        logger.warning(f"[TagMapping] {path} 없음 → 레코드의 tags 로 대체 "
+                       f"(python -m app.scripts.refresh_tag_mapping 으로 생성 가능)")
+    return _tags_from_records(records) if records is not None else {}
+
+
+def refresh_tag_mapping(directories: List[str]) -> Dict[int, List[str]]:
+    """
+    DB 에서 태그 매핑을 다시 읽어 주어진 artifacts 디렉토리들의 tag_mapping.json 을 갱신
+    """
+    tag_mapping = fetch_tag_mapping_from_db()
+    for directory in directories:
+        path = save_tag_mapping(directory, tag_mapping)
+        logger.info(f"[TagMapping] {len(tag_mapping)}개 포트폴리오 태그 매핑 저장 → {path}")
+    return tag_mapping
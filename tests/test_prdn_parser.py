@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: Apache-2.0
+import pytest
+
+from app.utils.prdn_parser import parse_prdn_cost, parse_prdn_perd
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("500만원", (5e6, 5e6)),
+    ("3천5백만원", (3.5e7, 3.5e7)),
+    ("1천2백만원", (1.2e7, 1.2e7)),
+    ("1억 5천만원", (1.5e8, 1.5e8)),
+    ("1.5억", (1.5e8, 1.5e8)),
+    ("천만원", (1e7, 1e7)),
+    ("5,000,000원", (5e6, 5e6)),
+    ("300~500만원", (3e6, 5e6)),
+    ("3천~5천만원", (3e7, 5e7)),
+    ("5천~1억", (5e7, 1e8)),
+    ("1억5천만~2억", (1.5e8, 2e8)),
+])
+def test_parse_prdn_cost(text, expected):
+    assert parse_prdn_cost(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "협의", "만족"])
+def test_parse_prdn_cost_unknown(text):
+    assert parse_prdn_cost(text) == (None, None)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2주", (14, 14)),
+    ("1~2개월", (30, 60)),
+    ("2-3주", (14, 21)),
+    ("1년 6개월", (545, 545)),
+    ("3 weeks", (21, 21)),
+    ("2024.01.01~2024.02.01", (31, 31)),
+    ("2024-01-01 ~ 2024-02-01", (31, 31)),
+])
+def test_parse_prdn_perd(text, expected):
+    assert parse_prdn_perd(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "", "30", "2024.01.01", "2024.13.01~2024.14.01", "협의"])
+def test_parse_prdn_perd_unknown(text):
+    assert parse_prdn_perd(text) == (None, None)